@@ -0,0 +1,163 @@
+"""
+Parses the reaction subset of Antimony into Reactions without
+Tellurium. The subset is what ModelMaker produces:
+  - reactions: [label:] [n]A + [n]$B -> [n]C; rate_law
+  - assignments: A = 0
+  - species, var and const declarations of names
+  - a single model ... end wrapper
+  - comments starting with // or #
+Other constructs (compartments, events, functions, assignment
+and rate rules, modules, ...) are not parsed, and parseReactions
+returns None so that the caller can use the Tellurium sandbox.
+"""
+
+from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
+from SBMLLint.common.reaction import Reaction
+
+import collections
+import libsbml
+import re
+
+
+ARROWS = ["=>", "->"]
+COMMENTS = ["//", "#"]
+STATEMENT_SEPARATOR = ";"
+LABEL_SEPARATOR = ":"
+TERM_SEPARATOR = "+"
+BOUNDARY_PREFIX = "$"
+UNLABELED_PREFIX = "_J"  # Antimony names for unlabeled reactions
+DECLARATIONS = ["species", "var", "const"]
+NAME = r"[A-Za-z_][A-Za-z0-9_]*"
+NUMBER = r"(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+TERM_PATTERN = re.compile(r"^(%s)?\s*\*?\s*\$?(%s)$" % (NUMBER, NAME))
+LABEL_PATTERN = re.compile(r"^%s$" % NAME)
+ASSIGNMENT_PATTERN = re.compile(r"^\$?%s\s*=[^=]" % NAME)
+DECLARATION_PATTERN = re.compile(r"^(%s)\s+(\$?%s\s*,\s*)*\$?%s$"
+    % ("|".join(DECLARATIONS), NAME, NAME))
+MODEL_PATTERN = re.compile(r"^model\s+\*?%s\s*(\(\s*\))?$" % NAME)
+END = "end"
+
+
+class _UnsupportedError(Exception):
+  pass
+
+
+############## FUNCTIONS ##################
+def parseReactions(antimony_stg):
+  """
+  Constructs the reactions of an Antimony model.
+  :param str antimony_stg:
+  :return list-Reaction/None: None if the model uses constructs
+      outside of the supported subset
+  """
+  try:
+    return _parse(antimony_stg)
+  except _UnsupportedError:
+    return None
+
+def _parse(antimony_stg):
+  reactions = []
+  num_model = 0
+  num_unlabeled = 0
+  for line in antimony_stg.split("\n"):
+    for comment in COMMENTS:
+      pos = line.find(comment)
+      if pos >= 0:
+        line = line[:pos]
+    statements = [s.strip() for s in line.split(STATEMENT_SEPARATOR)]
+    idx = 0
+    while idx < len(statements):
+      statement = statements[idx]
+      idx += 1
+      if len(statement) == 0:
+        continue
+      if any([a in statement for a in ARROWS]):
+        # The rate law is the next statement on the line
+        rate_law = None
+        if idx < len(statements):
+          rate_law = statements[idx]
+          idx += 1
+        label, statement = _splitLabel(statement)
+        if label is None:
+          label = "%s%d" % (UNLABELED_PREFIX, num_unlabeled)
+          num_unlabeled += 1
+        reactions.append(_makeReaction(label, statement, rate_law))
+      elif ASSIGNMENT_PATTERN.match(statement):
+        continue  # Initial values do not change the reactions
+      elif DECLARATION_PATTERN.match(statement):
+        continue
+      elif MODEL_PATTERN.match(statement):
+        num_model += 1
+        if num_model > 1:
+          raise _UnsupportedError("Multiple models")
+      elif statement == END:
+        continue
+      else:
+        raise _UnsupportedError(statement)
+  return reactions
+
+def _splitLabel(statement):
+  """
+  :param str statement: reaction statement
+  :return str/None, str: label, reaction without the label
+  """
+  pos = statement.find(LABEL_SEPARATOR)
+  if pos < 0:
+    return None, statement
+  label = statement[:pos].strip()
+  if not LABEL_PATTERN.match(label):
+    raise _UnsupportedError(statement)
+  return label, statement[pos+1:]
+
+def _makeMoleculeStoichiometrys(side):
+  """
+  Parses the terms on one side of a reaction. Repeated species
+  are combined.
+  :param str side:
+  :return list-MoleculeStoichiometry:
+  """
+  stoichiometrys = collections.OrderedDict()
+  for term in side.split(TERM_SEPARATOR):
+    term = term.strip()
+    if len(term) == 0:
+      if len(side.strip()) > 0:
+        raise _UnsupportedError(side)
+      continue
+    match = TERM_PATTERN.match(term)
+    if match is None:
+      raise _UnsupportedError(term)
+    number, name = match.groups()
+    stoichiometry = 1.0 if number is None else float(number)
+    stoichiometrys[name] = stoichiometrys.get(name, 0) + stoichiometry
+  return [MoleculeStoichiometry(Molecule(n), s)
+      for n, s in stoichiometrys.items()]
+
+def _makeReaction(label, statement, rate_law):
+  """
+  :param str label:
+  :param str statement: reaction without the label
+  :param str rate_law: None if absent
+  :return Reaction:
+  """
+  sides = None
+  for arrow in ARROWS:
+    if arrow in statement:
+      sides = statement.split(arrow)
+      break
+  if len(sides) != 2:
+    raise _UnsupportedError(statement)
+  reactants = _makeMoleculeStoichiometrys(sides[0])
+  products = _makeMoleculeStoichiometrys(sides[1])
+  if len(reactants) + len(products) == 0:
+    raise _UnsupportedError(statement)
+  kinetics_law = None
+  kinetics_terms = []
+  if (rate_law is not None) and (len(rate_law) > 0):
+    # Format the law as libsbml does for the SBML of the model
+    math = libsbml.parseL3Formula(rate_law)
+    if math is None:
+      raise _UnsupportedError(rate_law)
+    kinetics_law = libsbml.formulaToString(math)
+    kinetics_terms = Reaction.getMathTerms(math)
+  return Reaction.makeFromParts(label, reactants, products,
+      kinetics_law=kinetics_law, kinetics_terms=kinetics_terms)
@@ -3,15 +3,23 @@
 Provides two functions.
   setConfiguration(<path>) - sets the value of the configuration dictionary.
   getConfiguration() - returns the current value of the configuration dictionary.
+The default configuration file is read on the first call to
+getConfiguration() if setConfiguration() has not been called.
+Parsed configuration files are cached by their contents so that
+long-running processes do not parse the same file repeatedly.
 """
 
+import collections
+import copy
 import os
-import yaml
 
 import SBMLLint.common.constants as cn
 from SBMLLint.common import msgs
 
 _config_dict = None  # Configuration dictionary
+MAX_PARSED_CONFIGURATIONS = 64
+# key: file contents, value: parsed dictionary; least recently used first
+_parsed_configurations = collections.OrderedDict()
 
 
 def setConfiguration(path=cn.CFG_DEFAULT_PATH, fid=None):
@@ -30,7 +38,14 @@ def setConfiguration(path=cn.CFG_DEFAULT_PATH, fid=None):
   lines = fid.readlines()
   fid.close()
   lines = '\n'.join(lines)
-  result = yaml.safe_load(lines)
+  if lines in _parsed_configurations:
+    _parsed_configurations.move_to_end(lines)
+  else:
+    import yaml
+    _parsed_configurations[lines] = yaml.safe_load(lines)
+    if len(_parsed_configurations) > MAX_PARSED_CONFIGURATIONS:
+      _parsed_configurations.popitem(last=False)
+  result = copy.deepcopy(_parsed_configurations[lines])
   # Validate the section names
   for name in result.keys():
     if not name in cn.CFG_SECTIONS:
@@ -48,6 +63,6 @@ def setConfiguration(path=cn.CFG_DEFAULT_PATH, fid=None):
   _config_dict = result
 
 def getConfiguration():
+  if _config_dict is None:
+    setConfiguration(path=cn.CFG_DEFAULT_PATH)
   return _config_dict
-#
-setConfiguration(path=cn.CFG_DEFAULT_PATH)
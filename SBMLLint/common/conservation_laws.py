@@ -0,0 +1,273 @@
+"""
+Conservation laws (conserved moieties) of a stoichiometry matrix.
+
+A conservation law is a vector y of species coefficients such that
+y.dot(S) = 0 for the stoichiometry matrix S (species x reactions),
+i.e., the weighted sum of the species is constant. The laws are a basis
+of the left nullspace of S. They are computed by exact (rational)
+Gauss-Jordan elimination on the sparse rows of S^T, so that the laws
+have integer coefficients and no rounding errors. Pivots are chosen
+to keep the reduced rows sparse. Laws are then combined with
+non-negative laws to remove negative coefficients where possible.
+"""
+
+from SBMLLint.common import exceptions
+from SBMLLint.common.stoichiometry_matrix import StoichiometryMatrix
+
+from fractions import Fraction
+import math
+import pandas as pd
+import time
+
+# Largest number of nonzero entries of the stoichiometry matrix
+MAX_NONZEROS = 10**6
+# Seconds allowed for the calculation
+TIMEOUT = 60
+# Stoichiometries are converted to fractions with at most
+# this denominator
+MAX_DENOMINATOR = 10**6
+
+
+############## FUNCTIONS ##################
+def _makeIntegers(vector):
+  """
+  Scales a vector of fractions to coprime integers.
+  :param dict vector: key: molecule name, value: Fraction
+  :return dict: key: molecule name, value: int
+  """
+  multiple = 1
+  for value in vector.values():
+    multiple = multiple*value.denominator//math.gcd(multiple,
+        value.denominator)
+  integers = {k: int(v*multiple) for k, v in vector.items() if v != 0}
+  divisor = 0
+  for value in integers.values():
+    divisor = math.gcd(divisor, value)
+  if divisor > 1:
+    integers = {k: v//divisor for k, v in integers.items()}
+  return integers
+
+def _isNonNegative(law):
+  """
+  :param dict law:
+  :return bool:
+  """
+  return all([v > 0 for v in law.values()])
+
+
+############## CLASSES ##################
+class ConservationLaws(object):
+  """
+  Basis of the conservation laws of the non-boundary reactions
+  of a model. Each law is a dictionary from molecule names to
+  nonzero integer coefficients.
+  """
+
+  def __init__(self, sm_matrix, max_nonzeros=MAX_NONZEROS, timeout=TIMEOUT):
+    """
+    :param StoichiometryMatrix/SimpleSBML sm_matrix:
+    :param int max_nonzeros: largest number of nonzero entries
+        in the stoichiometry matrix; None for no limit
+    :param float timeout: seconds; None for no limit
+    :raises exceptions.ConservationLawLimitError: the size or
+        time limit is exceeded
+    """
+    if not isinstance(sm_matrix, StoichiometryMatrix):
+      sm_matrix = StoichiometryMatrix(simple=sm_matrix)
+    # sorted so that the laws do not depend on set ordering
+    self.molecules = sorted(sm_matrix.stoichiometry_matrix.index)
+    self.max_nonzeros = max_nonzeros
+    self.timeout = timeout
+    self._deadline = None
+    if timeout is not None:
+      self._deadline = time.time() + timeout
+    self.rank = None
+    self.laws = self._calculateLaws(sm_matrix.stoichiometry_matrix)
+
+  def __len__(self):
+    return len(self.laws)
+
+  def __repr__(self):
+    return "\n".join([self.makeLawString(l) for l in self.laws])
+
+  def _checkTime(self):
+    if (self._deadline is not None) and (time.time() >= self._deadline):
+      raise exceptions.ConservationLawLimitError(
+          "Conservation laws not found within %s seconds." % self.timeout)
+
+  def _getRows(self, stoichiometry_matrix):
+    """
+    Constructs the sparse rows of S^T, one column of S at a time.
+    :param pd.DataFrame stoichiometry_matrix: species x reactions
+    :return list-dict: key: molecule name, value: Fraction
+    """
+    rows = []
+    num_nonzeros = 0
+    for idx in range(stoichiometry_matrix.shape[1]):
+      column = stoichiometry_matrix.iloc[:, idx]
+      column = column[column != 0]
+      num_nonzeros += len(column)
+      if (self.max_nonzeros is not None)  \
+          and (num_nonzeros > self.max_nonzeros):
+        raise exceptions.ConservationLawLimitError(
+            "Stoichiometry matrix has more than %d nonzero entries."
+            % self.max_nonzeros)
+      rows.append({m: Fraction(float(v)).limit_denominator(MAX_DENOMINATOR)
+          for m, v in column.items()})
+    return rows
+
+  def _calculateLaws(self, stoichiometry_matrix):
+    """
+    Finds a basis of the left nullspace by reducing S^T to
+    reduced row echelon form.
+    :param pd.DataFrame stoichiometry_matrix: species x reactions
+    :return list-dict:
+    """
+    rows = self._getRows(stoichiometry_matrix)
+    # Sparse rows are reduced first
+    rows.sort(key=len)
+    pivot_rows = {}  # key: pivot molecule, value: reduced row
+    # key: molecule, value: pivot molecules whose rows contain it
+    columns = {m: set() for m in self.molecules}
+    for row in rows:
+      self._checkTime()
+      # Pivot rows do not contain other pivots, so a single
+      # pass removes the pivots from the row
+      for pivot in [m for m in row.keys() if m in pivot_rows]:
+        factor = row.get(pivot, 0)
+        if factor == 0:
+          continue
+        for molecule, value in pivot_rows[pivot].items():
+          row[molecule] = row.get(molecule, 0) - factor*value
+      row = {m: v for m, v in row.items() if v != 0}
+      if len(row) == 0:
+        continue
+      # Pivot on the molecule in the fewest pivot rows (fill-in)
+      pivot = min(row.keys(), key=lambda m: (len(columns[m]), m))
+      pivot_value = row[pivot]
+      row = {m: v/pivot_value for m, v in row.items()}
+      for other_pivot in list(columns[pivot]):
+        other_row = pivot_rows[other_pivot]
+        factor = other_row[pivot]
+        for molecule, value in row.items():
+          new_value = other_row.get(molecule, 0) - factor*value
+          if new_value == 0:
+            other_row.pop(molecule, None)
+            columns[molecule].discard(other_pivot)
+          else:
+            other_row[molecule] = new_value
+            columns[molecule].add(other_pivot)
+      pivot_rows[pivot] = row
+      for molecule in row.keys():
+        if molecule != pivot:
+          columns[molecule].add(pivot)
+    self.rank = len(pivot_rows)
+    # Each free molecule defines a law
+    laws = []
+    for molecule in self.molecules:
+      if molecule in pivot_rows:
+        continue
+      law = {molecule: Fraction(1)}
+      for pivot in columns[molecule]:
+        law[pivot] = -pivot_rows[pivot][molecule]
+      laws.append(_makeIntegers(law))
+    return self._makeNonNegative(laws)
+
+  def _makeNonNegative(self, laws):
+    """
+    Removes negative coefficients of a law by adding a multiple
+    of a non-negative law that contains all of its negative
+    molecules, or else of the sum of the non-negative laws.
+    The result is non-negative, and non-negative laws are not
+    changed, so the laws remain a basis. Passes are repeated
+    until no law changes, so the result does not depend on
+    the order of the laws.
+    :param list-dict laws:
+    :return list-dict:
+    """
+    def addLaws(law1, law2):
+      result = dict(law1)
+      for molecule, value in law2.items():
+        result[molecule] = result.get(molecule, 0) + value
+      return result
+    #
+    results = list(laws)
+    non_negatives = [l for l in results if _isNonNegative(l)]
+    is_changed = True
+    while is_changed:
+      is_changed = False
+      for idx, law in enumerate(results):
+        self._checkTime()
+        negatives = [m for m, v in law.items() if v < 0]
+        if len(negatives) == 0:
+          continue
+        candidates = [o for o in non_negatives
+            if all([m in o for m in negatives])]
+        if (len(candidates) == 0) and (len(non_negatives) > 1):
+          total = {}
+          for other in non_negatives:
+            total = addLaws(total, other)
+          candidates = [total]
+        for other in candidates:
+          if not all([m in other for m in negatives]):
+            continue
+          multiple = max([Fraction(-law[m], other[m]) for m in negatives])
+          new_law = addLaws(law, {m: multiple*v for m, v in other.items()})
+          results[idx] = _makeIntegers({m: Fraction(v)
+              for m, v in new_law.items()})
+          non_negatives.append(results[idx])
+          is_changed = True
+          break
+    return results
+
+  def getNonNegativeLaws(self):
+    """
+    :return list-dict: laws with only positive coefficients
+    """
+    return [l for l in self.laws if _isNonNegative(l)]
+
+  def getMatrix(self):
+    """
+    :return pd.DataFrame: laws x molecules
+    """
+    matrix = pd.DataFrame(0, index=range(len(self.laws)),
+        columns=self.molecules)
+    for idx, law in enumerate(self.laws):
+      for molecule, value in law.items():
+        matrix.loc[idx, molecule] = value
+    return matrix
+
+  def getSparseMatrix(self):
+    """
+    :return scipy.sparse.csr_matrix: laws x molecules
+    """
+    from scipy import sparse
+    molecule_idxs = {m: n for n, m in enumerate(self.molecules)}
+    rows = []
+    columns = []
+    values = []
+    for idx, law in enumerate(self.laws):
+      for molecule, value in law.items():
+        rows.append(idx)
+        columns.append(molecule_idxs[molecule])
+        values.append(value)
+    return sparse.csr_matrix((values, (rows, columns)),
+        shape=(len(self.laws), len(self.molecules)))
+
+  @staticmethod
+  def makeLawString(law):
+    """
+    Describes a law as a weighted sum of molecules.
+    :param dict law:
+    :return str: e.g., "A + 2 B - C"
+    """
+    stg = ""
+    for molecule in sorted(law.keys()):
+      value = law[molecule]
+      if len(stg) == 0:
+        sign = "-" if value < 0 else ""
+      else:
+        sign = " - " if value < 0 else " + "
+      coefficient = "" if abs(value) == 1 else "%d " % abs(value)
+      stg = "%s%s%s%s" % (stg, sign, coefficient, molecule)
+    return stg
@@ -6,6 +6,30 @@ PROJECT_NAME = "SBMLLint"
 
 MOIETY_ANALYSIS = "moiety_analysis"
 GAMES = "games"
+LP_ANALYSIS = "lp_analysis"
+
+############### OUTPUT FORMATS ##############
+FORMAT_TEXT = "text"
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+OUTPUT_FORMATS = [FORMAT_TEXT, FORMAT_JSON, FORMAT_NDJSON]
+############### LINT MODES ##############
+MODE_REPORT = "report"  # Finds and reports all errors
+MODE_CHECK = "check"  # Stops at the first error
+LINT_MODES = [MODE_REPORT, MODE_CHECK]
+
+############### STRUCTURED RESULTS ##############
+# Keys of structured results
+RESULT_TOOL = "tool"
+RESULT_MODEL = "model"
+RESULT_NUM_REACTIONS = "num_reactions"
+RESULT_TYPE = "type"
+RESULT_LABEL = "label"
+RESULT_REACTIONS = "reactions"
+RESULT_SOMS = "soms"
+RESULT_UNCONSERVED_SPECIES = "unconserved_species"
+RESULT_TIMINGS = "timings"
+RESULT_ERROR = "error"
 
 ############### COLUMN NAMES ##############
 FILENAME = "filename"
@@ -112,21 +136,23 @@ REACTION = "reaction"
 # x: number of reactants, y: number of products
 # z: sum of reactants stoichiometry
 # w: sum of products stoichiometry
+# Predicates use & and | so that they apply element-wise
+# to numpy arrays as well as to scalars.
 REACTION_CATEGORIES = [
     ReactionCategory(category=REACTION_1_1,
-        predicate=lambda x,y,z,w: (x==1) and (y==1) and (z==w)),
+        predicate=lambda x,y,z,w: (x==1) & (y==1) & (z==w)),
     ReactionCategory(category=REACTION_1_n,
-        predicate=lambda x,y,z,w: ((x==1) and (y>1) and (z==1.00)) \
-                               or ((x==1) and (y==1) and (z<w))),
+        predicate=lambda x,y,z,w: ((x==1) & (y>1) & (z==1.00)) \
+                               | ((x==1) & (y==1) & (z<w))),
     ReactionCategory(category=REACTION_n_1,
-        predicate=lambda x,y,z,w: ((x>1) and (y==1) and (w==1.00)) \
-                               or ((x==1) and (y==1) and (z>w))),
+        predicate=lambda x,y,z,w: ((x>1) & (y==1) & (w==1.00)) \
+                               | ((x==1) & (y==1) & (z>w))),
     ReactionCategory(category=REACTION_n_n,
-        predicate=lambda x,y,z,w: ((x>1) and (y>1)) 
-                               or ((x==1) and (y>1) and (z!=1.00)) \
-                               or ((x>1) and (y==1) and (w!=1.00))),
+        predicate=lambda x,y,z,w: ((x>1) & (y>1)) 
+                               | ((x==1) & (y>1) & (z!=1.00)) \
+                               | ((x>1) & (y==1) & (w!=1.00))),
     ReactionCategory(category=REACTION_BOUNDARY,
-        predicate=lambda x,y,z,w: (x==0) or (y==0) or (z==0) or (w==0)),
+        predicate=lambda x,y,z,w: (x==0) | (y==0) | (z==0) | (w==0)),
     ]
 # Similar to REACTION_CATEGORIES but have different arguments r, p 
 # and two additional categories - reaction_redundant and reaction_error
@@ -157,6 +183,10 @@ ReactionSummary = collections.namedtuple('ReactionSummary',
 # building block for each MESGraph path
 PathComponents = collections.namedtuple('PathComponents',
                                         'node1 node2 reactions')
+# reaction label and source/destination molecule names of an arc
+PROVENANCE = "provenance"
+ArcProvenance = collections.namedtuple('ArcProvenance',
+                                       'reaction source destination')
 
 # used for creating a report
 NULL_STR = ""
@@ -167,12 +197,22 @@ CFG_IGNORED_MOLECULES = "ignored_molecules"
 CFG_MOIETY_STRUCTURE = "moiety_structure"
 CFG_PROCESS_BOUNDARY_REACTIONS = "process_boundary_reactions"
 CFG_GAMES_THRESHOLD = "games_threshold_num_reactions"
+CFG_GAMES_MAX_ERRORS = "games_max_errors"
+CFG_GAMES_MAX_EXPLAINED_ERRORS = "games_max_explained_errors"
+CFG_GAMES_MEMORY_LIMIT = "games_memory_limit"
+CFG_DECOMPOSE_COMPONENTS = "decompose_components"
+CFG_STREAM_SBML = "stream_sbml"
 CFG_SECTIONS = [
     CFG_IGNORED_MOLECULES,
     CFG_IGNORED_MOIETIES,
     CFG_PROCESS_BOUNDARY_REACTIONS,
     CFG_MOIETY_STRUCTURE,
     CFG_GAMES_THRESHOLD,
+    CFG_GAMES_MAX_ERRORS,
+    CFG_GAMES_MAX_EXPLAINED_ERRORS,
+    CFG_GAMES_MEMORY_LIMIT,
+    CFG_DECOMPOSE_COMPONENTS,
+    CFG_STREAM_SBML,
     ]
 
 # Default values for configuration file
@@ -181,5 +221,10 @@ CFG_DEFAULTS[CFG_IGNORED_MOIETIES] = ['DUMMYMOIETY']
 CFG_DEFAULTS[CFG_IGNORED_MOLECULES] = ['DUMMYMOLECULE']
 CFG_DEFAULTS[CFG_PROCESS_BOUNDARY_REACTIONS] = False
 CFG_DEFAULTS[CFG_GAMES_THRESHOLD] = 20
+CFG_DEFAULTS[CFG_GAMES_MAX_ERRORS] = None
+CFG_DEFAULTS[CFG_GAMES_MAX_EXPLAINED_ERRORS] = None
+CFG_DEFAULTS[CFG_GAMES_MEMORY_LIMIT] = None
+CFG_DEFAULTS[CFG_DECOMPOSE_COMPONENTS] = False
+CFG_DEFAULTS[CFG_STREAM_SBML] = False
 CFG_DEFAULT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CFG_DEFAULT_PATH = os.path.join(CFG_DEFAULT_PATH, ".sbmllint_cfg.yml")
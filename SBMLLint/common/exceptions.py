@@ -2,3 +2,6 @@
 
 class MissingTelluriumError(Exception):
   pass
+
+class ConservationLawLimitError(Exception):
+  pass
@@ -0,0 +1,212 @@
+"""
+Binary snapshot of a parsed model.
+
+A snapshot stores what SimpleSBML extracts from an SBML model in a
+columnar layout, so that repeated analyses start without libsbml.
+The file is
+  MAGIC, version (uint32), header size (uint64), header (JSON),
+  arrays, each aligned to ALIGNMENT bytes
+The header describes the dtype, shape and offset of each array.
+Arrays are memory mapped when the snapshot is loaded.
+
+Strings are stored as a utf-8 blob with offsets (n + 1 entries).
+Arrays:
+  species_blob, species_offsets: species names
+  label_blob, label_offsets: reaction labels
+  law_blob, law_offsets, has_law: kinetics laws
+  term_blob, term_offsets: kinetics terms of all reactions
+  reaction_term_offsets: terms of each reaction
+  reactant_offsets, reactant_species, reactant_stoichiometry:
+      reactants of each reaction as indices into species
+  product_offsets, product_species, product_stoichiometry
+  category_blob, category_offsets: reaction categories, so that
+      loaded reactions are not categorized again
+"""
+
+from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
+from SBMLLint.common.reaction import Reaction
+
+import json
+import struct
+import numpy as np
+
+MAGIC = b"SBMLLINTSNAP"
+VERSION = 2
+ALIGNMENT = 8
+PREFIX_FORMAT = "<%dsIQ" % len(MAGIC)
+PREFIX_SIZE = struct.calcsize(PREFIX_FORMAT)
+DTYPE_INDEX = np.int64
+DTYPE_SPECIES = np.int32
+DTYPE_STOICHIOMETRY = np.float64
+
+
+def _align(size):
+  return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _makeStringArrays(stgs):
+  """
+  :param list-str stgs:
+  :return np.array, np.array: utf-8 blob, offsets
+  """
+  encodeds = [s.encode("utf-8") for s in stgs]
+  offsets = np.zeros(len(encodeds) + 1, dtype=DTYPE_INDEX)
+  offsets[1:] = np.cumsum([len(e) for e in encodeds])
+  blob = np.frombuffer(b"".join(encodeds), dtype=np.uint8)
+  return blob, offsets
+
+def _getStrings(blob, offsets):
+  """
+  :param np.array blob:
+  :param np.array offsets:
+  :return list-str:
+  """
+  data = blob.tobytes()
+  return [data[offsets[n]:offsets[n+1]].decode("utf-8")
+      for n in range(len(offsets) - 1)]
+
+def writeSnapshot(simple, path):
+  """
+  Writes the snapshot of an initialized SimpleSBML.
+  :param SimpleSBML simple:
+  :param str path:
+  """
+  species_names = []
+  species_indices = {}
+  def getIndex(name):
+    if not name in species_indices:
+      species_indices[name] = len(species_names)
+      species_names.append(name)
+    return species_indices[name]
+  #
+  arrays = {}
+  for side in ["reactant", "product"]:
+    offsets = [0]
+    indices = []
+    stoichiometrys = []
+    for reaction in simple.reactions:
+      if side == "reactant":
+        molecule_stoichiometrys = reaction.reactants
+      else:
+        molecule_stoichiometrys = reaction.products
+      for m_s in molecule_stoichiometrys:
+        indices.append(getIndex(m_s.molecule.name))
+        stoichiometrys.append(m_s.stoichiometry)
+      offsets.append(len(indices))
+    arrays["%s_offsets" % side] = np.array(offsets, dtype=DTYPE_INDEX)
+    arrays["%s_species" % side] = np.array(indices, dtype=DTYPE_SPECIES)
+    arrays["%s_stoichiometry" % side] = np.array(stoichiometrys,
+        dtype=DTYPE_STOICHIOMETRY)
+  # Species that are not in reactions are kept
+  for molecule in simple.molecules:
+    getIndex(molecule.name)
+  arrays["species_blob"], arrays["species_offsets"] =  \
+      _makeStringArrays(species_names)
+  arrays["label_blob"], arrays["label_offsets"] =  \
+      _makeStringArrays([r.label for r in simple.reactions])
+  laws = [r.kinetics_law for r in simple.reactions]
+  arrays["has_law"] = np.array([l is not None for l in laws], dtype=bool)
+  arrays["law_blob"], arrays["law_offsets"] =  \
+      _makeStringArrays([l if l is not None else "" for l in laws])
+  terms = []
+  term_offsets = [0]
+  for reaction in simple.reactions:
+    terms.extend(reaction.kinetics_terms)
+    term_offsets.append(len(terms))
+  arrays["term_blob"], arrays["term_offsets"] = _makeStringArrays(terms)
+  arrays["reaction_term_offsets"] = np.array(term_offsets,
+      dtype=DTYPE_INDEX)
+  arrays["category_blob"], arrays["category_offsets"] =  \
+      _makeStringArrays([r.category for r in simple.reactions])
+  # Layout the arrays after the header
+  descriptions = {}
+  offset = 0
+  for name in sorted(arrays.keys()):
+    array = arrays[name]
+    descriptions[name] = {"dtype": array.dtype.str,
+        "shape": list(array.shape), "offset": offset}
+    offset = _align(offset + array.nbytes)
+  header = json.dumps({"arrays": descriptions}).encode("utf-8")
+  data_start = _align(PREFIX_SIZE + len(header))
+  with open(path, "wb") as fd:
+    fd.write(struct.pack(PREFIX_FORMAT, MAGIC, VERSION, len(header)))
+    fd.write(header)
+    for name in sorted(arrays.keys()):
+      fd.seek(data_start + descriptions[name]["offset"])
+      fd.write(arrays[name].tobytes())
+    # Make sure the file covers the last aligned array
+    fd.truncate(max(fd.tell(), data_start + offset))
+
+
+class ModelSnapshot(object):
+  """Memory mapped snapshot of a model."""
+
+  def __init__(self, path):
+    """
+    :param str path:
+    :raises ValueError: not a snapshot
+    """
+    self.path = path
+    with open(path, "rb") as fd:
+      prefix = fd.read(PREFIX_SIZE)
+      if len(prefix) < PREFIX_SIZE:
+        raise ValueError("%s is not a model snapshot." % path)
+      magic, version, header_size = struct.unpack(PREFIX_FORMAT, prefix)
+      if magic != MAGIC:
+        raise ValueError("%s is not a model snapshot." % path)
+      if version != VERSION:
+        raise ValueError("Unsupported snapshot version %d in %s."
+            % (version, path))
+      header = json.loads(fd.read(header_size).decode("utf-8"))
+    data_start = _align(PREFIX_SIZE + header_size)
+    memmap = np.memmap(path, dtype=np.uint8, mode="r")
+    self.arrays = {}
+    for name, description in header["arrays"].items():
+      dtype = np.dtype(description["dtype"])
+      shape = tuple(description["shape"])
+      start = data_start + description["offset"]
+      nbytes = int(np.prod(shape))*dtype.itemsize
+      self.arrays[name] = memmap[start:start + nbytes].view(dtype).reshape(shape)
+
+  @property
+  def species_names(self):
+    return _getStrings(self.arrays["species_blob"],
+        self.arrays["species_offsets"])
+
+  @property
+  def reaction_labels(self):
+    return _getStrings(self.arrays["label_blob"],
+        self.arrays["label_offsets"])
+
+  def makeReactions(self):
+    """
+    Constructs the reactions of the model.
+    :return list-Reaction:
+    """
+    molecules = [Molecule(n) for n in self.species_names]
+    laws = _getStrings(self.arrays["law_blob"], self.arrays["law_offsets"])
+    has_law = self.arrays["has_law"]
+    terms = _getStrings(self.arrays["term_blob"],
+        self.arrays["term_offsets"])
+    term_offsets = self.arrays["reaction_term_offsets"]
+    categorys = _getStrings(self.arrays["category_blob"],
+        self.arrays["category_offsets"])
+    def getMoleculeStoichiometrys(side, idx):
+      offsets = self.arrays["%s_offsets" % side]
+      species = self.arrays["%s_species" % side]
+      stoichiometrys = self.arrays["%s_stoichiometry" % side]
+      return [MoleculeStoichiometry(molecules[species[n]],
+          float(stoichiometrys[n]))
+          for n in range(offsets[idx], offsets[idx+1])]
+    #
+    reactions = []
+    for idx, label in enumerate(self.reaction_labels):
+      kinetics_law = None
+      if has_law[idx]:
+        kinetics_law = laws[idx]
+      reactions.append(Reaction.makeFromParts(label,
+          getMoleculeStoichiometrys("reactant", idx),
+          getMoleculeStoichiometrys("product", idx),
+          kinetics_law=kinetics_law,
+          kinetics_terms=terms[term_offsets[idx]:term_offsets[idx+1]],
+          category=categorys[idx]))
+    return reactions
@@ -0,0 +1,225 @@
+"""
+Random access to the models in a zip archive.
+
+The index of a ModelStore gives, for each model, the offset of its
+entry in the archive, its sizes and its CRC-32 (the content hash
+recorded by zip). Models are read directly from a memory map of the
+archive, so a model is fetched without iterating over the archive.
+A store is cheap to pickle: only the path and index are sent, and the
+archive is mapped again on first use. Workers in a pool can therefore
+share one index and fetch disjoint shards.
+  Usage:
+    store = ModelStore(path)
+    xml = store.read("BIOMD0000000010")
+    for item in store.modelIterator(initial=900, final=910):
+      ...
+"""
+
+from SBMLLint.common.simple_sbml import IteratorItem
+
+import collections
+import mmap
+import os
+import re
+import struct
+import zipfile
+import zlib
+
+# name: name of the entry in the archive
+# offset: offset of the local file header
+# compress_size: size of the stored data
+# size: size of the uncompressed data
+# crc: CRC-32 of the uncompressed data
+# compress_type: zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, ...
+IndexEntry = collections.namedtuple('IndexEntry',
+    'name offset compress_size size crc compress_type')
+
+LOCAL_HEADER_FORMAT = "<4s2B4HL2L2H"
+LOCAL_HEADER_SIZE = struct.calcsize(LOCAL_HEADER_FORMAT)
+LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+# Positions of the name and extra field lengths in the local header
+LOCAL_HEADER_NAME_LENGTH = 10
+LOCAL_HEADER_EXTRA_LENGTH = 11
+MODEL_ID_PATTERN = re.compile(r"(BIOMD|MODEL)\d{10}")
+
+
+class ModelStore(object):
+  """Indexed, memory mapped access to models in a zip archive."""
+
+  def __init__(self, path, index=None):
+    """
+    :param str path: path to the zip archive
+    :param list-IndexEntry index: index of the archive;
+        built from the archive if None
+    """
+    self.path = path
+    if index is None:
+      index = self.makeIndex(path)
+    self.index = list(index)
+    self._entries = {e.name: e for e in self.index}
+    self._ids = {}
+    for entry in self.index:
+      model_id = self.getModelId(entry.name)
+      if (model_id is not None) and (not model_id in self._ids):
+        self._ids[model_id] = entry.name
+    self._fd = None
+    self._mmap = None
+
+  def __getstate__(self):
+    return {"path": self.path, "index": self.index}
+
+  def __setstate__(self, state):
+    self.__init__(state["path"], index=state["index"])
+
+  def __len__(self):
+    return len(self.index)
+
+  @property
+  def names(self):
+    return [e.name for e in self.index]
+
+  @staticmethod
+  def makeIndex(path):
+    """
+    Constructs the index from the central directory of the archive.
+    :param str path:
+    :return list-IndexEntry: in the order of the archive
+    """
+    with zipfile.ZipFile(path, "r") as zipper:
+      return [IndexEntry(name=i.filename, offset=i.header_offset,
+          compress_size=i.compress_size, size=i.file_size,
+          crc=i.CRC, compress_type=i.compress_type)
+          for i in zipper.infolist() if not i.is_dir()]
+
+  @staticmethod
+  def getModelId(name):
+    """
+    Extracts a BioModels identifier from an entry name.
+    :param str name:
+    :return str/None:
+    """
+    result = MODEL_ID_PATTERN.search(name)
+    if result is None:
+      return None
+    return result.group(0)
+
+  def _open(self):
+    """
+    Maps the archive into memory. If the archive cannot be
+    mapped (e.g., it is empty), reads are done from the file.
+    """
+    if self._fd is None:
+      self._fd = open(self.path, "rb")
+      try:
+        self._mmap = mmap.mmap(self._fd.fileno(), 0,
+            access=mmap.ACCESS_READ)
+      except (ValueError, OSError):
+        self._mmap = None
+
+  def close(self):
+    if self._mmap is not None:
+      self._mmap.close()
+      self._mmap = None
+    if self._fd is not None:
+      self._fd.close()
+      self._fd = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *pargs):
+    self.close()
+
+  def _readBytes(self, offset, size):
+    if self._mmap is not None:
+      return self._mmap[offset:offset + size]
+    self._fd.seek(offset)
+    return self._fd.read(size)
+
+  def getEntry(self, reference):
+    """
+    Finds the index entry for an entry name or a model identifier.
+    :param str/int reference: name, BioModels ID or position
+    :return IndexEntry:
+    :raises KeyError: no such model
+    """
+    if isinstance(reference, int):
+      return self.index[reference]
+    if reference in self._entries:
+      return self._entries[reference]
+    if reference in self._ids:
+      return self._entries[self._ids[reference]]
+    raise KeyError("No model %s in %s" % (reference, self.path))
+
+  def readBytes(self, reference):
+    """
+    Reads the uncompressed contents of a model.
+    :param str/int reference: name, BioModels ID or position
+    :return bytes:
+    """
+    entry = self.getEntry(reference)
+    self._open()
+    header = self._readBytes(entry.offset, LOCAL_HEADER_SIZE)
+    fields = struct.unpack(LOCAL_HEADER_FORMAT, header)
+    if fields[0] != LOCAL_HEADER_SIGNATURE:
+      raise IOError("Bad zip entry %s in %s" % (entry.name, self.path))
+    data_offset = entry.offset + LOCAL_HEADER_SIZE  \
+        + fields[LOCAL_HEADER_NAME_LENGTH] + fields[LOCAL_HEADER_EXTRA_LENGTH]
+    data = self._readBytes(data_offset, entry.compress_size)
+    if entry.compress_type == zipfile.ZIP_STORED:
+      result = bytes(data)
+    elif entry.compress_type == zipfile.ZIP_DEFLATED:
+      result = zlib.decompress(data, -zlib.MAX_WBITS)
+    else:
+      with zipfile.ZipFile(self.path, "r") as zipper:
+        return zipper.read(entry.name)
+    if zlib.crc32(result) != entry.crc:
+      raise IOError("Bad CRC for %s in %s" % (entry.name, self.path))
+    return result
+
+  def read(self, reference):
+    """
+    Reads a model.
+    :param str/int reference: name, BioModels ID or position
+    :return str: model contents
+    """
+    return self.readBytes(reference).decode("utf-8")
+
+  def getShard(self, shard, num_shard):
+    """
+    Names of the models in a shard. Shards are disjoint
+    contiguous ranges that cover the store.
+    :param int shard: in [0, num_shard)
+    :param int num_shard:
+    :return list-str:
+    """
+    size, remainder = divmod(len(self.index), num_shard)
+    start = shard*size + min(shard, remainder)
+    end = start + size + (1 if shard < remainder else 0)
+    return self.names[start:end]
+
+  def modelIterator(self, initial=0, final=None, exclude=None):
+    """
+    Iterates across a range of models in the same way as
+    simple_sbml.modelIterator.
+    :param int initial: position of the first model
+    :param int final: position after the last model
+    :param set-int exclude: positions of models that are skipped
+        without being read
+    :return IteratorItem:
+    """
+    import libsbml
+    if exclude is None:
+      exclude = set()
+    if final is None:
+      final = len(self.index)
+    begin_num = max(initial, 0)
+    end_num = min(len(self.index), final)
+    for num in range(begin_num, end_num):
+      if num in exclude:
+        continue
+      entry = self.index[num]
+      reader = libsbml.SBMLReader()
+      document = reader.readSBMLFromString(self.read(num))
+      yield IteratorItem(filename=entry.name, number=num,
+          model=document.getModel())
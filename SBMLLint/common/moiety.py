@@ -17,8 +17,7 @@ from SBMLLint.common import constants as cn
 from SBMLLint.common import util
 
 from collections import namedtuple
-import numpy as np
-import pandas as pd
+import threading
 
 
 NameCount = namedtuple("NameCount", "name count")
@@ -26,20 +25,22 @@ NameCount = namedtuple("NameCount", "name count")
 
 NULL_STR = ''
 SEP = ","  # Separator between moiety name and stoichiometry
+_registry_state = threading.local()  # active registries of a thread
 
 
 ############## CLASSES ##################
 class Moiety(object):
 
-  def __init__(self, name, other_moietys=[]):
+  def __init__(self, name, other_moietys=None):
     """
     :param str name:
     :param list-Moiety other_moieties:
     Ensures unique names within other_moietys
     """
     self.name = name
-    if all([name != m.name for m in other_moietys]):
-      other_moietys.append(self)
+    if other_moietys is not None:
+      if all([name != m.name for m in other_moietys]):
+        other_moietys.append(self)
 
   def __repr__(self):
     return self.name
@@ -54,6 +55,54 @@ class Moiety(object):
     return self.name == other.name
 
 
+class MoietyRegistry(object):
+  """
+  Interns Moiety by name so that a model (or an analysis session)
+  has one Moiety per name. A registry is active within a with
+  statement; moieties made with makeMoiety are then interned in it.
+  Moieties are released with the registry.
+    Usage:
+      registry = MoietyRegistry()
+      with registry:
+        moiety = makeMoiety("A")  # registry.get("A")
+  """
+
+  def __init__(self):
+    self._moietys = {}  # key: name, value: Moiety
+
+  def __len__(self):
+    return len(self._moietys)
+
+  def __contains__(self, name):
+    return name in self._moietys
+
+  @property
+  def moietys(self):
+    return list(self._moietys.values())
+
+  def get(self, name):
+    """
+    Provides the Moiety with the name, creating it if needed.
+    :param str name:
+    :return Moiety:
+    """
+    moiety = self._moietys.get(name)
+    if moiety is None:
+      moiety = Moiety(name)
+      self._moietys[name] = moiety
+    return moiety
+
+  def clear(self):
+    self._moietys = {}
+
+  def __enter__(self):
+    getActiveRegistrys().append(self)
+    return self
+
+  def __exit__(self, *pargs):
+    getActiveRegistrys().pop()
+
+
 class MoietyStoichiometry(object):
   """A Moiety with its replication count."""
 
@@ -62,7 +111,7 @@ class MoietyStoichiometry(object):
     if isinstance(moiety, Moiety):
       self.moiety = moiety
     else:
-      self.moiety = Moiety(str(moiety))
+      self.moiety = makeMoiety(str(moiety))
     self.stoichiometry = stoichiometry
     self.name = "%s%s%d" % (self.moiety.name,
         separator, stoichiometry)
@@ -82,9 +131,8 @@ class MoietyStoichiometry(object):
     """
     Extract moieties from MoietyStoichiometrys
     """
-    moietys = util.uniqueify([m_s.moiety 
+    return uniqueifyMoietys([m_s.moiety 
         for m_s in moiety_stoichiometrys])
-    return moietys
 
   @classmethod
   def make(cls, moiety_stoich_stg):
@@ -111,7 +159,7 @@ class MoietyStoichiometry(object):
       raise ValueError(
           "Invalid number in moiety stoichiometry string: %s"
           % moiety_stoich_stg)
-    return cls(Moiety(name), stoich)
+    return cls(makeMoiety(name), stoich)
 
   @classmethod
   def makeFromDct(cls, ms_strs):
@@ -134,5 +182,36 @@ class MoietyStoichiometry(object):
       result.append(MoietyStoichiometry(terms[0], int(terms[1])))
       names.append(terms[0])
     indicies = sorted(range(len(names)), key=lambda k: names[k])
-    arr = np.array(result)
-    return list(arr[indicies])
+    return [result[k] for k in indicies]
+
+
+############## FUNCTIONS ##################
+def getActiveRegistrys():
+  """
+  :return list-MoietyRegistry: active registries of this thread
+  """
+  if not hasattr(_registry_state, "registrys"):
+    _registry_state.registrys = []
+  return _registry_state.registrys
+
+def makeMoiety(name):
+  """
+  Makes a Moiety, interned in the innermost active registry if any.
+  :param str name:
+  :return Moiety:
+  """
+  registrys = getActiveRegistrys()
+  if len(registrys) == 0:
+    return Moiety(name)
+  return registrys[-1].get(name)
+
+def uniqueifyMoietys(moietys):
+  """
+  Removes moieties with duplicate names, keeping the first.
+  :param list-Moiety moietys:
+  :return list-Moiety:
+  """
+  result = {}
+  for moiety in moietys:
+    result.setdefault(moiety.name, moiety)
+  return list(result.values())
@@ -16,12 +16,9 @@ MOLECULE           MOIETY, STOICHIOMETRY
 
 from SBMLLint.common import constants as cn
 from SBMLLint.common import config
-from SBMLLint.common.moiety import Moiety, MoietyStoichiometry
+from SBMLLint.common.moiety import Moiety, MoietyStoichiometry, makeMoiety
 from SBMLLint.common import util
 
-import pandas as pd
-import numpy as np
-
 
 class Molecule(object):
 
@@ -69,7 +66,7 @@ class Molecule(object):
     """
     names = list(set([m_s.moiety.name for m_s in self.moiety_stoichiometrys]))
     names.sort()
-    return [Moiety(n) for n in names]
+    return [makeMoiety(n) for n in names]
 
   def _reformat(self):
     """
@@ -132,6 +129,7 @@ class MoleculeStoichiometry(object):
     Counts the occurrence of moietys.
     :return pd.DataFrame: index is moiety, value is count
     """
+    import pandas as pd
     moiety_stoichs = self.molecule.moiety_stoichiometrys
     moietys = list([str(m.moiety) for m in moiety_stoichs])
     stoichs = list([m.stoichiometry for m in moiety_stoichs])
@@ -149,6 +147,7 @@ class MoleculeStoichiometry(object):
     :param list-MoleculeStoichiometry  molecule_stoichiometrys:
     :return pd.DataFrame: cn.VALUE, indexed by moiety.name
     """
+    import pandas as pd
     dfs = []
     for molecule_stoichiometry in molecule_stoichiometrys:
       dfs.append(molecule_stoichiometry.countMoietys())
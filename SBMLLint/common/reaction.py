@@ -3,7 +3,7 @@
 from SBMLLint.common import constants as cn
 from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
 
-import numpy as np
+import math
 
 
 REACTION_SEPARATOR = "->"
@@ -48,6 +48,34 @@ class Reaction(object):
     self.category = self.getCategory()
     self.kinetics_terms = self.getKineticsTerms(libsbml_reaction)
 
+  @classmethod
+  def makeFromParts(cls, label, reactants, products,
+      kinetics_law=None, kinetics_terms=None, category=None):
+    """
+    Constructs a reaction without a libsbml reaction
+    (e.g., from a model snapshot).
+    :param str label:
+    :param list-MoleculeStoichiometry reactants:
+    :param list-MoleculeStoichiometry products:
+    :param str kinetics_law:
+    :param list-str kinetics_terms:
+    :param str category: category if already known
+    :return Reaction:
+    """
+    reaction = cls.__new__(cls)
+    reaction.reactants = reactants
+    reaction.products = products
+    reaction.kinetics_law = kinetics_law
+    reaction.label = label
+    reaction.identifier = reaction.makeIdentifier(is_include_kinetics=True)
+    if category is None:
+      category = reaction.getCategory()
+    reaction.category = category
+    if kinetics_terms is None:
+      kinetics_terms = []
+    reaction.kinetics_terms = list(kinetics_terms)
+    return reaction
+
   def makeMoleculeStoichiometrys(self, func_get_one, func_get_num):
     """
     Creates a list of MoleculeStoichiometry
@@ -89,7 +117,7 @@ class Reaction(object):
     """
     def makeStoichiometryString(molecule_stoichiometry):
       num = molecule_stoichiometry.stoichiometry
-      if np.isclose(num, 1.0):
+      if math.isclose(num, 1.0, rel_tol=1e-05, abs_tol=1e-08):
         return ''
       else:
         return "%2.2f " % num
@@ -147,6 +175,66 @@ class Reaction(object):
         return reaction_category.category
     raise ValueError("Reaction category not found.")
 
+  @classmethod
+  def categorize(cls, reactions):
+    """
+    Computes the categories of a collection of reactions in one pass.
+    Reactants and products are collected as sparse (row, value)
+    triples, and the predicates in cn.REACTION_CATEGORIES are
+    evaluated on the per-reaction counts and stoichiometry sums.
+    :param list-Reaction/ReactionComponents reactions:
+    :return list-str: categories in the order of reactions
+    """
+    import numpy as np
+    num_reaction = len(reactions)
+    if num_reaction == 0:
+      return []
+    def summarize(func_get):
+      rows = []
+      stoichiometrys = []
+      for idx, reaction in enumerate(reactions):
+        for m_s in func_get(reaction):
+          if m_s.molecule.name != cn.EMPTYSET:
+            rows.append(idx)
+            stoichiometrys.append(m_s.stoichiometry)
+      rows = np.array(rows, dtype=int)
+      counts = np.bincount(rows, minlength=num_reaction)
+      sums = np.bincount(rows,
+          weights=np.array(stoichiometrys, dtype=float),
+          minlength=num_reaction)
+      return counts, sums
+    #
+    num_reactants, stoichiometry_reactants = summarize(
+        lambda r: r.reactants)
+    num_products, stoichiometry_products = summarize(
+        lambda r: r.products)
+    conditions = [c.predicate(num_reactants, num_products,
+        stoichiometry_reactants, stoichiometry_products)
+        for c in cn.REACTION_CATEGORIES]
+    is_found = np.logical_or.reduce(conditions)
+    if not all(is_found):
+      raise ValueError("Reaction category not found.")
+    indices = np.argmax(conditions, axis=0)
+    return [cn.REACTION_CATEGORIES[n].category for n in indices]
+
+  @classmethod
+  def groupByCategory(cls, reactions, categories=None):
+    """
+    Buckets reactions by their category attribute, preserving order.
+    :param list-Reaction reactions: reactions or SOMReactions
+    :param list-str categories: categories to include; all if None
+    :return dict: key is category, value is list of reactions
+    """
+    groups = {}
+    if categories is not None:
+      groups = {c: [] for c in categories}
+    for reaction in reactions:
+      if reaction.category in groups:
+        groups[reaction.category].append(reaction)
+      elif categories is None:
+        groups[reaction.category] = [reaction]
+    return groups
+
   def isEqual(self, other_reaction):
     """
     Checks if two reactions are the same.
@@ -169,20 +257,29 @@ class Reaction(object):
     :param libsbml.Reaction libsbml_reaction:
     :return list-of-str: names of the terms
     """
-    terms = []
     law = libsbml_reaction.getKineticLaw()
-    if law is not None:
-      math = law.getMath()
-      asts = [math]
-      while len(asts) > 0:
-        this_ast = asts.pop()
-        if this_ast.isName():
-          terms.append(this_ast.getName())
-        else:
-          pass
-        num = this_ast.getNumChildren()
-        for idx in range(num):
-          asts.append(this_ast.getChild(idx))
+    if law is None:
+      return []
+    return self.getMathTerms(law.getMath())
+
+  @staticmethod
+  def getMathTerms(math):
+    """
+    Gets the names used in a math expression
+    :param libsbml.ASTNode math:
+    :return list-of-str: names of the terms
+    """
+    terms = []
+    asts = [math]
+    while len(asts) > 0:
+      this_ast = asts.pop()
+      if this_ast.isName():
+        terms.append(this_ast.getName())
+      else:
+        pass
+      num = this_ast.getNumChildren()
+      for idx in range(num):
+        asts.append(this_ast.getChild(idx))
     return terms
 
   @classmethod
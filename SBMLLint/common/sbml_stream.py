@@ -0,0 +1,229 @@
+"""
+Extracts the reactions of an SBML model with an incremental
+XML parser (expat) instead of the libsbml object model.
+Only reaction IDs, species references with their stoichiometries
+and kinetics laws are kept, and files are read in chunks so that
+memory is bounded by the reactions rather than by the document.
+The MathML of a kinetics law is converted by libsbml so that
+the kinetics formulas are those of the libsbml path.
+"""
+
+from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
+from SBMLLint.common.reaction import Reaction
+from SBMLLint.common import util
+
+import libsbml
+import os
+from xml.parsers import expat
+from xml.sax.saxutils import escape, quoteattr
+
+
+CHUNK_SIZE = 2**16  # Bytes read from a file at a time
+MATHML_NAMESPACE = "http://www.w3.org/1998/Math/MathML"
+SBML = "sbml"
+REACTION = "reaction"
+KINETIC_LAW = "kineticLaw"
+MATH = "math"
+SPECIES_REFERENCE = "speciesReference"
+SPECIES_REFERENCE_LISTS = ["listOfReactants", "listOfProducts"]
+SKIPPED_ELEMENTS = ["annotation", "notes"]  # Content is not SBML
+DEFAULT_STOICHIOMETRY = 1.0
+
+
+############## CLASSES ##################
+class _ReactionHandler(object):
+  """
+  Expat handlers that construct reactions as their elements end.
+  """
+
+  def __init__(self):
+    self.reactions = []
+    self.level = None
+    self._is_sbml = False
+    self._num_skip = 0  # Depth within skipped elements
+    self._list_name = None  # List of species references being read
+    self._label = None
+    self._reactants = None
+    self._products = None
+    self._kinetics_law = None
+    self._kinetics_terms = None
+    self._math_strs = None  # MathML being collected
+
+  @staticmethod
+  def _getLocalName(name):
+    return name.split(":")[-1]
+
+  def start(self, name, attributes):
+    name = self._getLocalName(name)
+    if self._num_skip > 0:
+      self._num_skip += 1
+    elif self._math_strs is not None:
+      # Namespace prefixes are dropped since the fragment
+      # is parsed without its document.
+      attribute_stg = "".join([" %s=%s" % (k, quoteattr(v))
+          for k, v in attributes.items() if not ":" in k])
+      self._math_strs.append("<%s%s>" % (name, attribute_stg))
+    elif name in SKIPPED_ELEMENTS:
+      self._num_skip = 1
+    elif name == SBML:
+      self._is_sbml = True
+      self.level = int(attributes.get("level", 3))
+    elif name == REACTION:
+      # Level 1 identifies reactions by name
+      self._label = attributes.get("id", attributes.get("name"))
+      self._reactants = []
+      self._products = []
+      self._kinetics_law = None
+      self._kinetics_terms = []
+    elif name in SPECIES_REFERENCE_LISTS:
+      self._list_name = name
+    elif (name == SPECIES_REFERENCE) and (self._list_name is not None):
+      self._addSpeciesReference(attributes)
+    elif (name == KINETIC_LAW) and (self._label is not None):
+      if "formula" in attributes:
+        self._setKinetics(libsbml.parseFormula(attributes["formula"]),
+            formula=attributes["formula"])
+    elif (name == MATH) and (self._label is not None):
+      self._math_strs = ['<%s xmlns="%s">' % (MATH, MATHML_NAMESPACE)]
+
+  def end(self, name):
+    name = self._getLocalName(name)
+    if self._num_skip > 0:
+      self._num_skip -= 1
+    elif self._math_strs is not None:
+      self._math_strs.append("</%s>" % name)
+      if name == MATH:
+        math = libsbml.readMathMLFromString("".join(self._math_strs))
+        self._math_strs = None
+        self._setKinetics(math)
+    elif name in SPECIES_REFERENCE_LISTS:
+      self._list_name = None
+    elif (name == REACTION) and (self._label is not None):
+      self.reactions.append(Reaction.makeFromParts(self._label,
+          self._reactants, self._products,
+          kinetics_law=self._kinetics_law,
+          kinetics_terms=self._kinetics_terms))
+      self._label = None
+
+  def characters(self, data):
+    if (self._math_strs is not None) and (self._num_skip == 0):
+      self._math_strs.append(escape(data))
+
+  def _addSpeciesReference(self, attributes):
+    # Level 1 uses "specie"
+    species = attributes.get("species", attributes.get("specie"))
+    if "stoichiometry" in attributes:
+      stoichiometry = float(attributes["stoichiometry"])
+    elif self.level >= 3:
+      stoichiometry = float("nan")  # Undefined in level 3
+    else:
+      stoichiometry = DEFAULT_STOICHIOMETRY
+    if "denominator" in attributes:
+      stoichiometry = stoichiometry/float(attributes["denominator"])
+    molecule_stoichiometry = MoleculeStoichiometry(Molecule(species),
+        stoichiometry)
+    if self._list_name == SPECIES_REFERENCE_LISTS[0]:
+      self._reactants.append(molecule_stoichiometry)
+    else:
+      self._products.append(molecule_stoichiometry)
+
+  def _setKinetics(self, math, formula=None):
+    """
+    :param libsbml.ASTNode math:
+    :param str formula: formula if given in the model
+    """
+    if math is None:
+      raise ValueError("Invalid kinetics law in reaction %s"
+          % self._label)
+    if formula is None:
+      formula = libsbml.formulaToString(math)
+    self._kinetics_law = formula
+    self._kinetics_terms = Reaction.getMathTerms(math)
+
+  def checkSBML(self):
+    if not self._is_sbml:
+      raise ValueError("Not an SBML document.")
+
+
+############## FUNCTIONS ##################
+def _iterateChunks(model_reference):
+  """
+  Provides the model in chunks. A fid is not closed.
+  :param str/TextIOWrapper model_reference: path, xml string or fid
+  :return iterator of str/bytes:
+  """
+  if isinstance(model_reference, str):
+    if os.path.isfile(model_reference):
+      with open(model_reference, "rb") as fd:
+        while True:
+          chunk = fd.read(CHUNK_SIZE)
+          if len(chunk) == 0:
+            break
+          yield chunk
+      return
+    yield model_reference
+    return
+  if "read" in dir(model_reference):
+    while True:
+      chunk = model_reference.read(CHUNK_SIZE)
+      if len(chunk) == 0:
+        break
+      yield chunk
+    return
+  raise ValueError("Cannot stream model reference %s" % model_reference)
+
+def _isXMLChunk(chunk):
+  """
+  :param str/bytes chunk: start of a model
+  :return bool: True if the chunk starts an XML document
+  """
+  if isinstance(chunk, bytes):
+    return chunk.lstrip().startswith(b"<")
+  return chunk.lstrip().startswith("<")
+
+def isStreamable(model_reference):
+  """
+  Checks if the model reference can be streamed. Files and strings
+  must be XML; files are checked from their first chunk. A fid is
+  checked only if it is seekable, so that its position is restored.
+  :param object model_reference:
+  :return bool:
+  """
+  if isinstance(model_reference, str):
+    if os.path.isfile(model_reference):
+      with open(model_reference, "rb") as fd:
+        chunk = fd.read(CHUNK_SIZE)
+      return _isXMLChunk(chunk)
+    return util.isXMLString(model_reference)
+  if not "read" in dir(model_reference):
+    return False
+  if not ("seekable" in dir(model_reference)
+      and model_reference.seekable()):
+    return False
+  position = model_reference.tell()
+  chunk = model_reference.read(CHUNK_SIZE)
+  model_reference.seek(position)
+  return _isXMLChunk(chunk)
+
+def extractReactions(model_reference):
+  """
+  Constructs the reactions of an SBML model without building
+  a libsbml document. The document is not validated.
+  :param str/TextIOWrapper model_reference: path, xml string or fid
+  :return list-Reaction:
+  :raises ValueError: not a well formed SBML document
+  """
+  handler = _ReactionHandler()
+  parser = expat.ParserCreate()
+  parser.buffer_text = True
+  parser.StartElementHandler = handler.start
+  parser.EndElementHandler = handler.end
+  parser.CharacterDataHandler = handler.characters
+  try:
+    for chunk in _iterateChunks(model_reference):
+      parser.Parse(chunk, False)
+    parser.Parse(b"", True)
+  except expat.ExpatError as exp:
+    raise ValueError("Invalid SBML document: %s" % str(exp))
+  handler.checkSBML()
+  return handler.reactions
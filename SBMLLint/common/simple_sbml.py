@@ -8,18 +8,18 @@ saving the libsbml object (since these objects are fragile with python
 garbage collection).
 """
 
+from SBMLLint.common import antimony_parser
 from SBMLLint.common import constants as cn
-from SBMLLint.common.moiety import Moiety, MoietyStoichiometry
+from SBMLLint.common.moiety import Moiety, MoietyStoichiometry,  \
+    MoietyRegistry, makeMoiety, uniqueifyMoietys
 from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
 from SBMLLint.common.reaction import Reaction
 from SBMLLint.common import util
 
 import collections
 import os.path
-import numpy as np
 import sys
 import libsbml
-import urllib3
 import warnings
 import zipfile
 
@@ -51,6 +51,8 @@ class SimpleSBML(object):
     self.moietys = []
     self.molecules = []
     self.reactions = []
+    # Moieties of the model are interned here and released with it
+    self.moiety_registry = MoietyRegistry()
 
   def initialize(self, model_reference):
     """
@@ -61,7 +63,16 @@ class SimpleSBML(object):
     if util.isSBMLModel(model_reference):
       model = model_reference
     else:
-      xml = util.getXML(model_reference)
+      model_str = util.getModelString(model_reference)
+      if not util.isXMLString(model_str):
+        # Reaction lists are parsed without Tellurium
+        reactions = antimony_parser.parseReactions(model_str)
+        if reactions is not None:
+          self.reactions = reactions
+          self.molecules = self._getMolecules()
+          self.moietys = self._getMoietys()
+          return
+      xml = util.getXML(model_str)
       reader = libsbml.SBMLReader()
       document = reader.readSBMLFromString(xml)
       util.checkSBMLDocument(document, model_reference=model_reference)
@@ -71,6 +82,90 @@ class SimpleSBML(object):
     self.molecules = self._getMolecules()
     self.moietys = self._getMoietys()
 
+  def initializeFromSnapshot(self, path):
+    """
+    Initializes the instance variables from a model snapshot
+    written by writeSnapshot. libsbml is not used.
+    :param str path:
+    """
+    from SBMLLint.common.model_snapshot import ModelSnapshot
+    self.reactions = ModelSnapshot(path).makeReactions()
+    self.molecules = self._getMolecules()
+    self.moietys = self._getMoietys()
+
+  def initializeFromStream(self, model_reference):
+    """
+    Initializes the instance variables by streaming the reactions
+    of an SBML model (see sbml_stream) without building a libsbml
+    document. Other model references are processed by initialize.
+    :param str/TextIOWrapper model_reference: path, xml string or fid
+    """
+    from SBMLLint.common import sbml_stream
+    if not sbml_stream.isStreamable(model_reference):
+      self.initialize(model_reference)
+      return
+    self.reactions = sbml_stream.extractReactions(model_reference)
+    self.molecules = self._getMolecules()
+    self.moietys = self._getMoietys()
+
+  def writeSnapshot(self, path):
+    """
+    Writes a binary snapshot of the model that can be loaded
+    with initializeFromSnapshot.
+    :param str path:
+    """
+    from SBMLLint.common import model_snapshot
+    model_snapshot.writeSnapshot(self, path)
+
+  def getComponents(self):
+    """
+    Splits the model into the connected components of the
+    species-reaction graph. Boundary reactions do not connect
+    species, since analyses exclude them, and are placed with
+    their first species.
+    :return list-SimpleSBML: components in the order of their
+        first reaction; reactions and molecules keep their order
+    """
+    parents = {}  # key: molecule name, value: parent name
+    def find(name):
+      root = name
+      while parents[root] != root:
+        root = parents[root]
+      while parents[name] != root:
+        parents[name], name = root, parents[name]
+      return root
+    #
+    def getNames(reaction):
+      return [m_s.molecule.name
+          for m_s in reaction.reactants + reaction.products]
+    for reaction in self.reactions:
+      names = getNames(reaction)
+      for name in names:
+        parents.setdefault(name, name)
+      if reaction.category == cn.REACTION_BOUNDARY:
+        continue
+      for name in names[1:]:
+        parents[find(name)] = find(names[0])
+    # Group the reactions
+    groups = collections.OrderedDict()
+    for idx, reaction in enumerate(self.reactions):
+      names = getNames(reaction)
+      if len(names) == 0:
+        key = idx  # reaction without species
+      else:
+        key = find(names[0])
+      groups.setdefault(key, []).append(reaction)
+    components = []
+    for reactions in groups.values():
+      component = SimpleSBML()
+      component.reactions = reactions
+      names = set([n for r in reactions for n in getNames(r)])
+      component.molecules = [m for m in self.molecules if m.name in names]
+      component.moiety_registry = self.moiety_registry
+      component.moietys = component._getMoietys()
+      components.append(component)
+    return components
+
   def _getReactions(self, model):
     reactions = []
     for nn in range(model.getNumReactions()):
@@ -95,16 +190,18 @@ class SimpleSBML(object):
     """
     Sees if there is a valid moiety structure.
     If not, the molecule is a single moiety.
+    Moieties are interned in the model's moiety_registry.
     """
     moietys = []
-    for molecule in self.molecules:
-      try:
-        new_moietys = ([m_s.moiety 
-          for m_s in molecule.moiety_stoichiometrys])
-      except ValueError:
-        new_moietys = [Moiety(molecule.name)]
-      moietys.extend(new_moietys)
-    return util.uniqueify(moietys)
+    with self.moiety_registry:
+      for molecule in self.molecules:
+        try:
+          new_moietys = ([m_s.moiety 
+            for m_s in molecule.moiety_stoichiometrys])
+        except ValueError:
+          new_moietys = [makeMoiety(molecule.name)]
+        moietys.extend(new_moietys)
+    return uniqueifyMoietys(moietys)
 
   def _getMolecules(self):
     """
@@ -166,9 +263,11 @@ def readURL(url):
   """
   :param str url:
   :return str: file content
+  Use url_downloader.URLDownloader to download many URLs.
   """
+  from SBMLLint.common import url_downloader
   def do():
-    http = urllib3.PoolManager()
+    http = url_downloader.getPoolManager()
     response = http.request('GET', url)
     return response.data.decode("utf-8") 
  # Catch bogus warnings
@@ -191,7 +290,7 @@ def getZipfilePaths(data_dir=cn.BIOMODELS_DIR,
   return files, zipper
   
 def modelIterator(initial=0, final=1000, data_dir=cn.BIOMODELS_DIR,
-    zip_filename=cn.BIOMODELS_ZIP_FILENAME):
+    zip_filename=cn.BIOMODELS_ZIP_FILENAME, exclude=None):
   """
   Iterates across all models in a data directory.
   :param int initial: initial file to process
@@ -200,37 +299,36 @@ def modelIterator(initial=0, final=1000, data_dir=cn.BIOMODELS_DIR,
       the xml files
   :param str zip_filename: name of the zipfile to process. If
       None, then looks for XML files in the directory.
+  :param set-int exclude: numbers of models that are skipped
+      without being read
   :return IteratorItem:
   """
-  # Handle zip vs. XML file
+  if exclude is None:
+    exclude = set()
+  # Zip files are read by random access
   if zip_filename is not None:
-    files, zipper = getZipfilePaths(
-        data_dir=data_dir, zip_filename=zip_filename)
-  else:
-    files = [f for f in os.listdir(data_dir) if f[-4:] == ".xml"]
-  # Functions for file types
+    from SBMLLint.common.model_store import ModelStore
+    path = os.path.join(data_dir, zip_filename)
+    with ModelStore(path) as store:
+      for item in store.modelIterator(initial=initial, final=final,
+          exclude=exclude):
+        yield item
+    return
+  files = [f for f in os.listdir(data_dir) if f[-4:] == ".xml"]
   def readXML(filename):
     path = os.path.join(data_dir, filename)
     with open(path, 'r') as fd:
       lines = ''.join(fd.readlines())
     return lines
-  def readZip(filename):
-    with zipper.open(filename, 'r') as fid:
-      lines = fid.read()
-    return lines
   #
-  if zip_filename is not None:
-    read_func = readZip
-  else:
-    read_func = readXML
   begin_num = max(initial, 0)
   num = begin_num - 1
   end_num = min(len(files), final)
   for filename in files[begin_num:end_num]:
     num += 1
-    lines = read_func(filename)
-    if isinstance(lines, bytes):
-      lines = lines.decode("utf-8") 
+    if num in exclude:
+      continue
+    lines = readXML(filename)
     reader = libsbml.SBMLReader()
     document = reader.readSBMLFromString(lines)
     model = document.getModel()
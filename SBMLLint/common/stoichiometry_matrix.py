@@ -3,14 +3,79 @@
 from SBMLLint.common import constants as cn
 from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
 from SBMLLint.common.reaction import Reaction
-from SBMLLint.games.som import SOM
 from SBMLLint.common.simple_sbml import SimpleSBML
 
+import multiprocessing
 import numpy as np
 import pandas as pd
-from scipy.optimize import linprog
 import warnings
 
+# Number of matrix entries above which components are solved
+# in worker processes
+PARALLEL_MIN_SIZE = 10000
+# Indicator value above which a species has positive mass
+# in the slack LP
+CONSERVED_THRESHOLD = 0.5
+
+
+def _solveLP(s_matrix_t):
+  """
+  Solves the consistency LP for a transposed stoichiometry matrix.
+  :param np.array s_matrix_t: reactions x species
+  :return scipy.optimize.OptimizeResult:
+  :raises RuntimeError: the LP could not be solved
+  """
+  from scipy.optimize import linprog
+  # number of reactions
+  nreac = s_matrix_t.shape[0]
+  # number of chemical species
+  nmet = s_matrix_t.shape[1]
+  #
+  b = np.zeros(nreac)
+  c = np.ones(nmet)
+  # Linear programming. c is constraint (here, zero), 
+  # b is vector of possible values for molecule vector. 
+  try:
+    res = linprog(c, A_eq=s_matrix_t, b_eq=b, bounds=(1, None))
+    is_success = True
+  except:
+    is_success = False
+  if not is_success:
+    msg = "*** Failed to solve the stoichiometry matrix."
+    raise RuntimeError(msg)
+  return res
+
+def _solveSlackLP(s_matrix_t):
+  """
+  Finds masses of species with the largest number of positive masses
+  by solving the LP
+    maximize sum(z) subject to
+    s_matrix_t.dot(m) = 0, z <= m, m >= 0, 0 <= z <= 1.
+  Since masses can be scaled and added, z is 1 exactly for
+  the species that have a positive mass in some solution,
+  and m is a solution in which all of them are positive.
+  :param np.array/scipy.sparse.spmatrix s_matrix_t: reactions x species
+  :return np.array, np.array: masses (m), indicators (z)
+  :raises RuntimeError: the LP could not be solved
+  """
+  from scipy import sparse
+  from scipy.optimize import linprog
+  s_matrix_t = sparse.csr_matrix(s_matrix_t)
+  nreac, nmet = s_matrix_t.shape
+  identity = sparse.identity(nmet, format="csr")
+  # variables are [m, z]
+  a_eq = sparse.hstack([s_matrix_t,
+      sparse.csr_matrix((nreac, nmet))], format="csr")
+  a_ub = sparse.hstack([-identity, identity], format="csr")
+  c = np.concatenate([np.zeros(nmet), -np.ones(nmet)])
+  bounds = [(0, None)]*nmet + [(0, 1)]*nmet
+  res = linprog(c, A_ub=a_ub, b_ub=np.zeros(nmet), A_eq=a_eq,
+      b_eq=np.zeros(nreac), bounds=bounds, method="highs")
+  if res.status != 0:
+    msg = "*** Failed to solve the slack LP: %s" % res.message
+    raise RuntimeError(msg)
+  return res.x[:nmet], res.x[nmet:]
+
 
 class StoichiometryMatrix(object):
   """
@@ -24,6 +89,10 @@ class StoichiometryMatrix(object):
     self.stoichiometry_matrix = self.makeStoichiometryMatrix()
     self.consistent = None
     self.result = None
+    # reactions that cause the inconsistency found by fail-fast
+    self.inconsistent_reactions = None
+    # species masses found by getUnconservedSpecies
+    self.masses = None
 
   def _getNonBoundaryReactions(self, simple):
     """
@@ -74,55 +143,120 @@ class StoichiometryMatrix(object):
         stoichiometry_matrix[reaction.label][molecule_name] = net_stoichiometry
     return stoichiometry_matrix
 
-  def isConsistent(self, is_report_warning=True):
+  def getComponents(self):
+    """
+    Finds the connected components of the species-reaction
+    graph of the stoichiometry matrix. Species and reactions
+    with no nonzero entries are not included.
+    :return list-(list-str, list-str): molecule names, reaction labels
+    """
+    from scipy import sparse
+    from scipy.sparse.csgraph import connected_components
+    values = self.stoichiometry_matrix.to_numpy(dtype=float)
+    num_molecule = values.shape[0]
+    incidence = sparse.csr_matrix((values != 0).astype(int))
+    if incidence.nnz == 0:
+      return []
+    adjacency = sparse.bmat([[None, incidence], [incidence.T, None]],
+        format="csr")
+    _, labels = connected_components(adjacency, directed=False)
+    molecule_labels = labels[:num_molecule]
+    reaction_labels = labels[num_molecule:]
+    is_used_reaction = np.asarray(incidence.sum(axis=0)).flatten() > 0
+    components = []
+    for label in np.unique(reaction_labels[is_used_reaction]):
+      molecules = [self.stoichiometry_matrix.index[n]
+          for n in np.flatnonzero(molecule_labels == label)]
+      reactions = [self.stoichiometry_matrix.columns[n]
+          for n in np.flatnonzero(reaction_labels == label)]
+      components.append((molecules, reactions))
+    return components
+
+  def getUnconservedSpecies(self):
+    """
+    Finds the species that cannot have a positive mass, i.e.,
+    the complement of the largest set of species with positive
+    masses that are conserved by all reactions. The model is
+    consistent if there are no such species. A single sparse LP
+    with a slack indicator per species is solved.
+    The masses that are found are kept in masses.
+    :return list-str: molecule names
+    """
+    if self.stoichiometry_matrix.size == 0:
+      self.masses = pd.Series(1.0, index=self.stoichiometry_matrix.index)
+      return []
+    masses, indicators = _solveSlackLP(
+        self.stoichiometry_matrix.T.to_numpy(dtype=float))
+    self.masses = pd.Series(masses, index=self.stoichiometry_matrix.index)
+    return [m for m, z in zip(self.stoichiometry_matrix.index, indicators)
+        if z < CONSERVED_THRESHOLD]
+
+  def _getInconsistentReactions(self, molecules, reactions):
+    """
+    Finds the reactions of an inconsistent component that involve
+    species that cannot have a positive mass (see
+    getUnconservedSpecies).
+    :param list-str molecules:
+    :param list-str reactions:
+    :return list-str:
+    """
+    component = self.stoichiometry_matrix.loc[molecules, reactions]
+    _, indicators = _solveSlackLP(component.T.to_numpy(dtype=float))
+    unconserved = component.index[indicators < CONSERVED_THRESHOLD]
+    is_inconsistent = (component.loc[unconserved] != 0).any(axis=0)
+    return list(component.columns[is_inconsistent.to_numpy()])
+
+  def isConsistent(self, is_report_warning=True, is_decompose=False,
+      num_worker=1, is_fail_fast=False):
     """
     Runs linear programmming (LP) to determine 
     stoichiometric inconsistency. 
     If consistent return True,
     else return False. 
+    With is_decompose, the LP is solved for each connected
+    component of the species-reaction graph; the model is
+    consistent if all components are consistent.
+    With is_fail_fast, components are solved from the smallest
+    and solving stops at the first inconsistent component;
+    its reactions with species that cannot have a positive
+    mass are kept in inconsistent_reactions.
     :param bool is_report_warning: report optimization warnings
+    :param bool is_decompose: solve connected components separately
+    :param int num_worker: processes used for large models
+    :param bool is_fail_fast: stop at the first inconsistent component
     :return bool:
     """
-    s_matrix_t = self.stoichiometry_matrix.T
-    # number of reactions
-    nreac = s_matrix_t.shape[0]
-    # number of chemical species
-    nmet = s_matrix_t.shape[1]
-    #
-    b = np.zeros(nreac)
-    c = np.ones(nmet)
-    # Linear programming. c is constraint (here, zero), 
-    # b is vector of possible values for molecule vector. 
     if not is_report_warning:
       warnings.simplefilter("ignore")
-    try:
-      res = linprog(c, A_eq=s_matrix_t, b_eq=b, bounds=(1, None))
-      self.result = res
-      is_success = True
-    except:
-      is_success = False
-    if not is_success:
-      msg = "*** Failed to solve the stoichiometry matrix."
-      raise RuntimeError(msg)
-    if res.status == 0:
+    self.inconsistent_reactions = None
+    if is_fail_fast:
+      components = sorted(self.getComponents(),
+          key=lambda c: len(c[0])*len(c[1]))
+      self.result = []
       self.consistent = True
+      for molecules, reactions in components:
+        res = _solveLP(self.stoichiometry_matrix.loc[molecules,
+            reactions].T.to_numpy())
+        self.result.append(res)
+        if res.status != 0:
+          self.consistent = False
+          self.inconsistent_reactions = self._getInconsistentReactions(
+              molecules, reactions)
+          break
+      return self.consistent
+    if not is_decompose:
+      res = _solveLP(self.stoichiometry_matrix.T)
+      self.result = res
+      self.consistent = res.status == 0
+      return self.consistent
+    s_matrix_ts = [self.stoichiometry_matrix.loc[m, r].T.to_numpy()
+        for m, r in self.getComponents()]
+    if (num_worker > 1) and (len(s_matrix_ts) > 1)  \
+        and (self.stoichiometry_matrix.size >= PARALLEL_MIN_SIZE):
+      with multiprocessing.Pool(min(num_worker, len(s_matrix_ts))) as pool:
+        results = pool.map(_solveLP, s_matrix_ts)
     else:
-      self.consistent = False
-    #
+      results = [_solveLP(m) for m in s_matrix_ts]
+    self.result = results
+    self.consistent = all([r.status == 0 for r in results])
     return self.consistent
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
@@ -0,0 +1,214 @@
+"""
+Concurrent download of models from URLs.
+
+Downloads share one connection pool, run with bounded concurrency
+in a thread pool, retry transient failures and are cached
+on disk. A cached model is revalidated with its ETag so that
+unchanged models are not transferred again.
+  Usage:
+    downloader = URLDownloader(cache_dir=path)
+    for item in downloader.modelIterator(urls):
+      simple = SimpleSBML()
+      simple.initialize(item.model)
+"""
+
+from SBMLLint.common.simple_sbml import IteratorItem
+
+import collections
+import concurrent.futures
+import hashlib
+import os
+import threading
+import warnings
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.2  # seconds
+DEFAULT_TIMEOUT = 30.0  # seconds
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
+CONTENT_EXTENSION = ".xml"
+ETAG_EXTENSION = ".etag"
+
+# url: str
+# content: str or None if the download failed
+# error: str or None if the download succeeded
+DownloadResult = collections.namedtuple('DownloadResult',
+    'url content error')
+
+_pool_manager = None  # Shared by readURL
+
+
+def getPoolManager():
+  """
+  Provides the connection pool shared by simple_sbml.readURL.
+  :return urllib3.PoolManager:
+  """
+  global _pool_manager
+  if _pool_manager is None:
+    import urllib3
+    _pool_manager = urllib3.PoolManager()
+  return _pool_manager
+
+
+class URLDownloader(object):
+  """Downloads models concurrently with a shared connection pool."""
+
+  def __init__(self, cache_dir=None,
+      max_concurrency=DEFAULT_MAX_CONCURRENCY,
+      retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+      timeout=DEFAULT_TIMEOUT):
+    """
+    :param str cache_dir: directory of cached models; None for no cache
+    :param int max_concurrency: maximum number of concurrent downloads
+    :param int retries: retries for connection errors and RETRY_STATUSES
+    :param float backoff: backoff factor between retries in seconds
+    :param float timeout: timeout of a request in seconds
+    """
+    import urllib3
+    self.cache_dir = cache_dir
+    if self.cache_dir is not None:
+      os.makedirs(self.cache_dir, exist_ok=True)
+    self.max_concurrency = max_concurrency
+    retry = urllib3.Retry(total=retries, backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES, raise_on_status=False)
+    self._http = urllib3.PoolManager(maxsize=max_concurrency,
+        retries=retry, timeout=timeout)
+
+  def _getCachePaths(self, url):
+    """
+    :param str url:
+    :return str, str: paths of the cached content and its ETag
+    """
+    name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    path = os.path.join(self.cache_dir, name)
+    return path + CONTENT_EXTENSION, path + ETAG_EXTENSION
+
+  @staticmethod
+  def _readFile(path):
+    with open(path, "r", encoding="utf-8") as fd:
+      return fd.read()
+
+  @staticmethod
+  def _writeFile(path, stg):
+    # Write to a temporary file so that concurrent readers
+    # never see a partial file
+    tmp_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+    with open(tmp_path, "w", encoding="utf-8") as fd:
+      fd.write(stg)
+    os.replace(tmp_path, path)
+
+  def fetch(self, url):
+    """
+    Downloads a URL, using the cache if the ETag is unchanged.
+    :param str url:
+    :return str: content
+    :raises IOError: the download failed
+    """
+    import urllib3
+    headers = {}
+    content_path, etag_path = None, None
+    if self.cache_dir is not None:
+      content_path, etag_path = self._getCachePaths(url)
+      if os.path.isfile(content_path) and os.path.isfile(etag_path):
+        headers["If-None-Match"] = self._readFile(etag_path)
+    try:
+      # Catch bogus warnings
+      with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        response = self._http.request('GET', url, headers=headers)
+    except urllib3.exceptions.HTTPError as e:
+      raise IOError("Cannot download %s: %s" % (url, str(e)))
+    if response.status == HTTP_NOT_MODIFIED and "If-None-Match" in headers:
+      return self._readFile(content_path)
+    if response.status != HTTP_OK:
+      raise IOError("Cannot download %s: HTTP status %d"
+          % (url, response.status))
+    content = response.data.decode("utf-8")
+    if self.cache_dir is not None:
+      self._writeFile(content_path, content)
+      etag = response.headers.get("ETag")
+      if etag is None:
+        if os.path.isfile(etag_path):
+          os.remove(etag_path)
+      else:
+        self._writeFile(etag_path, etag)
+    return content
+
+  def _iterateCompleted(self, urls):
+    """
+    Downloads the URLs with at most max_concurrency in progress.
+    A download starts as soon as another completes.
+    :param list-str urls:
+    :return int, DownloadResult: position of the URL and its result,
+        in the order in which downloads complete
+    """
+    pending = {}  # key: future, value: position of the URL
+    url_iter = enumerate(urls)
+    def submit(executor):
+      for num, url in url_iter:
+        pending[executor.submit(self.fetch, url)] = num
+        if len(pending) >= self.max_concurrency:
+          return
+    #
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=self.max_concurrency) as executor:
+      submit(executor)
+      while len(pending) > 0:
+        done, _ = concurrent.futures.wait(pending,
+            return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+          num = pending.pop(future)
+          url = urls[num]
+          try:
+            result = DownloadResult(url=url, content=future.result(),
+                error=None)
+          except Exception as e:
+            result = DownloadResult(url=url, content=None,
+                error=str(e))
+          yield num, result
+        submit(executor)
+
+  def fetchAll(self, urls):
+    """
+    Downloads the URLs concurrently.
+    :param list-str urls:
+    :return list-DownloadResult: in the order of urls
+    """
+    urls = list(urls)
+    results = [None]*len(urls)
+    for num, result in self._iterateCompleted(urls):
+      results[num] = result
+    return results
+
+  def iterateDownloads(self, urls):
+    """
+    Downloads the URLs concurrently, providing each result
+    as soon as its download completes.
+    :param list-str urls:
+    :return DownloadResult: in the order in which downloads complete
+    """
+    for _, result in self._iterateCompleted(list(urls)):
+      yield result
+
+  def modelIterator(self, urls):
+    """
+    Iterates across the models at the URLs in the same way as
+    simple_sbml.modelIterator. URLs that cannot be downloaded
+    or parsed are skipped. Models are provided in the order in
+    which their downloads complete.
+    :param list-str urls:
+    :return IteratorItem: filename is the URL; number is the
+        position of the URL
+    """
+    import libsbml
+    for num, result in self._iterateCompleted(list(urls)):
+      if result.error is not None:
+        continue
+      reader = libsbml.SBMLReader()
+      document = reader.readSBMLFromString(result.content)
+      model = document.getModel()
+      if model is None:
+        continue
+      yield IteratorItem(filename=result.url, number=num, model=model)
@@ -4,6 +4,7 @@ from SBMLLint.common import constants as cn
 from SBMLLint.common.tellurium_sandbox import TelluriumSandbox
 
 import os
+import sys
 import zipfile
 
 TYPE_ANTIMONY = "type_antimony"
@@ -22,6 +23,20 @@ def getXML(model_reference):
   :raises IOError: Error encountered reading the SBML document
   :return str SBML xml"
   """
+  model_str = getModelString(model_reference)
+  # Process model_str into a model  
+  if not isXMLString(model_str):
+    # Antimony
+    model_str = getXMLFromAntimony(model_str)
+  return model_str
+
+def getModelString(model_reference):
+  """
+  Reads the model without converting Antimony to SBML.
+  :param str model_reference: file reference, model string
+      or TextIOWrapper
+  :return str: xml or antimony string
+  """
   # Check for a file path
   model_str = ""
   if isinstance(model_reference, str):
@@ -39,12 +54,15 @@ def getXML(model_reference):
     else:
       # Must be a string representation of a model
       model_str = model_reference
-  # Process model_str into a model  
-  if not "<sbml" in model_str:
-    # Antimony
-    model_str = getXMLFromAntimony(model_str)
   return model_str
 
+def isXMLString(model_str):
+  """
+  :param str model_str:
+  :return bool: True if an SBML string; otherwise antimony
+  """
+  return "<sbml" in model_str
+
 def getXMLFromAntimony(antimony_stg):
   """
   Constructs an SBML model from the antimony string.
@@ -138,13 +156,16 @@ def getNextFid(fid, is_print=True):
         yield zip_fid
 
 def runFunction(func, pargs=None, kwargs=None,
-    msg=DEFAULT_MSG):
+    msg=DEFAULT_MSG, output_format=cn.FORMAT_TEXT, model_name=None):
   """
   Runs the function, catching errors, and writing
-  a message.
+  a message. For structured output formats, the message
+  is written as a result with the model and the error.
   :param Function func:
   :param list pargs: postional arguments
   :param dict kwargs: keyword arguments
+  :param str output_format: cn.FORMAT_TEXT, cn.FORMAT_JSON, cn.FORMAT_NDJSON
+  :param str model_name: model reported in a structured error
   """
   if pargs is None:
     pargs = []
@@ -152,10 +173,15 @@ def runFunction(func, pargs=None, kwargs=None,
     kwargs = {}
   try:
     return func(*pargs, **kwargs)
-  except RuntimeError as e:
-    print(msg)
-    print(e)
-  except ValueError as e:
-    print(msg)
-    print(e)
-  
+  except (RuntimeError, ValueError) as e:
+    if output_format == cn.FORMAT_TEXT:
+      print(msg)
+      print(e)
+    else:
+      from SBMLLint.tools import structured_output
+      result = {
+          cn.RESULT_MODEL: model_name,
+          cn.RESULT_ERROR: "%s %s" % (msg, str(e)),
+          }
+      structured_output.writeResult(result, file_out=sys.stdout,
+          output_format=output_format)
@@ -0,0 +1,143 @@
+"""
+Collections of errors with hash indexes. Errors are PathComponents,
+keyed by (node1, node2), or reactions, keyed by their labels.
+"""
+
+from SBMLLint.common import constants as cn
+
+
+############## FUNCTIONS ##################
+def getPathKey(path_component):
+  """
+  :param PathComponents path_component:
+  :return tuple:
+  """
+  return (path_component.node1, path_component.node2)
+
+def getLabelKey(reaction):
+  """
+  :param Reaction/SOMReaction reaction:
+  :return str:
+  """
+  return reaction.label
+
+
+############## CLASSES ##################
+class ErrorCollector(list):
+  """
+  List of errors with a hash index on a key of each error, so that
+  membership tests and merges are O(1). Errors keep the order in
+  which their keys were first added. append, extend, add and
+  addPathComponent update the index; other list mutations
+  rebuild it.
+  """
+
+  def __init__(self, func_key=getLabelKey, errors=None):
+    """
+    :param Function func_key: element -> hashable key
+    :param list errors: initial errors
+    """
+    super(ErrorCollector, self).__init__()
+    self._func_key = func_key
+    self._positions = {}  # key: error key, value: index in the list
+    if errors is not None:
+      self.extend(errors)
+
+  def _reindex(self):
+    """
+    Rebuilds the index after a list mutation.
+    """
+    self._positions = {}
+    for position, error in enumerate(self):
+      self._positions.setdefault(self._func_key(error), position)
+
+  def __contains__(self, error):
+    return self._func_key(error) in self._positions
+
+  def __setitem__(self, index, value):
+    super(ErrorCollector, self).__setitem__(index, value)
+    self._reindex()
+
+  def __delitem__(self, index):
+    super(ErrorCollector, self).__delitem__(index)
+    self._reindex()
+
+  def __iadd__(self, errors):
+    self.extend(errors)
+    return self
+
+  def __imul__(self, num):
+    super(ErrorCollector, self).__imul__(num)
+    self._reindex()
+    return self
+
+  def append(self, error):
+    self._positions.setdefault(self._func_key(error), len(self))
+    super(ErrorCollector, self).append(error)
+
+  def extend(self, errors):
+    for error in errors:
+      self.append(error)
+
+  def insert(self, index, error):
+    super(ErrorCollector, self).insert(index, error)
+    self._reindex()
+
+  def remove(self, error):
+    super(ErrorCollector, self).remove(error)
+    self._reindex()
+
+  def pop(self, index=-1):
+    error = super(ErrorCollector, self).pop(index)
+    self._reindex()
+    return error
+
+  def clear(self):
+    super(ErrorCollector, self).clear()
+    self._positions = {}
+
+  def sort(self, *args, **kwargs):
+    super(ErrorCollector, self).sort(*args, **kwargs)
+    self._reindex()
+
+  def reverse(self):
+    super(ErrorCollector, self).reverse()
+    self._reindex()
+
+  def get(self, key):
+    """
+    :param object key:
+    :return object/None: first error with the key
+    """
+    position = self._positions.get(key)
+    if position is None:
+      return None
+    return self[position]
+
+  def add(self, error):
+    """
+    Appends the error if there is no error with its key.
+    :param object error:
+    :return bool: True if appended
+    """
+    if error in self:
+      return False
+    self.append(error)
+    return True
+
+  def addPathComponent(self, node1, node2, reaction_label):
+    """
+    Adds the reaction to the PathComponents for the nodes,
+    creating the PathComponents if needed.
+    :param object node1:
+    :param object node2:
+    :param str reaction_label:
+    :return bool: True
+    """
+    component = self.get((node1, node2))
+    if component is None:
+      self.append(cn.PathComponents(node1=node1, node2=node2,
+          reactions=[reaction_label]))
+    else:
+      component.reactions.append(reaction_label)
+    return True
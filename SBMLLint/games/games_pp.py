@@ -4,6 +4,7 @@ from SBMLLint.common import constants as cn
 from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
 from SBMLLint.common.reaction import Reaction
 from SBMLLint.common import util
+from SBMLLint.games.error_collector import ErrorCollector, getPathKey
 from SBMLLint.games.som import SOM
 from SBMLLint.common.simple_sbml import SimpleSBML
 
@@ -12,18 +13,29 @@ import itertools
 import networkx as nx
 import numpy as np
 import pandas as pd
-from scipy.linalg import lu, inv
 
 GAMESErrors = collections.namedtuple("GAMESErrors", 
     "type_one")
 ErrorSummary = collections.namedtuple("ErrorSummary",
     "type errors")
+# Stoichiometry matrix in low-memory mode;
+# matrix is a scipy.sparse.csc_matrix labeled by index and columns
+SparseMatrix = collections.namedtuple("SparseMatrix",
+    "matrix index columns")
 TOLERANCE = 0.0001
 TYPE_I = "type1"
 TYPE_II = "type2"
 TYPE_III = "type3"
 CANCELING = "canceling"
 ECHELON = "echelon"
+# Order of the error types in error_summary
+ERROR_TYPES = [TYPE_I, TYPE_II, TYPE_III, CANCELING, ECHELON]
+# Dense float matrices held during the LU and RREF steps,
+# as multiples of (species x reactions) and (reactions x reactions)
+NUM_DENSE_SPECIES_REACTION = 4
+NUM_DENSE_REACTION_REACTION = 4
+BYTES_PER_VALUE = 8
+MEGABYTE = 2**20
 
 class SOMStoichiometry(object):
 
@@ -45,12 +57,20 @@ class SOMStoichiometry(object):
 
 class SOMReaction(object):
 
-  def __init__(self, reactants, products, label):
+  def __init__(self, reactants, products, label, category=None):
+    """
+    :param list-SOMStoichiometry reactants:
+    :param list-SOMStoichiometry products:
+    :param str label:
+    :param str category: category if already known
+    """
     self.reactants = reactants
     self.products = products
     self.label = label
     self.identifier = self.makeId()
-    self.category = self.getCategory()
+    if category is None:
+      category = self.getCategory()
+    self.category = category
 
   def __repr__(self):
     return self.makeId()
@@ -147,12 +167,12 @@ class GAMES_PP(nx.DiGraph):
     self.molecules = self._getNonBoundaryMolecules(simple, self.reactions)
     self.som_stoichiometry_matrix = None
     # reactions before LU decomposition
-    self.reactions_lu = []
+    self.reactions_lu = ErrorCollector()
     # SOMReactinos before LU decomposition
     self.som_reactions_lu = []
-    # SOMReactions after LU decomposition
+    # SOMReactions after LU decomposition (only processed categories)
     self.reduced_som_reactions = []
-    # RREF SOMReactions after LU -> RREF
+    # RREF SOMReactions after LU -> RREF (only processed categories)
     self.rref_som_reactions = []
     # L matrix from LU decomposition
     self.lower = None
@@ -168,6 +188,21 @@ class GAMES_PP(nx.DiGraph):
     self.rref_operation = None
     # RREF matrix
     self.rref_df = None
+    # Low-memory mode uses only sparse matrices (see analyze)
+    self.is_low_memory = False
+    # L matrix as scipy.sparse.csr_matrix
+    self.sparse_lower = None
+    self._sparse_lower_transpose = None
+    # reaction labels of the rows of L and of the operations
+    self.factor_labels = None
+    # RREF operation matrix as scipy.sparse.csr_matrix
+    self.sparse_rref_operation = None
+    # U matrix (reactions x SOMs) during the analysis
+    self._echelon_rows = None
+    # rref_df (or echelon_df without RREF) as scipy.sparse.csc_matrix
+    self.sparse_reduced = None
+    self.reduced_index = None
+    self.reduced_columns = None
     # Components for SOMGraph
     super(GAMES_PP, self).__init__()
     self.soms = self.initializeSOMs(self.molecules)
@@ -180,7 +215,7 @@ class GAMES_PP(nx.DiGraph):
     # If not error was detected from U, the error is from RREF
     self.echelon_errors = []
     # Can't add arc
-    self.type_one_errors = []
+    self.type_one_errors = ErrorCollector(func_key=getPathKey)
     # Mass balance error from net stoichiometry 
     self.canceling_errors = []
     # SOM cycle ({A} -> {B} -> ... -> {A})
@@ -327,6 +362,7 @@ class GAMES_PP(nx.DiGraph):
     :param pandas.DataFrame mat_df:
     :return pandas.DataFrame echelon_df:
     """
+    from scipy.linalg import lu, inv
     mat_t = mat_df.T
     idx_mat_t = mat_t.index
     cols_mat_t = mat_t.columns
@@ -341,9 +377,9 @@ class GAMES_PP(nx.DiGraph):
     # round up U matrix
     # upper = np.round(upper_raw, 6)
     perm_inverse = perm.T
-    permuted_m = (perm_inverse).dot(mat_t)
     pivot_index = [list(k).index(1) for k in perm_inverse]
     new_idx_mat_t = [idx_mat_t[idx] for idx in pivot_index]
+    permuted_m = (perm_inverse).dot(mat_t)
     # we save as; lower_inverse * perm_df = echelon_df
     # if we added zero columns previously, delete them. 
     if diff:
@@ -408,33 +444,337 @@ class GAMES_PP(nx.DiGraph):
     self.rref_df = rref_df
     return rref_df
 
-  def convertMatrixToSOMReactions(self, mat_df):
+  @staticmethod
+  def estimateMemory(num_species, num_reactions):
+    """
+    Estimates the memory used by the dense matrices of the
+    LU decomposition and RREF, which low-memory mode avoids.
+    :param int num_species:
+    :param int num_reactions:
+    :return int: bytes
+    """
+    num_values = NUM_DENSE_SPECIES_REACTION*num_species*num_reactions  \
+        + NUM_DENSE_REACTION_REACTION*num_reactions*num_reactions
+    return BYTES_PER_VALUE*num_values
+
+  def getSparseStoichiometryMatrix(self, reactions, soms):
+    """
+    Creates the SOM stoichiometry matrix of getStoichiometryMatrix
+    without a dense matrix. Used in low-memory mode.
+    :param list-SOMReaction reactions:
+    :param list-SOM soms:
+    :return SparseMatrix: matrix is a scipy.sparse.csc_matrix
+    """
+    from scipy import sparse
+    som_idxs = {som.identifier: idx for idx, som in enumerate(soms)}
+    row_idxs = []
+    column_idxs = []
+    values = []
+    for column_idx, reaction in enumerate(reactions):
+      reactants = {r.som.identifier:r.stoichiometry for r in reaction.reactants}
+      products = {p.som.identifier:p.stoichiometry for p in reaction.products}
+      for identifier in set(reactants.keys()).union(products.keys()):
+        net_stoichiometry = products.get(identifier, 0.0) - reactants.get(identifier, 0.0)
+        if net_stoichiometry != 0:
+          row_idxs.append(som_idxs[identifier])
+          column_idxs.append(column_idx)
+          values.append(net_stoichiometry)
+    matrix = sparse.csc_matrix((values, (row_idxs, column_idxs)),
+        shape=(len(soms), len(reactions)))
+    matrix.sort_indices()
+    return SparseMatrix(matrix=matrix,
+                        index=[som.identifier for som in soms],
+                        columns=[r.label for r in reactions])
+
+  def decomposeSparseMatrix(self, mat):
+    """
+    LU decomposition of the stoichiometry matrix in low-memory
+    mode. Gaussian elimination with partial pivoting, as in
+    decomposeMatrix, is done on the sparse transposed matrix,
+    and L is kept as a sparse factor; L^-1 is not computed.
+    (scipy.sparse.linalg.splu does not factor singular matrices.)
+    :param SparseMatrix mat: SOMs x reactions
+    :return SparseMatrix echelon: SOMs x reactions (factor_labels)
+    """
+    from scipy import sparse
+    num_reactions = len(mat.columns)
+    rows = mat.matrix.T.tocsr()
+    # row at each position and position of each row
+    order = np.arange(num_reactions)
+    positions = np.arange(num_reactions)
+    # multipliers of L by (original) row and column
+    lower_rows = []
+    lower_columns = []
+    lower_values = []
+    for step in range(min(num_reactions, len(mat.index))):
+      column = rows.getcol(step).tocoo()
+      is_candidate = (column.data != 0) & (positions[column.row] >= step)
+      row_idxs = column.row[is_candidate]
+      values = column.data[is_candidate]
+      if len(row_idxs) == 0:
+        continue
+      # largest value, first position on ties (as LAPACK)
+      pivot_idx = np.lexsort((positions[row_idxs], -np.abs(values)))[0]
+      pivot = row_idxs[pivot_idx]
+      pivot_position = positions[pivot]
+      other = order[step]
+      order[step], order[pivot_position] = pivot, other
+      positions[pivot], positions[other] = step, pivot_position
+      factors = values*(1.0/values[pivot_idx])
+      is_other = np.arange(len(row_idxs)) != pivot_idx
+      if not is_other.any():
+        continue
+      row_idxs = row_idxs[is_other]
+      factors = factors[is_other]
+      lower_rows.extend(row_idxs)
+      lower_columns.extend([step]*len(row_idxs))
+      lower_values.extend(factors)
+      pivot_row = rows.getrow(pivot).tocoo()
+      is_rest = pivot_row.col != step
+      # the values in the pivot column are removed exactly
+      update = sparse.csr_matrix((
+          np.concatenate([values[is_other],
+              np.outer(factors, pivot_row.data[is_rest]).ravel()]),
+          (np.concatenate([row_idxs,
+              np.repeat(row_idxs, is_rest.sum())]),
+          np.concatenate([np.repeat(step, len(row_idxs)),
+              np.tile(pivot_row.col[is_rest], len(row_idxs))]))),
+          shape=rows.shape)
+      rows = rows - update
+    self.factor_labels = [mat.columns[idx] for idx in order]
+    self.sparse_lower = sparse.identity(num_reactions, format="csr")  \
+        + sparse.csr_matrix((lower_values,
+        (positions[np.array(lower_rows, dtype=int)], lower_columns)),
+        shape=(num_reactions, num_reactions))
+    self._sparse_lower_transpose = None
+    self._echelon_rows = rows[order]
+    echelon = self._echelon_rows.T.tocsc()
+    echelon.sort_indices()
+    return SparseMatrix(matrix=echelon,
+                        index=list(mat.index),
+                        columns=self.factor_labels)
+
+  def getSparseRREFMatrix(self, echelon):
+    """
+    Get RREF of the stoichiometry matrix in low-memory mode,
+    using the same operations as getRREFMatrix on the sparse
+    rows from decomposeSparseMatrix.
+    :param SparseMatrix echelon:
+    :return SparseMatrix rref:
+    """
+    from scipy import sparse
+    echelon_rows = self._echelon_rows
+    echelon_rows.sort_indices()
+    rows = echelon_rows.copy()
+    # entries of rref_operation by row and column
+    operation_rows = []
+    operation_columns = []
+    operation_values = []
+    for idx in range(1, echelon_rows.shape[0]):
+      echelon_row = echelon_rows.getrow(idx)
+      nonzero_idx = echelon_row.indices[echelon_row.data != 0]
+      # Skip as getRREFMatrix, i.e., also if the only
+      # nonzero value is for the first SOM
+      if (len(nonzero_idx) == 0) or (nonzero_idx.max() == 0):
+        continue
+      nonzero_species = nonzero_idx.min()
+      nonzero_value = echelon_row[0, nonzero_species]
+      column = rows.getcol(nonzero_species).tocoo()
+      is_reduced = (column.row < idx) & (np.round(column.data, 3) != 0.0)
+      if not is_reduced.any():
+        continue
+      prev_idxs = column.row[is_reduced]
+      factors = (-1.0) * column.data[is_reduced] / nonzero_value
+      operation_rows.extend(prev_idxs)
+      operation_columns.extend([idx]*len(prev_idxs))
+      operation_values.extend(factors)
+      rows = rows + sparse.csr_matrix((
+          np.outer(factors, echelon_row.data).ravel(),
+          (np.repeat(prev_idxs, len(echelon_row.indices)),
+          np.tile(echelon_row.indices, len(prev_idxs)))),
+          shape=rows.shape)
+    num_reactions = echelon_rows.shape[0]
+    self.sparse_rref_operation = sparse.identity(num_reactions, format="csr")  \
+        + sparse.csr_matrix((operation_values,
+        (operation_rows, operation_columns)),
+        shape=(num_reactions, num_reactions))
+    # rounded as rref_df
+    rows.data = np.round(rows.data, 3)
+    rows.eliminate_zeros()
+    rref = rows.T.tocsc()
+    rref.sort_indices()
+    return SparseMatrix(matrix=rref,
+                        index=list(echelon.index),
+                        columns=list(echelon.columns))
+
+  def setSparseFactors(self, reduced, is_keep_factors=True):
+    """
+    Keeps the sparse factors that are needed to explain errors
+    in low-memory mode, and discards the other intermediates.
+    :param SparseMatrix reduced: RREF (or echelon) matrix
+    :param bool is_keep_factors: keep the factors used for explanations
+    """
+    if is_keep_factors and (reduced is not None):
+      self.sparse_reduced = reduced.matrix
+      self.reduced_index = list(reduced.index)
+      self.reduced_columns = list(reduced.columns)
+    else:
+      self.sparse_lower = None
+      self._sparse_lower_transpose = None
+      self.sparse_rref_operation = None
+      self.factor_labels = None
+    self._echelon_rows = None
+
+  def getLowerInverseRow(self, reaction_label):
+    """
+    Computes a row of L^-1 from the sparse L factor,
+    rounded as lower_inverse.
+    :param str reaction_label:
+    :return pandas.Series:
+    """
+    from scipy.sparse.linalg import spsolve_triangular
+    if self._sparse_lower_transpose is None:
+      self._sparse_lower_transpose = self.sparse_lower.T.tocsr()
+    unit = np.zeros(len(self.factor_labels))
+    unit[self.factor_labels.index(reaction_label)] = 1.0
+    # row of L^-1 is x where L^T x = unit
+    row = spsolve_triangular(self._sparse_lower_transpose, unit, lower=False)
+    return pd.Series(np.round(row, 3), index=self.factor_labels,
+        name=reaction_label)
+
+  def getOperationSeries(self, reaction_label):
+    """
+    Computes the operation of a reaction in low-memory mode,
+    i.e., the row of rref_operation.dot(lower_inverse)
+    (or of lower_inverse without RREF).
+    :param str reaction_label:
+    :return pandas.Series/None: None if there was no decomposition
+    """
+    if self.sparse_lower is None:
+      return None
+    if self.sparse_rref_operation is None:
+      return self.getLowerInverseRow(reaction_label)
+    operation_row = self.sparse_rref_operation.getrow(
+        self.factor_labels.index(reaction_label))
+    result = pd.Series(0.0, index=self.factor_labels)
+    for idx, value in zip(operation_row.indices, operation_row.data):
+      result = result + value*self.getLowerInverseRow(
+          self.factor_labels[idx])
+    result.name = reaction_label
+    return result
+
+  def getReducedSeries(self, reaction_label):
+    """
+    Provides a column of the reduced (RREF or echelon) matrix
+    in low-memory mode.
+    :param str reaction_label:
+    :return pandas.Series:
+    """
+    column = self.sparse_reduced.getcol(
+        self.reduced_columns.index(reaction_label))
+    return pd.Series(column.toarray().flatten(), index=self.reduced_index,
+        name=reaction_label)
+
+  def getMatrixCategories(self, mat_df):
+    """
+    Categorizes all columns (SOMReactions) of a stoichiometry
+    matrix in one pass, using the same rules as
+    SOMReaction.getCategory (cn.REACTION_SUMMARY_CATEGORIES).
+    Stoichiometries are rounded as in convertMatrixToSOMReactions.
+    :param pandas.DataFrame/SparseMatrix mat_df:
+    :return pandas.Series: category indexed by reaction label
+    """
+    num_columns = len(mat_df.columns)
+    if isinstance(mat_df, SparseMatrix):
+      values = mat_df.matrix.data
+      column_idxs = np.repeat(np.arange(num_columns),
+                              np.diff(mat_df.matrix.indptr))
+    else:
+      dense_values = mat_df.to_numpy(dtype=float)
+      row_idxs, column_idxs = np.nonzero(dense_values)
+      values = dense_values[row_idxs, column_idxs]
+    is_reactant = values < TOLERANCE*(-1)
+    is_product = values > TOLERANCE
+    stoichiometry = np.round(np.abs(values), 3)
+    num_reactants = np.bincount(column_idxs[is_reactant], minlength=num_columns)
+    num_products = np.bincount(column_idxs[is_product], minlength=num_columns)
+    max_reactant = np.zeros(num_columns)
+    np.maximum.at(max_reactant, column_idxs[is_reactant], stoichiometry[is_reactant])
+    max_product = np.zeros(num_columns)
+    np.maximum.at(max_product, column_idxs[is_product], stoichiometry[is_product])
+    min_reactant = np.full(num_columns, np.inf)
+    np.minimum.at(min_reactant, column_idxs[is_reactant], stoichiometry[is_reactant])
+    min_product = np.full(num_columns, np.inf)
+    np.minimum.at(min_product, column_idxs[is_product], stoichiometry[is_product])
+    # the first satisfied condition decides the category
+    conditions = [
+        (num_reactants==0) & (num_products==0),
+        (num_reactants==0) != (num_products==0),
+        (num_reactants==1) & (num_products==1) & (max_reactant==max_product),
+        (num_reactants==1) & (min_product>=max_reactant),
+        (num_products==1) & (min_reactant>=max_product),
+        ]
+    categories = [
+        cn.REACTION_REDUNDANT,
+        cn.REACTION_ERROR,
+        cn.REACTION_1_1,
+        cn.REACTION_1_n,
+        cn.REACTION_n_1,
+        ]
+    matrix_categories = np.select(conditions, categories,
+                                  default=cn.REACTION_n_n)
+    return pd.Series(matrix_categories, index=mat_df.columns, dtype=object)
+
+  def convertMatrixToSOMReactions(self, mat_df, categories=None):
     """
     Convert a stoichiometry matrix to SOMReactions,
     where columns are SOMReactions and 
     rows are SOMs (species).
-    :param pandas.DataFrame mat_df:
+    If categories is given, only the columns of
+    those categories are converted, so that
+    SOMReactions are created only when they are used.
+    :param pandas.DataFrame/SparseMatrix mat_df:
+    :param list-str categories:
     :return list-SOMReaction reactions:
     """
+    matrix_categories = self.getMatrixCategories(mat_df)
+    if categories is None:
+      column_idxs = range(len(mat_df.columns))
+    else:
+      column_idxs = np.flatnonzero(matrix_categories.isin(list(categories)))
+    if isinstance(mat_df, SparseMatrix):
+      csc = mat_df.matrix
+      def getColumn(column_idx):
+        start, end = csc.indptr[column_idx], csc.indptr[column_idx+1]
+        return csc.indices[start:end], csc.data[start:end]
+    else:
+      values = mat_df.to_numpy(dtype=float)
+      def getColumn(column_idx):
+        column = values[:, column_idx]
+        row_idxs = np.flatnonzero(column)
+        return row_idxs, column[row_idxs]
+    som_dic = {som.identifier: som for som in self.nodes}
+    row_soms = [som_dic.get(som_label, False) for som_label in mat_df.index]
     reactions = []
-    for reaction_name in mat_df.columns:
-      reaction_elements = mat_df[reaction_name]
-      reactants = [SOMStoichiometry(
-          self.getNode(som_label),
-          np.round(abs(reaction_elements[som_label]), 3)
-          ) \
-          for som_label in reaction_elements.index \
-          if reaction_elements[som_label]<TOLERANCE*(-1)]
-      products = [SOMStoichiometry(
-          self.getNode(som_label),
-          np.round(abs(reaction_elements[som_label]), 3)
-          ) \
-          for som_label in reaction_elements.index \
-          if reaction_elements[som_label]>TOLERANCE]
+    for column_idx in column_idxs:
+      row_idxs, column = getColumn(column_idx)
+      is_nonzero = np.abs(column) > TOLERANCE
+      row_idxs = row_idxs[is_nonzero]
+      column = column[is_nonzero]
+      stoichiometrys = np.round(np.abs(column), 3)
+      reactants = []
+      products = []
+      for row_idx, value, stoichiometry in zip(row_idxs, column, stoichiometrys):
+        som_stoichiometry = SOMStoichiometry(row_soms[row_idx], stoichiometry)
+        if value < 0:
+          reactants.append(som_stoichiometry)
+        else:
+          products.append(som_stoichiometry)
       reactions.append(SOMReaction(
           reactants=reactants,
           products=products,
-          label=reaction_name
+          label=mat_df.columns[column_idx],
+          category=matrix_categories.iloc[column_idx]
           ))
     return reactions
   
@@ -470,12 +810,14 @@ class GAMES_PP(nx.DiGraph):
     for som in [som1, som2]:
       for edge in list(self.in_edges(som)):
         remaining_som = edge[0]
-        reaction_label = self.get_edge_data(edge[0], edge[1])[cn.REACTION]
-        self.add_edge(remaining_som, new_som, reaction=reaction_label)  
+        edge_data = self.get_edge_data(edge[0], edge[1])
+        self.add_edge(remaining_som, new_som, reaction=edge_data[cn.REACTION],
+            provenance=edge_data.get(cn.PROVENANCE, []))
       for edge in list(self.out_edges(som)):
         remaining_som = edge[1]
-        reaction_label = self.get_edge_data(edge[0], edge[1])[cn.REACTION]
-        self.add_edge(new_som, remaining_som, reaction=reaction_label) 
+        edge_data = self.get_edge_data(edge[0], edge[1])
+        self.add_edge(new_som, remaining_som, reaction=edge_data[cn.REACTION],
+            provenance=edge_data.get(cn.PROVENANCE, []))
     self.remove_nodes_from([som1, som2])
     if not self.has_node(new_som):
       self.add_node(new_som)
@@ -486,8 +828,7 @@ class GAMES_PP(nx.DiGraph):
     Add a reaction to self.reactions_lu
     :param reaction Reaction:
     """
-    if reaction not in self.reactions_lu:
-      self.reactions_lu.append(reaction)  
+    self.reactions_lu.add(reaction)
   
   def processUniUniReaction(self, reaction):
     """
@@ -507,23 +848,35 @@ class GAMES_PP(nx.DiGraph):
         self.identifier = self.makeId()
         return new_som
   
-  def addArc(self, arc_source, arc_destination, reaction):
+  def addArc(self, arc_source, arc_destination, reaction, arc=None):
     """
     Add a single arc (edge) using two SOMs and reaction/somreaction.
+    The molecules that created the arc are recorded as its
+    provenance (cn.ArcProvenance) to explain type II errors.
     :param SOM arc_source:
     :param SOM arc_destination:
     :param Reaction/SOMReaction reaction:
+    :param tuple-Molecule arc: source and destination molecules
     """
     # if there is already a preious reaction,
     if self.has_edge(arc_source, arc_destination):
-      reaction_label = self.get_edge_data(arc_source, arc_destination)[cn.REACTION]
+      edge_data = self.get_edge_data(arc_source, arc_destination)
+      reaction_label = edge_data[cn.REACTION]
+      provenance = edge_data.get(cn.PROVENANCE, [])
       # if reaction.label is not already included in the attribute,
       if reaction.label not in set(reaction_label):
         reaction_label = reaction_label + [reaction.label]
     else:
       reaction_label = [reaction.label]
+      provenance = []
+    if arc is not None:
+      record = cn.ArcProvenance(reaction=reaction.label,
+          source=arc[0].name, destination=arc[1].name)
+      if record not in provenance:
+        provenance = provenance + [record]
     # overwrite the edge with new reactions set
-    self.add_edge(arc_source, arc_destination, reaction=reaction_label)
+    self.add_edge(arc_source, arc_destination, reaction=reaction_label,
+        provenance=provenance)
   
   def processUniMultiReaction(self, reaction):
     """
@@ -544,7 +897,7 @@ class GAMES_PP(nx.DiGraph):
         if not self.checkTypeOneError(arc, reaction):
           som_source = self.getNode(arc[0])
           som_destination = self.getNode(arc[1])
-          self.addArc(som_source, som_destination, reaction)
+          self.addArc(som_source, som_destination, reaction, arc=arc)
         else:
           error_count += 1
       # the reaction has not added any errors, will be used for lu
@@ -571,7 +924,7 @@ class GAMES_PP(nx.DiGraph):
         if not self.checkTypeOneError(arc, reaction):
           som_source = self.getNode(arc[0])
           som_destination = self.getNode(arc[1])
-          self.addArc(som_source, som_destination, reaction)
+          self.addArc(som_source, som_destination, reaction, arc=arc)
         else:
           error_count += 1
       # the reaction has not added any errors, will be used for lu
@@ -631,22 +984,8 @@ class GAMES_PP(nx.DiGraph):
     :param Reaction reaction:
     :return bool flag:
     """
-    flag = False
-    for component in self.type_one_errors:
-      if (component.node1==mole1.name) and (component.node2==mole2.name):
-        new_component = cn.PathComponents(node1=mole1.name, 
-                                          node2=mole2.name,
-                                          reactions=component.reactions+[reaction.label])
-        self.type_one_errors.remove(component)
-        self.type_one_errors.append(new_component)
-        flag = True
-        break
-    if not flag:
-      self.type_one_errors.append(cn.PathComponents(node1=mole1.name, 
-                                                    node2=mole2.name,
-                                                    reactions=[reaction.label]))
-      flag = True
-    return flag
+    return self.type_one_errors.addPathComponent(mole1.name, mole2.name,
+        reaction.label)
   
   def checkTypeOneError(self, arc, inequality_reaction):
     """
@@ -666,55 +1005,33 @@ class GAMES_PP(nx.DiGraph):
     else:
       return False
   
-  def addTypeTwoError(self, cycle):
+  def getArcExplanation(self, som1, som2):
     """
-    Add Type II Error components to self.type_two_errors
-    which is a list of lists
-    All components of resulting PathComponents are str
-    :param list-SOM cycle:
+    Finds the molecules and reactions that created the arc
+    from som1 to som2, using the provenance of the arc.
+    :param SOM som1:
+    :param SOM som2:
+    :return PathComponents: node1, node2 and reactions are lists
+        whose elements match by index
     """
-    # exceptionally, here PathComponents are
-    # node1=[], node2=[], reactions=[] and their index
-    # of each component will match. All elements within nodes
-    # are in the same SOM
-    error_cycle = []
-    for node_idx in range(len(cycle)-1):
-      som1 = cycle[node_idx]
-      som2 = cycle[node_idx+1]
-      som1_moles = {mole.name for mole in list(som1.molecules)}
-      som2_moles = {mole.name for mole in list(som2.molecules)}
-      reactions = self.get_edge_data(som1, som2)[cn.REACTION]
-      # all reactions (in an edge), should create a single PathComponent
-      nodes1 = []
-      nodes2 = []
-      reaction_labels = []
-      for r in reactions:
-        reaction = self.simple.getReaction(r)
-        if reaction.category == cn.REACTION_n_1:
-          sources = {r.molecule.name for r in reaction.reactants}
-          destinations = {p.molecule.name for p in reaction.products}
-        elif reaction.category == cn.REACTION_1_n:
-          sources = {p.molecule.name for p in reaction.products}
-          destinations = {r.molecule.name for r in reaction.reactants}
-        # for any reaction that addes arcs, len(nodes2)==1
-        node2 = list(destinations.intersection(som2_moles))[0]
-        for node1 in list(sources.intersection(som1_moles)):
-          nodes1.append(node1)
-          nodes2.append(node2)
-          reaction_labels.append(reaction.label)
-      error_cycle.append(cn.PathComponents(node1=nodes1, 
-                                           node2=nodes2,
-                                           reactions=reaction_labels))
-    som1 = cycle[-1]
-    som2 = cycle[0]
-    som1_moles = {mole.name for mole in list(som1.molecules)}
-    som2_moles = {mole.name for mole in list(som2.molecules)}
-    reactions = self.get_edge_data(som1, som2)[cn.REACTION]
+    edge_data = self.get_edge_data(som1, som2)
+    records = collections.OrderedDict()  # key: reaction label
+    for record in edge_data.get(cn.PROVENANCE, []):
+      records.setdefault(record.reaction, []).append(record)
     # all reactions (in an edge), should create a single PathComponent
     nodes1 = []
     nodes2 = []
     reaction_labels = []
-    for r in reactions:
+    for r in edge_data[cn.REACTION]:
+      if r in records:
+        for record in records[r]:
+          nodes1.append(record.source)
+          nodes2.append(record.destination)
+          reaction_labels.append(r)
+        continue
+      # Arcs added with SOMs have no provenance
+      som1_moles = {mole.name for mole in list(som1.molecules)}
+      som2_moles = {mole.name for mole in list(som2.molecules)}
       reaction = self.simple.getReaction(r)
       if reaction.category == cn.REACTION_n_1:
         sources = {r.molecule.name for r in reaction.reactants}
@@ -722,34 +1039,54 @@ class GAMES_PP(nx.DiGraph):
       elif reaction.category == cn.REACTION_1_n:
         sources = {p.molecule.name for p in reaction.products}
         destinations = {r.molecule.name for r in reaction.reactants}
-        # for any reaction that addes arcs, len(nodes2)==1
+      # for any reaction that addes arcs, len(nodes2)==1
       node2 = list(destinations.intersection(som2_moles))[0]
       for node1 in list(sources.intersection(som1_moles)):
         nodes1.append(node1)
         nodes2.append(node2)
         reaction_labels.append(reaction.label)
-    error_cycle.append(cn.PathComponents(node1=nodes1, 
-                                        node2=nodes2,
-                                        reactions=reaction_labels))
-    self.type_two_errors.append(error_cycle)  
+    return cn.PathComponents(node1=nodes1, node2=nodes2,
+        reactions=reaction_labels)
+
+  def addTypeTwoError(self, cycle):
+    """
+    Add Type II Error components to self.type_two_errors
+    which is a list of lists
+    All components of resulting PathComponents are str
+    :param list-SOM cycle:
+    """
+    # exceptionally, here PathComponents are
+    # node1=[], node2=[], reactions=[] and their index
+    # of each component will match. All elements within nodes
+    # are in the same SOM
+    error_cycle = [self.getArcExplanation(som1, som2)
+        for som1, som2 in zip(cycle, cycle[1:] + cycle[:1])]
+    self.type_two_errors.append(error_cycle)
   
-  def checkTypeTwoError(self):
+  def checkTypeTwoError(self, fail_fast=False):
     """
     Check Type II Error (cycles) of a MESGraph.
     If there is at least one cycle, 
     report an error message, related reactions
     and return True.
     If there is no cycle, return False. 
+    :param bool fail_fast: find only one cycle
     :return bool:
     """
     graph = nx.DiGraph()
     graph.add_edges_from(self.edges)
-    cycles = list(nx.simple_cycles(graph))
+    if fail_fast:
+      try:
+        cycles = [[edge[0] for edge in nx.find_cycle(graph)]]
+      except nx.NetworkXNoCycle:
+        cycles = []
+    else:
+      cycles = list(nx.simple_cycles(graph))
     if len(cycles) == 0:
       return False
     else:
       for cycle in cycles:
-        self.type_two_errors.append(cycle)
+        self.addTypeTwoError(cycle)
       return True
   
   def processErrorReaction(self, reaction):
@@ -765,16 +1102,50 @@ class GAMES_PP(nx.DiGraph):
     ## help us track the operations that lead to this error 
     return True
   
-  def analyze(self, reactions=None, simple_games=False, rref=True, error_details=False, suppress_message=False):
+  def hasErrors(self):
+    """
+    Checks if any error has been found.
+    :return bool:
+    """
+    return bool(self.type_one_errors or self.type_two_errors
+        or self.type_three_errors or self.canceling_errors
+        or self.echelon_errors)
+
+  def processReactionGroups(self, reaction_dic, reaction_groups,
+      fail_fast=False):
+    """
+    Processes reactions in the order of the categories of reaction_dic.
+    :param dict reaction_dic: key: category, value: function
+    :param dict reaction_groups: key: category, value: list-reactions
+    :param bool fail_fast: stop at the first error
+    """
+    for category in reaction_dic.keys():
+      func = reaction_dic[category]
+      for reaction in reaction_groups[category]:
+        func(reaction)
+        if fail_fast and self.hasErrors():
+          return
+
+  def analyze(self, reactions=None, simple_games=False, rref=True, error_details=False, suppress_message=False,
+      low_memory=None, memory_limit=None, fail_fast=False):
     """
     Using the stoichiometry matrix, compute
     row reduced echelon form and create SOMGraph
     Add arcs or sending error messages using
     checkTypeOneError or checkTypeTwoError.
+    In low-memory mode, no dense matrix is created; the sparse
+    factors are kept only if echelon or type III errors need
+    explanations (getOperationSeries, getReducedSeries).
     :param list-Reaction reactions:
     :param bool rref:
     :param bool error_details:
     :param bool suppress_message:
+    :param bool low_memory: use low-memory mode; if None,
+        it is used when the dense matrices exceed memory_limit
+    :param float memory_limit: megabytes; None for no limit
+    :param bool fail_fast: stop at the first error, so that
+        only that error is kept (at most one cycle and one
+        canceling error are found)
     :return bool:
     """
     multimulti_error_found = False
@@ -790,12 +1161,13 @@ class GAMES_PP(nx.DiGraph):
         cn.REACTION_n_n: self.addReaction,
         }
     # Process each type of reaction - Type I error will be detected here
-    for category in reaction_dic.keys():
-      for reaction in [r for r in reactions if r.category == category]:
-        func = reaction_dic[category]
-        func(reaction)
+    reaction_groups = Reaction.groupByCategory(reactions,
+        categories=reaction_dic.keys())
+    self.processReactionGroups(reaction_dic, reaction_groups,
+        fail_fast=fail_fast)
     # detect type II error
-    self.checkTypeTwoError()
+    if not (fail_fast and self.hasErrors()):
+      self.checkTypeTwoError(fail_fast=fail_fast)
     #########################
     # if we find type I or II errors, we make it a simple_game
     if self.type_one_errors or self.type_two_errors:
@@ -810,40 +1182,65 @@ class GAMES_PP(nx.DiGraph):
               self.convertReactionToSOMReaction(reaction)
               )
         # Now, step 1: creates SOMStoichiometryMatrix
-        self.som_stoichiometry_matrix = self.getStoichiometryMatrix(self.som_reactions_lu, list(self.nodes), som=True)
-        # step 2: reconvert it into SOMReactions and examine 'canceling errors'
-        initial_reduced_som_reactions = self.convertMatrixToSOMReactions(self.som_stoichiometry_matrix)
-        dropping_reactions = []
-        for r in initial_reduced_som_reactions:
-          if r.category == cn.REACTION_ERROR:
-            self.canceling_errors.append(r)
-            dropping_reactions.append(r.label)
-            multimulti_error_found = True
+        if low_memory is None:
+          low_memory = (memory_limit is not None) and  \
+              (self.estimateMemory(len(self.nodes), len(self.som_reactions_lu))
+              > memory_limit*MEGABYTE)
+        self.is_low_memory = low_memory
+        if self.is_low_memory:
+          stoichiometry_matrix = self.getSparseStoichiometryMatrix(
+              self.som_reactions_lu, list(self.nodes))
+          # RREF (or echelon) matrix
+          reduced = None
+        else:
+          self.som_stoichiometry_matrix = self.getStoichiometryMatrix(self.som_reactions_lu, list(self.nodes), som=True)
+          stoichiometry_matrix = self.som_stoichiometry_matrix
+        # step 2: examine 'canceling errors' of the net SOMReactions
+        self.canceling_errors = self.convertMatrixToSOMReactions(
+            stoichiometry_matrix, categories=[cn.REACTION_ERROR])
+        if fail_fast:
+          self.canceling_errors = self.canceling_errors[:1]
+        if self.canceling_errors:
+          multimulti_error_found = True
         # step 3: decompose using LU decompositon and check errors (echelon, type_three)
+        som_reaction_dic = {
+            cn.REACTION_ERROR: self.processErrorReaction,
+            cn.REACTION_1_1: self.processEqualSOMReaction,
+            cn.REACTION_1_n: self.processUnequalSOMReaction,
+            cn.REACTION_n_1: self.processUnequalSOMReaction,
+            }
         if not multimulti_error_found:
-          echelon_df = self.decomposeMatrix(self.som_stoichiometry_matrix)
-          self.reduced_som_reactions = self.convertMatrixToSOMReactions(echelon_df)
-          som_reaction_dic = {
-              cn.REACTION_ERROR: self.processErrorReaction,
-              cn.REACTION_1_1: self.processEqualSOMReaction,
-              cn.REACTION_1_n: self.processUnequalSOMReaction,
-              cn.REACTION_n_1: self.processUnequalSOMReaction,
-              }
-          for category in som_reaction_dic.keys():
-            for reaction in [r for r in self.reduced_som_reactions if r.category == category]:
-              func = som_reaction_dic[category]
-              func(reaction)
+          if self.is_low_memory:
+            echelon_df = self.decomposeSparseMatrix(stoichiometry_matrix)
+            reduced = echelon_df
+          else:
+            echelon_df = self.decomposeMatrix(self.som_stoichiometry_matrix)
+          # only SOMReactions that are processed are created
+          self.reduced_som_reactions = self.convertMatrixToSOMReactions(
+              echelon_df, categories=som_reaction_dic.keys())
+          som_reaction_groups = Reaction.groupByCategory(
+              self.reduced_som_reactions, categories=som_reaction_dic.keys())
+          self.processReactionGroups(som_reaction_dic, som_reaction_groups,
+              fail_fast=fail_fast)
           # checking if there was any error by LU decompoistion
           if self.echelon_errors or self.type_three_errors:
             multimulti_error_found = True
         # step 4: get RREF and check errors (same as LU decomposition case)
         if not multimulti_error_found:
-          rref_df = self.getRREFMatrix(self.echelon_df)
-          self.rref_som_reactions = self.convertMatrixToSOMReactions(rref_df)
-          for category in som_reaction_dic.keys():
-            for reaction in [r for r in self.rref_som_reactions if r.category == category]:
-              func = som_reaction_dic[category]
-              func(reaction)
+          if self.is_low_memory:
+            rref_df = self.getSparseRREFMatrix(echelon_df)
+            reduced = rref_df
+          else:
+            rref_df = self.getRREFMatrix(self.echelon_df)
+          self.rref_som_reactions = self.convertMatrixToSOMReactions(
+              rref_df, categories=som_reaction_dic.keys())
+          som_reaction_groups = Reaction.groupByCategory(
+              self.rref_som_reactions, categories=som_reaction_dic.keys())
+          self.processReactionGroups(som_reaction_dic, som_reaction_groups,
+              fail_fast=fail_fast)
+        if self.is_low_memory:
+          self.setSparseFactors(reduced, is_keep_factors=bool(
+              self.echelon_errors or self.type_three_errors))
     if not suppress_message:
       print("Model analyzed...")
     if error_details:
@@ -872,6 +1269,42 @@ class GAMES_PP(nx.DiGraph):
         print("No error found.")
       return False
 
+  @classmethod
+  def analyzeComponents(cls, simple, suppress_message=False, fail_fast=False,
+      **kwargs):
+    """
+    Analyzes each connected component of the species-reaction
+    graph separately, so that the LU decomposition and RREF
+    are done on small matrices. Unlike analyze, the matrix checks
+    are done for every component without type I or II errors.
+    :param SimpleSBML simple:
+    :param bool suppress_message:
+    :param bool fail_fast: stop at the first component with an error
+    :param dict kwargs: optional arguments of analyze
+    :return bool: True if an error is found
+    :return list-GAMES_PP: analyses of the components
+        with non-boundary reactions
+    """
+    games_pps = []
+    is_error = False
+    for component in simple.getComponents():
+      games_pp = cls(component)
+      if len(games_pp.reactions) == 0:
+        continue
+      if games_pp.analyze(suppress_message=True, fail_fast=fail_fast,
+          **kwargs):
+        is_error = True
+      games_pps.append(games_pp)
+      if fail_fast and is_error:
+        break
+    if not suppress_message:
+      print("Model analyzed...")
+      if is_error:
+        print("At least one error found.\n")
+      else:
+        print("No error found.")
+    return is_error, games_pps
+
 
 
 
@@ -6,6 +6,7 @@ from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
 from SBMLLint.common.reaction import Reaction
 from SBMLLint.common.simple_sbml import SimpleSBML
 from SBMLLint.games.games_pp import SOMStoichiometry, SOMReaction, GAMES_PP, TOLERANCE
+from SBMLLint.games.games_pp import TYPE_I, TYPE_II, TYPE_III, CANCELING, ECHELON, ERROR_TYPES
 from SBMLLint.games.som import SOM
 from SBMLLint.common import simple_sbml
 
@@ -13,6 +14,7 @@ import collections
 import networkx as nx
 import numpy as np
 import pandas as pd
+import sys
 
 NULL_STR = ""
 ReactionOperation = collections.namedtuple("ReactionOperation", 
@@ -132,47 +134,24 @@ class GAMESReport(object):
     self.errors = errors
     self.report_type_one_errors = NULL_STR
     self.explain_threshold = explain_threshold
+    # operation matrix, computed once per report
+    self._operation_df = None
+    # operation rows, key: reaction label
+    self._operation_series = {}
+    # inferred reactions, key: tuple of (reaction, operation)
+    self._inferred_reactions = {}
 
   def getMoleculeEqualityPath(self, som, molecule1, molecule2):
     """
-    Create an undirected graph between
-    two molecules within a SOM
-    and find the shortest path
+    Find the shortest path between
+    two molecules within a SOM, using
+    the equality graph of the SOM
     :param SOM som:
-    :param Molecule mole1:
-    :param Molecule mole2:
+    :param str molecule1:
+    :param str molecule2:
     :return PathComponents: som_path
     """   
-    # molecule1 = mole1.name
-    # molecule2 = mole2.name
-    # construct undirected graph
-    subg = nx.Graph()
-    # here, every reaction is 1-1 reaction
-    for reaction in list(som.reactions):
-      node1 = reaction.reactants[0].molecule.name
-      node2 = reaction.products[0].molecule.name
-      if subg.has_edge(node1, node2):
-        reaction_label = subg.get_edge_data(node1, node2)[cn.REACTION]
-        # if reaction.label is not included in the attribute, add its label
-        if reaction.label not in set(reaction_label):
-          reaction_label = reaction_label + [reaction.label]
-      else:
-        reaction_label = [reaction.label]    
-      subg.add_edge(node1, node2, reaction=reaction_label)
-    path = [short_p for short_p in nx.shortest_path(subg, 
-                                                    source=molecule1, 
-                                                    target=molecule2
-                                                    )
-           ]
-    som_path = []
-    for idx in range(len(path)-1):
-      edge_reactions = subg.get_edge_data(path[idx], path[idx+1])[cn.REACTION]
-      som_path.append(cn.PathComponents(node1=path[idx], 
-                                        node2=path[idx+1],
-                                        reactions=edge_reactions
-                                        )
-                     )
-    return som_path
+    return som.getEqualityPath(molecule1, molecule2)
 
   def getMoleculeEqualityPathReport(self, molecule_name1, molecule_name2, reaction_count, explain_details):
     """
@@ -241,82 +220,116 @@ class GAMESReport(object):
     :return str: type_one_report
     :return list-int: error_num
     """
-    report = NULL_STR
     error_num = []
     if len(type_one_errors) == 0:
-      return report, error_num
+      return NULL_STR, error_num
+    reports = []
     for pc in type_one_errors:
-      mole1 = pc.node1
-      mole2 = pc.node2
-      reactions = pc.reactions
-      reaction_count = 0
-      reaction_count, equality_report = self.getMoleculeEqualityPathReport(mole1, mole2, reaction_count, explain_details)
-      report = report + equality_report
-      if explain_details:
-        report = report + "\nHowever, "
-      reaction_count, inequality_report = self.getMoleculeInequalityPathReport(mole1, mole2, reactions, reaction_count, explain_details)
-      report = report + inequality_report
-      report = report + "\n%s\n" % (PARAGRAPH_DIVIDER)
+      sub_report, reaction_count = self._reportTypeOneError(pc, explain_details)
+      reports.append(sub_report)
       error_num.append(reaction_count)
-    report = report + "\n%s\n" % (REPORT_DIVIDER)
-    return report, error_num
+    reports.append("\n%s\n" % (REPORT_DIVIDER))
+    return NULL_STR.join(reports), error_num
+
+  def _reportTypeOneError(self, pc, explain_details=False):
+    """
+    Generate report for a single Type I Error.
+    :param PathComponents pc:
+    :param bool explain_details:
+    :return str: report
+    :return int: reaction_count
+    """
+    report = []
+    mole1 = pc.node1
+    mole2 = pc.node2
+    reactions = pc.reactions
+    reaction_count = 0
+    reaction_count, equality_report = self.getMoleculeEqualityPathReport(mole1, mole2, reaction_count, explain_details)
+    report.append(equality_report)
+    if explain_details:
+      report.append("\nHowever, ")
+    reaction_count, inequality_report = self.getMoleculeInequalityPathReport(mole1, mole2, reactions, reaction_count, explain_details)
+    report.append(inequality_report)
+    report.append("\n%s\n" % (PARAGRAPH_DIVIDER))
+    return NULL_STR.join(report), reaction_count
 
   def reportTypeTwoError(self, type_two_errors, explain_details=False):
-  	"""
-  	Generate report for Type II Errors.
-  	Type II Error occurs when there is
-  	a cycle between SOMs, which
-  	should not happen.
-  	:param list-(list-SOMs) type_two_errors:
-  	:param bool explain_details:
-  	:return str: type_two_report
-  	:return list-int: error_num
-  	"""
-  	report = NULL_STR
-  	error_num = []
-  	if len(type_two_errors) == 0:
-  	  return report, error_num
-  	for cycle in type_two_errors:
-  	  all_soms = set()
-  	  reaction_count = 0
-  	  report = report + "We detected a mass imbalance from the following reactions:\n"
-  	  if explain_details:
-  	    report = report + "\nThese uni-uni reactions created mass-equivalence.\n"
-  	  for som in cycle:
-  	  	all_soms.add(som)
-  	  	for reaction in list(som.reactions):  	  	  	
-  	  	  reaction_count += 1
-  	  	  report = report + "\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
-  	  if explain_details:
-  	  	report = report + "\n%s\n" % (PARAGRAPH_DIVIDER)
-  	  	report = report + "The following reactions create mass-inequality.\n"
-  	  inequality_reactions = []
-  	  for som_pair in zip(cycle, cycle[1:] + [cycle[0]]):
-  	    inequality_reactions = inequality_reactions + self.mesgraph.get_edge_data(som_pair[0], som_pair[1])[cn.REACTION]
-  	  for r in inequality_reactions:
-  	    reaction = self.mesgraph.simple.getReaction(r)
-  	    reaction_count += 1
-  	    report = report + "\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
-  	  if explain_details:
-  	    report = report + "\n%s\n" % (PARAGRAPH_DIVIDER)
-  	  if explain_details:
-  	  	reaction_count = reaction_count - len(inequality_reactions) 	
-  	  	# explain the mass equivalent pseudo reactions and the resulting sets
-  	  	report = report + "Based on the reactions above, we have mass-equivalent pseudo reactions.\n"
-  	  	for r in inequality_reactions:
-  	  	  reaction = self.mesgraph.simple.getReaction(r)
-  	  	  som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
-  	  	  reaction_count += 1
-  	  	  report = report + "\n(pseudo %d.) %s" % (reaction_count, som_reaction.identifier)
-  	  	report = report +  "\n%s\n" % (PARAGRAPH_DIVIDER)
-  	  	report = report + "However, the above pseudo reactions imply the following inequalities:\n\n"
-  	  	for som in cycle:
-  	  	  report = report + "%s %s " % (som.identifier, cn.LESSTHAN)
-  	  	report = report + "%s\n" % (cycle[0].identifier)
-  	  	report = report + "\nThis indicates a mass conflict between reactions."
-  	  error_num.append(reaction_count)
-  	  report = report + "\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER)
-  	return report, error_num
+    """
+    Generate report for Type II Errors.
+    Type II Error occurs when there is
+    a cycle between SOMs, which
+    should not happen.
+    :param list-(list-PathComponents) type_two_errors:
+    :param bool explain_details:
+    :return str: type_two_report
+    :return list-int: error_num
+    """
+    error_num = []
+    reports = []
+    for cycle in type_two_errors:
+      sub_report, reaction_count = self._reportTypeTwoError(cycle, explain_details)
+      reports.append(sub_report)
+      error_num.append(reaction_count)
+    return NULL_STR.join(reports), error_num
+
+  def getCycleSOMs(self, cycle):
+    """
+    Finds the SOMs of a Type II Error.
+    :param list-PathComponents cycle: arcs of the cycle
+        (GAMES_PP.getArcExplanation)
+    :return list-SOM:
+    """
+    return [self.mesgraph.getNode(self.mesgraph.simple.getMolecule(
+        arc.node1[0])) for arc in cycle]
+
+  def _reportTypeTwoError(self, error, explain_details=False):
+    """
+    Generate report for a single Type II Error.
+    :param list-PathComponents error: arcs of the cycle
+    :param bool explain_details:
+    :return str: report
+    :return int: reaction_count
+    """
+    cycle = self.getCycleSOMs(error)
+    report = []
+    reaction_count = 0
+    report.append("We detected a mass imbalance from the following reactions:\n")
+    if explain_details:
+      report.append("\nThese uni-uni reactions created mass-equivalence.\n")
+    for som in cycle:
+      for reaction in list(som.reactions):
+        reaction_count += 1
+        report.append("\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+    if explain_details:
+      report.append("\n%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("The following reactions create mass-inequality.\n")
+    inequality_reactions = []
+    for arc in error:
+      inequality_reactions = inequality_reactions  \
+          + list(collections.OrderedDict.fromkeys(arc.reactions))
+    for r in inequality_reactions:
+      reaction = self.mesgraph.simple.getReaction(r)
+      reaction_count += 1
+      report.append("\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+    if explain_details:
+      report.append("\n%s\n" % (PARAGRAPH_DIVIDER))
+    if explain_details:
+      reaction_count = reaction_count - len(inequality_reactions)
+      # explain the mass equivalent pseudo reactions and the resulting sets
+      report.append("Based on the reactions above, we have mass-equivalent pseudo reactions.\n")
+      for r in inequality_reactions:
+        reaction = self.mesgraph.simple.getReaction(r)
+        som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
+        reaction_count += 1
+        report.append("\n(pseudo %d.) %s" % (reaction_count, som_reaction.identifier))
+      report.append("\n%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("However, the above pseudo reactions imply the following inequalities:\n\n")
+      for som in cycle:
+        report.append("%s %s " % (som.identifier, cn.LESSTHAN))
+      report.append("%s\n" % (cycle[0].identifier))
+      report.append("\nThis indicates a mass conflict between reactions.")
+    report.append("\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER))
+    return NULL_STR.join(report), reaction_count
 
   def convertOperationSeriesToReactionOperations(self, operation):
     """
@@ -325,16 +338,16 @@ class GAMESReport(object):
     An 'operation' is either a row or column 
     of an operation matrix, 
     where both column and row indices are reactions. 
-    :param pandas.Series operation:
+    :param pandas.Series/None operation:
     :return list-ReactionOperation: operations
     """
     operations = []
-    # 
-    nonzero_idx = np.array([idx for idx, val in enumerate(operation) if val != 0.0])
-    nonzero_op = operation[nonzero_idx]
-    for idx in range(len(nonzero_op)):
-      reaction_op = ReactionOperation(reaction=nonzero_op.index[idx],
-      	                              operation=nonzero_op[idx]
+    if operation is None:
+      return operations
+    values = operation.to_numpy()
+    for idx in np.flatnonzero(values != 0.0):
+      reaction_op = ReactionOperation(reaction=operation.index[idx],
+      	                              operation=values[idx]
       	                              )
       operations.append(reaction_op)
     return operations
@@ -342,18 +355,55 @@ class GAMESReport(object):
   def getOperationMatrix(self):
   	"""
   	Return an operation matrix (pandas DataFrame)
-  	on the transposed stoichiometry matrix
+  	on the transposed stoichiometry matrix.
+  	The matrix is computed once and reused.
   	:return pandas.DataFrame: operation_df
   	"""
+  	if self._operation_df is not None:
+  	  return self._operation_df
   	operation_df = None
-  	if self.mesgraph.lower_inverse is None:
+  	if self.mesgraph.is_low_memory:
+  	  # Recomputed from the sparse factors
+  	  if self.mesgraph.factor_labels is not None:
+  	    operation_df = pd.DataFrame([self.getOperationSeries(label)
+  	        for label in self.mesgraph.factor_labels])
+  	elif self.mesgraph.lower_inverse is None:
   	  pass
   	elif self.mesgraph.rref_operation is None:
   	  operation_df = self.mesgraph.lower_inverse
   	else:
   	  operation_df = self.mesgraph.rref_operation.dot(self.mesgraph.lower_inverse)
+  	self._operation_df = operation_df
   	return operation_df
 
+  def getOperationSeries(self, reaction_label):
+    """
+    Return the operation of a single reaction, i.e.,
+    the row of the operation matrix for reaction_label.
+    Only that row is computed unless the full
+    matrix was already created.
+    :param str reaction_label:
+    :return pandas.Series/None: operation; None if there
+        was no decomposition
+    """
+    if reaction_label in self._operation_series:
+      return self._operation_series[reaction_label]
+    if self._operation_df is not None:
+      operation = self._operation_df.loc[reaction_label]
+    elif self.mesgraph.is_low_memory:
+      operation = self.mesgraph.getOperationSeries(reaction_label)
+    elif self.mesgraph.lower_inverse is None:
+      operation = None
+    elif self.mesgraph.rref_operation is None:
+      operation = self.mesgraph.lower_inverse.loc[reaction_label]
+    else:
+      operation = self.mesgraph.rref_operation.loc[reaction_label].dot(
+          self.mesgraph.lower_inverse)
+    if operation is not None:
+      operation.name = reaction_label
+    self._operation_series[reaction_label] = operation
+    return operation
+
   def getResultingSeries(self, reaction_label):
     """
     Return a reaction series, that is, a column
@@ -364,7 +414,9 @@ class GAMESReport(object):
     if type(reaction_label) != str:
       return False
     else: 
-      if self.mesgraph.rref_df is None:
+      if self.mesgraph.is_low_memory:
+        result_series = self.mesgraph.getReducedSeries(reaction_label)
+      elif self.mesgraph.rref_df is None:
         result_series = self.mesgraph.echelon_df[reaction_label]
       else:
         result_series = self.mesgraph.rref_df[reaction_label]
@@ -396,6 +448,9 @@ class GAMESReport(object):
   	:return SimplifiedReaction: inferred_reaction
   	"""
   	INFERRED_REACTION = "Inferred Reaction"
+  	key = tuple((op.reaction, op.operation) for op in reaction_operations)
+  	if key in self._inferred_reactions:
+  	  return self._inferred_reactions[key]
   	stoichiometry_df = self.getOperationStoichiometryMatrix(reaction_operations)
   	reaction_index = [op.reaction for op in reaction_operations]
   	operation_series = pd.Series([val.operation for val in reaction_operations], index=reaction_index)
@@ -417,6 +472,7 @@ class GAMESReport(object):
   		                                   NULL_STR,
   		                                   self.mesgraph)
   	inferred_reaction.reduceBySOMs()
+  	self._inferred_reactions[key] = inferred_reaction
   	return inferred_reaction
 
   def reportReactionsInSOM(self, som, reaction_count=0):
@@ -449,102 +505,111 @@ class GAMESReport(object):
     :return False/str: report
     :return list-int: error_num
     """
-    report = NULL_STR
     error_num = []
-    if len(type_three_errors) == 0:
-      return report, error_num
+    reports = []
     for type3_error in type_three_errors:
-      reaction_count = 0
-      if type3_error.category != cn.REACTION_1_1:
-        print("This canot be a type three error!")
-        report = False
-        break
-      else:
-        reaction_label = type3_error.label
-        reactant_som = type3_error.reactants[0].som
-        product_som = type3_error.products[0].som
-        operation_df = self.getOperationMatrix()
-        operation_series = operation_df.T[reaction_label]
-        reaction_operations = self.convertOperationSeriesToReactionOperations(operation_series)
-        # if the number of elements exceeds the threshold, do not explain details
-        if len(reaction_operations) > self.explain_threshold:
-          explain_details = False
-        inferred_reaction = self.getInferredReaction(reaction_operations)
-        inferred_som_reaction = self.mesgraph.convertReactionToSOMReaction(inferred_reaction)
-        if inferred_som_reaction.getCategory() != cn.REACTION_1_1:
-          explain_details = False
-        reactant_som = inferred_som_reaction.reactants[0].som
-        product_som = inferred_som_reaction.products[0].som
-        inequality_reactions = []
-        if self.mesgraph.has_edge(reactant_som, product_som):
-          inequality_reactions = inequality_reactions + self.mesgraph.get_edge_data(reactant_som, product_som)[cn.REACTION]
-        if self.mesgraph.has_edge(product_som, reactant_som):
-          inequality_reactions = inequality_reactions + self.mesgraph.get_edge_data(product_som, reactant_som)[cn.REACTION]
-        #
-        report = report + "We detected a mass imbalance from the following reactions:\n"
-        soms = set()
-        som_reactions = []
-        for r in reaction_operations:
-          reaction = self.mesgraph.simple.getReaction(r.reaction)
-          reaction_count += 1
-          report = report + "\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
-          som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
-          som_reactions.append(som_reaction)
-          soms = soms.union({r.som for r in som_reaction.reactants})
-          soms = soms.union({p.som for p in som_reaction.products})
-        # calculated the reported number of reactions that constitute a type III error
-        error_num.append(reaction_count + len(inequality_reactions))
-        if explain_details:
-          report = report + "\n\n%s%s\n" % ("-"*NUM_STAR, PARAGRAPH_DIVIDER)
-          report = report + "These uni-uni reactions created mass-equivalence.\n" 
-          report = report + "(The chemical species within a curly bracket have the same atomic mass.)\n"
+      sub_report, reaction_count = self._reportTypeThreeError(type3_error, explain_details)
+      if sub_report is False:
+        return False, error_num
+      reports.append(sub_report)
+      error_num.append(reaction_count)
+    return NULL_STR.join(reports), error_num
+
+  def _reportTypeThreeError(self, type3_error, explain_details=False):
+    """
+    Generate a report for a single Type III error.
+    :param SOMReaction type3_error:
+    :param bool explain_details:
+    :return False/str: report
+    :return int: number of reactions that constitute the error
+    """
+    if type3_error.category != cn.REACTION_1_1:
+      print("This canot be a type three error!")
+      return False, 0
+    report = []
+    reaction_count = 0
+    reaction_label = type3_error.label
+    operation_series = self.getOperationSeries(reaction_label)
+    reaction_operations = self.convertOperationSeriesToReactionOperations(operation_series)
+    # if the number of elements exceeds the threshold, do not explain details
+    if len(reaction_operations) > self.explain_threshold:
+      explain_details = False
+    inferred_reaction = self.getInferredReaction(reaction_operations)
+    inferred_som_reaction = self.mesgraph.convertReactionToSOMReaction(inferred_reaction)
+    if inferred_som_reaction.getCategory() != cn.REACTION_1_1:
+      explain_details = False
+    reactant_som = inferred_som_reaction.reactants[0].som
+    product_som = inferred_som_reaction.products[0].som
+    inequality_reactions = []
+    if self.mesgraph.has_edge(reactant_som, product_som):
+      inequality_reactions = inequality_reactions + self.mesgraph.get_edge_data(reactant_som, product_som)[cn.REACTION]
+    if self.mesgraph.has_edge(product_som, reactant_som):
+      inequality_reactions = inequality_reactions + self.mesgraph.get_edge_data(product_som, reactant_som)[cn.REACTION]
+    #
+    report.append("We detected a mass imbalance from the following reactions:\n")
+    soms = set()
+    som_reactions = []
+    for r in reaction_operations:
+      reaction = self.mesgraph.simple.getReaction(r.reaction)
+      reaction_count += 1
+      report.append("\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+      som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
+      som_reactions.append(som_reaction)
+      soms = soms.union({r.som for r in som_reaction.reactants})
+      soms = soms.union({p.som for p in som_reaction.products})
+    # calculated the reported number of reactions that constitute a type III error
+    error_num = reaction_count + len(inequality_reactions)
+    if explain_details:
+      report.append("\n\n%s%s\n" % ("-"*NUM_STAR, PARAGRAPH_DIVIDER))
+      report.append("These uni-uni reactions created mass-equivalence.\n")
+      report.append("(The chemical species within a curly bracket have the same atomic mass.)\n")
+    else:
+      report.append("\n")
+    for som in soms:
+      if explain_details and som.reactions:
+        report.append("\n%s is inferred by:\n" % som.makeId())
+      sub_report, reaction_count = self.reportReactionsInSOM(som, reaction_count)
+      report.append(sub_report)
+    if explain_details:
+      report.append("%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("These multi-uni reactions created mass-inequality.\n\n")
+    for r in inequality_reactions:
+      reaction = self.mesgraph.simple.getReaction(r)
+      reaction_count += 1
+      report.append("%d. %s\n" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+    reaction_count = reaction_count - len(inequality_reactions)
+    if explain_details:
+      report.append("%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("Based on the reactions above, we have mass-equivalent pseudo reactions.\n")
+      pseudo_reaction_count = 0
+      for sr in som_reactions:
+        pseudo_reaction_count += 1
+        report.append("\n(pseudo %d.) %s" % (pseudo_reaction_count, sr.identifier))
+      report.append("\n%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("An operation between pseudo reactions:\n")
+      report.append("\n%.2f * %s" % (reaction_operations[0].operation, reaction_operations[0].reaction))
+      for ro in reaction_operations[1:]:
+        if ro.operation < 0:
+          report.append(" - ")
         else:
-          report = report + "\n"  	  	
-        for som in soms:
-          if explain_details and som.reactions:
-            report = report + "\n%s is inferred by:\n" % som.makeId()
-          sub_report, reaction_count = self.reportReactionsInSOM(som, reaction_count)
-          report = report + sub_report
-        if explain_details:
-          report = report + "%s\n" % (PARAGRAPH_DIVIDER)
-          report = report + "These multi-uni reactions created mass-inequality.\n\n"  	  
-        for r in inequality_reactions:
-          reaction = self.mesgraph.simple.getReaction(r)
-          reaction_count += 1
-          report = report + "%d. %s\n" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
-        reaction_count = reaction_count - len(inequality_reactions)
-        if explain_details:
-          report = report + "%s\n" % (PARAGRAPH_DIVIDER)
-          report = report + "Based on the reactions above, we have mass-equivalent pseudo reactions.\n"
-          pseudo_reaction_count = 0
-          for sr in som_reactions:
-            pseudo_reaction_count += 1
-            report = report + "\n(pseudo %d.) %s" % (pseudo_reaction_count, sr.identifier)
-          report = report +  "\n%s\n" % (PARAGRAPH_DIVIDER)
-          report = report + "An operation between pseudo reactions:\n"
-          report = report + "\n%.2f * %s" % (reaction_operations[0].operation, reaction_operations[0].reaction)
-          for ro in reaction_operations[1:]:
-            if ro.operation < 0:
-              report = report + " - "
-            else:
-              report = report + " + "
-            report = report + "%.2f * %s\n" % (abs(ro.operation), ro.reaction)
-          report = report + "\n\nwill result in a uni-uni reaction:\n"
-          report = report + "\n%s\n" % (inferred_som_reaction.identifier)
-          report = report + "\n\nmeaning %s and %s have equal mass.\n" % (reactant_som, product_som)
-          report = report +  "%s\n" % (PARAGRAPH_DIVIDER)
-          report = report + "However, the following mass-equivalent pseudo reaction(s):\n"
-          for r in inequality_reactions:
-            reaction = self.mesgraph.simple.getReaction(r)
-            reaction_count += 1
-            report = report + "\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
-            som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
-            report = report + "\n(pseudo %d.) %s" % (reaction_count, som_reaction.identifier)
-          report = report + "\n\nincidates the masses of %s and %s are unequal.\n" % (reactant_som, product_som)
-          #
-          report = report +  "\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER)
-        report = report + "\n%s\n" % (REPORT_DIVIDER) 
-    return report, error_num
+          report.append(" + ")
+        report.append("%.2f * %s\n" % (abs(ro.operation), ro.reaction))
+      report.append("\n\nwill result in a uni-uni reaction:\n")
+      report.append("\n%s\n" % (inferred_som_reaction.identifier))
+      report.append("\n\nmeaning %s and %s have equal mass.\n" % (reactant_som, product_som))
+      report.append("%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("However, the following mass-equivalent pseudo reaction(s):\n")
+      for r in inequality_reactions:
+        reaction = self.mesgraph.simple.getReaction(r)
+        reaction_count += 1
+        report.append("\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+        som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
+        report.append("\n(pseudo %d.) %s" % (reaction_count, som_reaction.identifier))
+      report.append("\n\nincidates the masses of %s and %s are unequal.\n" % (reactant_som, product_som))
+      #
+      report.append("\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER))
+    report.append("\n%s\n" % (REPORT_DIVIDER))
+    return NULL_STR.join(report), error_num
 
   def reportEchelonError(self, echelon_errors, explain_details=False):
     """
@@ -559,93 +624,98 @@ class GAMESReport(object):
     :return str: report
     :return list-int: error_num
     """
-    report = NULL_STR
     error_num = []
-    if len(echelon_errors) == 0:
-      return report, error_num
-    operation_df = self.getOperationMatrix()
-    error_report = NULL_STR
+    reports = []
     for reaction in echelon_errors:
-      reaction_count = 0
-      reaction_label = reaction.label
-      operation_series = operation_df.T[reaction_label]
-      result_series = self.getResultingSeries(reaction_label)
-      reaction_operations = self.convertOperationSeriesToReactionOperations(operation_series)
-      # if the number of elements exceeds the threshold, do not explain details
-      if len(reaction_operations) > self.explain_threshold:
-        explain_details = False
-      inferred_reaction = self.getInferredReaction(reaction_operations)
-      inferred_som_reaction = self.mesgraph.convertReactionToSOMReaction(inferred_reaction)
-      #
-      if explain_details:
-        report = report + "\nWe detected a mass imbalance\n%s\n" % inferred_reaction.identifier
-      else:
-        report = report + "\nWe detected a mass imbalance"
-      report = report + "\nfrom the following reaction isolation set.\n"
-      #
-      nonzero_idx = np.array([idx for idx, val in enumerate(result_series) if val != 0.0])
-      nonzero_result_series = result_series[nonzero_idx]
-      #
-      # part 1: reactions that caused mass balance errors
-      reaction_operations = self.convertOperationSeriesToReactionOperations(operation_series)
-      reported_reactions = [r.reaction for r in reaction_operations]
-      reported_som_reactions = []
-      for r in reported_reactions:
-      	reaction = self.mesgraph.simple.getReaction(r)
-      	reaction_count += 1
-      	report = report + "\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
+      sub_report, reaction_count = self._reportEchelonError(reaction, explain_details)
+      reports.append(sub_report)
       error_num.append(reaction_count)
-      one_side = "--undetermined--"
-      if inferred_som_reaction.reactants==[]:
-        one_side = "reactant"
-      elif inferred_som_reaction.products==[]:
-        one_side = "product"
-      if one_side == "--undetermined--":
-        explain_details = False
-      #
-      # part 2: SOMs that were canceled by the operation
-      canceled_soms = set()
-      for r in reported_reactions:
-      	sr = self.mesgraph.convertReactionToSOMReaction(self.mesgraph.simple.getReaction(r))
-      	reported_som_reactions.append(sr)
-      	canceled_soms = canceled_soms.union({r.som for r in sr.reactants})
-      	canceled_soms = canceled_soms.union({p.som for p in sr.products})
-      canceled_soms = canceled_soms.difference({r.som for r in inferred_som_reaction.reactants})
-      canceled_soms = canceled_soms.difference({p.som for p in inferred_som_reaction.products})
-      #
-      if explain_details:
-      	report = report + "\n\n%s%s\n" % ("-"*NUM_STAR, PARAGRAPH_DIVIDER)
-      	report = report + "These uni-uni reactions created mass-equivalence.\n"
-      	report = report + "(The chemical species within a curly bracket have the same atomic mass.)\n"
-      else:
-        report = report + "\n"
-      for som in canceled_soms:
-        if explain_details and som.reactions:
-          report = report + "\n%s is inferred by:\n" % som.makeId()
-        sub_report, reaction_count = self.reportReactionsInSOM(som, reaction_count)
-        report = report + sub_report
-      if explain_details:
-        report = report + "%s\n" % (PARAGRAPH_DIVIDER)
-        report = report + "Based on the uni-uni reactions above, we create mass-equivalent pseudo reactions.\n"
-        pseudo_reaction_count = 0
-        for sr in reported_som_reactions:
-          pseudo_reaction_count += 1
-          report = report + "\n(pseudo %d.) %s" % (pseudo_reaction_count, sr.identifier)
-        report = report +  "\n%s\n" % (PARAGRAPH_DIVIDER)
-        report = report + "An operation between the pseudo reactions:\n"
-        report = report + "%.2f * %s" % (reaction_operations[0].operation, reaction_operations[0].reaction)
-        for ro in reaction_operations[1:]:
-          if ro.operation < 0:
-            report = report + " - "
-          else:
-            report = report + " + "
-          report = report + "%.2f * %s" % (abs(ro.operation), ro.reaction)
-        # one_side is determined in lines 589-593
-        report = report + "\n\nwill result in empty %s with zero mass:\n" % (one_side)
-        report = report + "\n%s\n" % (inferred_som_reaction.identifier)
-        report = report +  "\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER)
-      report = report + "\n%s\n" % (REPORT_DIVIDER)
-    return report, error_num
+    return NULL_STR.join(reports), error_num
+
+  def _reportEchelonError(self, reaction, explain_details=False):
+    """
+    Generate a report for a single echelon error.
+    :param SOMReaction reaction:
+    :param bool explain_details:
+    :return str: report
+    :return int: number of reactions in the isolation set
+    """
+    report = []
+    reaction_count = 0
+    reaction_label = reaction.label
+    operation_series = self.getOperationSeries(reaction_label)
+    reaction_operations = self.convertOperationSeriesToReactionOperations(operation_series)
+    # if the number of elements exceeds the threshold, do not explain details
+    if len(reaction_operations) > self.explain_threshold:
+      explain_details = False
+    inferred_reaction = self.getInferredReaction(reaction_operations)
+    inferred_som_reaction = self.mesgraph.convertReactionToSOMReaction(inferred_reaction)
+    #
+    if explain_details:
+      report.append("\nWe detected a mass imbalance\n%s\n" % inferred_reaction.identifier)
+    else:
+      report.append("\nWe detected a mass imbalance")
+    report.append("\nfrom the following reaction isolation set.\n")
+    #
+    # part 1: reactions that caused mass balance errors
+    reported_reactions = [r.reaction for r in reaction_operations]
+    reported_som_reactions = []
+    for r in reported_reactions:
+      reaction = self.mesgraph.simple.getReaction(r)
+      reaction_count += 1
+      report.append("\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+    error_num = reaction_count
+    one_side = "--undetermined--"
+    if inferred_som_reaction.reactants==[]:
+      one_side = "reactant"
+    elif inferred_som_reaction.products==[]:
+      one_side = "product"
+    if one_side == "--undetermined--":
+      explain_details = False
+    #
+    # part 2: SOMs that were canceled by the operation
+    canceled_soms = set()
+    for r in reported_reactions:
+      sr = self.mesgraph.convertReactionToSOMReaction(self.mesgraph.simple.getReaction(r))
+      reported_som_reactions.append(sr)
+      canceled_soms = canceled_soms.union({r.som for r in sr.reactants})
+      canceled_soms = canceled_soms.union({p.som for p in sr.products})
+    canceled_soms = canceled_soms.difference({r.som for r in inferred_som_reaction.reactants})
+    canceled_soms = canceled_soms.difference({p.som for p in inferred_som_reaction.products})
+    #
+    if explain_details:
+      report.append("\n\n%s%s\n" % ("-"*NUM_STAR, PARAGRAPH_DIVIDER))
+      report.append("These uni-uni reactions created mass-equivalence.\n")
+      report.append("(The chemical species within a curly bracket have the same atomic mass.)\n")
+    else:
+      report.append("\n")
+    for som in canceled_soms:
+      if explain_details and som.reactions:
+        report.append("\n%s is inferred by:\n" % som.makeId())
+      sub_report, reaction_count = self.reportReactionsInSOM(som, reaction_count)
+      report.append(sub_report)
+    if explain_details:
+      report.append("%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("Based on the uni-uni reactions above, we create mass-equivalent pseudo reactions.\n")
+      pseudo_reaction_count = 0
+      for sr in reported_som_reactions:
+        pseudo_reaction_count += 1
+        report.append("\n(pseudo %d.) %s" % (pseudo_reaction_count, sr.identifier))
+      report.append("\n%s\n" % (PARAGRAPH_DIVIDER))
+      report.append("An operation between the pseudo reactions:\n")
+      report.append("%.2f * %s" % (reaction_operations[0].operation, reaction_operations[0].reaction))
+      for ro in reaction_operations[1:]:
+        if ro.operation < 0:
+          report.append(" - ")
+        else:
+          report.append(" + ")
+        report.append("%.2f * %s" % (abs(ro.operation), ro.reaction))
+      # one_side is determined above from the inferred reaction
+      report.append("\n\nwill result in empty %s with zero mass:\n" % (one_side))
+      report.append("\n%s\n" % (inferred_som_reaction.identifier))
+      report.append("\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER))
+    report.append("\n%s\n" % (REPORT_DIVIDER))
+    return NULL_STR.join(report), error_num
 
   def reportCancelingError(self, canceling_errors, explain_details=False):
     """
@@ -656,47 +726,200 @@ class GAMESReport(object):
     :return str: report
     :return list-int: error_num
     """
-    report = NULL_STR
     error_num = []
     if len(canceling_errors) == 0:
-      return report, error_num
+      return NULL_STR, error_num
+    reports = []
     for error in canceling_errors:
-      reaction_count = 0
+      sub_report, reaction_count = self._reportCancelingError(error, explain_details)
+      reports.append(sub_report)
+      error_num.append(reaction_count)
+    reports.append("\n%s\n" % (REPORT_DIVIDER))
+    return NULL_STR.join(reports), error_num
+
+  def _reportCancelingError(self, error, explain_details=False):
+    """
+    Generate a report for a single canceling error.
+    :param SOMReaction error:
+    :param bool explain_details:
+    :return str: report
+    :return int: number of reactions in the isolation set
+    """
+    report = []
+    reaction_count = 0
+    label = error.label
+    reaction = self.mesgraph.simple.getReaction(label)
+    simplified_reaction = SimplifiedReaction(reaction.reactants, reaction.products, label, self.mesgraph)
+    simplified_reaction.reduceBySOMs()
+    som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
+    som_reactants = {r.som for r in som_reaction.reactants}
+    som_products = {p.som for p in som_reaction.products}
+    canceled_soms = list(som_reactants.intersection(som_products))
+    report.append("We detected a mass imbalance\n: %s\n\nfrom the following reaction isolation set:\n" % (simplified_reaction.identifier))
+    reaction_count += 1
+    report.append("\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+    for som in canceled_soms:
+      if len(som.molecules) == 1 and explain_details:
+        molecule = list(som.molecules)[0]
+        report.append("\n*%s is a common chemical species in reactants and products, so can be canceled\n" % (molecule.name))
+      for reaction in list(som.reactions):
+        reaction_count += 1
+        reactant = reaction.reactants[0].molecule
+        product = reaction.products[0].molecule
+        report.append("\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False)))
+        if explain_details:
+          report.append("\n*%s and %s have the same mass according to the above reaction\n" % (reactant.name, product.name))
+    report.append("\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER))
+    return NULL_STR.join(report), reaction_count
+
+  def writeReport(self, error_summary, file_out=sys.stdout, explain_details=True,
+      max_errors=None, max_explained_errors=None):
+    """
+    Writes the report of each error to file_out as soon as it
+    is generated, so that large models do not build the whole
+    report in memory. Errors beyond max_explained_errors are
+    reported without details; errors beyond max_errors are
+    only counted and summarized at the end.
+    :param list-ErrorSummary error_summary:
+    :param TextIOWrapper file_out:
+    :param bool explain_details:
+    :param int max_errors: None means no limit
+    :param int max_explained_errors: None means no limit
+    :return dict: key: error type, value: number of unreported errors
+    """
+    return writeReports([(self, s) for s in error_summary],
+        file_out=file_out, explain_details=explain_details,
+        max_errors=max_errors, max_explained_errors=max_explained_errors)
+
+  def makeErrorRecord(self, error_type, error):
+    """
+    Describes an error by the reactions and SOMs
+    involved, for machine-readable output.
+    :param str error_type: TYPE_I, TYPE_II, TYPE_III, CANCELING, ECHELON
+    :param PathComponents/list-PathComponents/SOMReaction error:
+    :return dict:
+    """
+    label = None
+    reactions = []
+    soms = []
+    if error_type == TYPE_I:
+      som = self.mesgraph.getNode(self.mesgraph.simple.getMolecule(error.node1))
+      if error.node1 != error.node2:
+        for pc in self.getMoleculeEqualityPath(som, error.node1, error.node2):
+          reactions = reactions + list(pc.reactions)
+      reactions = reactions + list(error.reactions)
+      soms = [som]
+    elif error_type == TYPE_II:
+      soms = self.getCycleSOMs(error)
+      for som in soms:
+        reactions = reactions + [r.label for r in som.reactions]
+      for arc in error:
+        reactions = reactions + list(arc.reactions)
+    elif error_type in [TYPE_III, ECHELON]:
+      label = error.label
+      operation_series = self.getOperationSeries(label)
+      reaction_operations = self.convertOperationSeriesToReactionOperations(operation_series)
+      reactions = [ro.reaction for ro in reaction_operations]
+      soms = [ss.som for ss in error.reactants + error.products]
+    elif error_type == CANCELING:
       label = error.label
       reaction = self.mesgraph.simple.getReaction(label)
-      simplified_reaction = SimplifiedReaction(reaction.reactants, reaction.products, label, self.mesgraph)
-      simplified_reaction.reduceBySOMs()
       som_reaction = self.mesgraph.convertReactionToSOMReaction(reaction)
       som_reactants = {r.som for r in som_reaction.reactants}
       som_products = {p.som for p in som_reaction.products}
-      canceled_soms = list(som_reactants.intersection(som_products))
-      reaction_count += 1
-      report = report + "\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
-      for som in canceled_soms:
-        if len(som.molecules) == 1 and explain_details:
-          molecule = list(som.molecules)[0]
-          report = report + "\n*%s is a common chemical species in reactants and products, so can be canceled\n" % (molecule.name)
-        for reaction in list(som.reactions):
-          reaction_count += 1
-          reactant = reaction.reactants[0].molecule
-          product = reaction.products[0].molecule
-          report = report + "\n%d. %s" % (reaction_count, reaction.makeIdentifier(is_include_kinetics=False))
-          if explain_details:
-            report = report + "\n*%s and %s have the same mass according to the above reaction\n" % (reactant.name, product.name)
-      if error.reactants==[]:
-        one_side = "reactant"
-      elif error.products==[]:
-        one_side = "product"
-      report = "We detected a mass imbalance\n: %s\n\nfrom the following reaction isolation set:\n" % (simplified_reaction.identifier) + report 
-      error_num.append(reaction_count)      
-      report = report + "\n%s%s\n" % (PARAGRAPH_DIVIDER, PARAGRAPH_DIVIDER)
-    report = report + "\n%s\n" % (REPORT_DIVIDER)
-    return report, error_num
-
-
-
-
-
-
-
-
+      reactions = [label]
+      for som in som_reactants.intersection(som_products):
+        reactions = reactions + [r.label for r in som.reactions]
+        soms.append(som)
+    return {
+        cn.RESULT_TYPE: error_type,
+        cn.RESULT_LABEL: label,
+        cn.RESULT_REACTIONS: list(collections.OrderedDict.fromkeys(reactions)),
+        cn.RESULT_SOMS: [som.identifier for som in soms],
+        }
+
+
+def writeReports(report_summarys, file_out=sys.stdout, explain_details=True,
+    max_errors=None, max_explained_errors=None):
+  """
+  Writes the errors of one or more reports (e.g., of the
+  components of a model) as a single report with one error budget.
+  Consecutive entries of the same error type share the divider
+  written after the errors of that type.
+  :param list-(GAMESReport, ErrorSummary) report_summarys:
+  :param TextIOWrapper file_out:
+  :param bool explain_details:
+  :param int max_errors: None means no limit
+  :param int max_explained_errors: None means no limit
+  :return dict: key: error type, value: number of unreported errors
+  """
+  # Types whose reports end with a divider after all errors
+  footer_types = [TYPE_I, CANCELING]
+  num_reported = 0
+  unreported = collections.OrderedDict()
+  num_written_type = 0  # errors written for the current type
+  for position, (report, summary) in enumerate(report_summarys):
+    report_functions = {
+        TYPE_I: report._reportTypeOneError,
+        TYPE_II: report._reportTypeTwoError,
+        TYPE_III: report._reportTypeThreeError,
+        CANCELING: report._reportCancelingError,
+        ECHELON: report._reportEchelonError,
+        }
+    if summary.type not in report_functions:
+      continue
+    num_written = 0
+    for idx, error in enumerate(summary.errors):
+      if (max_errors is not None) and (num_reported >= max_errors):
+        # Errors before idx were visited, even if not written
+        unreported[summary.type] = unreported.get(summary.type, 0)  \
+            + len(summary.errors) - idx
+        break
+      is_explain = explain_details
+      if (max_explained_errors is not None)  \
+          and (num_reported >= max_explained_errors):
+        is_explain = False
+      sub_report, _ = report_functions[summary.type](error, is_explain)
+      if sub_report is False:
+        continue
+      file_out.write(sub_report)
+      num_written += 1
+      num_reported += 1
+    num_written_type += num_written
+    is_last_of_type = (position == len(report_summarys) - 1)  \
+        or (report_summarys[position + 1][1].type != summary.type)
+    if is_last_of_type:
+      if (num_written_type > 0) and (summary.type in footer_types):
+        file_out.write("\n%s\n" % (REPORT_DIVIDER))
+      num_written_type = 0
+  if unreported:
+    file_out.write("\nReport truncated after %d errors. Unreported errors:\n"
+        % max_errors)
+    for error_type, count in unreported.items():
+      file_out.write("  %s: %d\n" % (error_type, count))
+  return dict(unreported)
+
+def writeComponentReport(games_pps, file_out=sys.stdout,
+    explain_threshold=20, explain_details=True, max_errors=None,
+    max_explained_errors=None):
+  """
+  Writes the errors of the analyses of the components of a model
+  (GAMES_PP.analyzeComponents) as one report, ordered by error type.
+  :param list-GAMES_PP games_pps:
+  :param TextIOWrapper file_out:
+  :param int explain_threshold:
+  :param bool explain_details:
+  :param int max_errors: None means no limit
+  :param int max_explained_errors: None means no limit
+  :return dict: key: error type, value: number of unreported errors
+  """
+  reports = [GAMESReport(m, explain_threshold=explain_threshold)
+      for m in games_pps]
+  report_summarys = []
+  for error_type in ERROR_TYPES:
+    for report in reports:
+      report_summarys.extend([(report, s)
+          for s in report.mesgraph.error_summary if s.type == error_type])
+  return writeReports(report_summarys, file_out=file_out,
+      explain_details=explain_details, max_errors=max_errors,
+      max_explained_errors=max_explained_errors)
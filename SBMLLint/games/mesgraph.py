@@ -3,6 +3,7 @@
 from SBMLLint.common import constants as cn
 from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
 from SBMLLint.common.reaction import Reaction
+from SBMLLint.games.error_collector import ErrorCollector, getPathKey
 from SBMLLint.games.som import SOM
 from SBMLLint.common.simple_sbml import SimpleSBML
 
@@ -39,13 +40,13 @@ class MESGraph(nx.DiGraph):
     self.soms = self.initializeSOMs(simple)
     self.add_nodes_from(self.soms)
     self.identifier = self.makeId()
-    self.multimulti_reactions = []
+    self.multimulti_reactions = ErrorCollector()
     self.type_one_error = False
     self.type_two_error = False
-    self.type_one_errors = []
+    self.type_one_errors = ErrorCollector(func_key=getPathKey)
     self.type_two_errors = []
-    self.type_three_errors = []
-    self.type_four_errors = []
+    self.type_three_errors = ErrorCollector(func_key=getPathKey)
+    self.type_four_errors = ErrorCollector()
     self.type_five_errors = []
 
   def __repr__(self):
@@ -109,12 +110,14 @@ class MESGraph(nx.DiGraph):
     for som in [som1, som2]:
       for edge in list(self.in_edges(som)):
         remaining_som = edge[0]
-        reaction_label = self.get_edge_data(edge[0], edge[1])[cn.REACTION]
-        self.add_edge(remaining_som, new_som, reaction=reaction_label)  
+        edge_data = self.get_edge_data(edge[0], edge[1])
+        self.add_edge(remaining_som, new_som, reaction=edge_data[cn.REACTION],
+            provenance=edge_data.get(cn.PROVENANCE, []))
       for edge in list(self.out_edges(som)):
         remaining_som = edge[1]
-        reaction_label = self.get_edge_data(edge[0], edge[1])[cn.REACTION]
-        self.add_edge(new_som, remaining_som, reaction=reaction_label) 
+        edge_data = self.get_edge_data(edge[0], edge[1])
+        self.add_edge(new_som, remaining_som, reaction=edge_data[cn.REACTION],
+            provenance=edge_data.get(cn.PROVENANCE, []))
     self.remove_nodes_from([som1, som2])
     if not self.has_node(new_som):
       self.add_node(new_som)
@@ -162,7 +165,7 @@ class MESGraph(nx.DiGraph):
         if not self.checkTypeOneError(arc, reaction):
           som_source = self.getNode(arc[0])
           som_destination = self.getNode(arc[1])
-          self.addArc(som_source, som_destination, reaction)
+          self.addArc(som_source, som_destination, reaction, arc=arc)
       self.identifier = self.makeId()
 
   def processMultiUniReaction(self, reaction):
@@ -183,7 +186,7 @@ class MESGraph(nx.DiGraph):
         if not self.checkTypeOneError(arc, reaction):
           som_source = self.getNode(arc[0])
           som_destination = self.getNode(arc[1])
-          self.addArc(som_source, som_destination, reaction)
+          self.addArc(som_source, som_destination, reaction, arc=arc)
       self.identifier = self.makeId()
 
   def addMultiMultiReaction(self, reaction=None):
@@ -192,8 +195,7 @@ class MESGraph(nx.DiGraph):
     :param reaction Reaction:
     :return bool:
     """
-    if reaction not in self.multimulti_reactions:
-      self.multimulti_reactions.append(reaction)
+    self.multimulti_reactions.add(reaction)
 
   def addTypeThreeError(self, som1, som2, reaction):
     """
@@ -204,22 +206,8 @@ class MESGraph(nx.DiGraph):
     :param Reaction reaction:
     :return bool flag:
     """
-    flag = False
-    for component in self.type_three_errors:
-      if (component.node1==som1) and (component.node2==som2):
-        new_component = cn.PathComponents(node1=som1, 
-                                          node2=som2,
-                                          reactions=component.reactions+[reaction.label])
-        self.type_three_errors.remove(component)
-        self.type_three_errors.append(new_component)
-        flag = True
-        break
-    if not flag:
-      self.type_three_errors.append(cn.PathComponents(node1=som1, 
-                                                      node2=som2,
-                                                      reactions=[reaction.label]))
-      flag = True
-    return flag  
+    return self.type_three_errors.addPathComponent(som1, som2,
+        reaction.label)
 
   def checkTypeThreeError(self, som1, som2, reaction):
     """
@@ -320,11 +308,7 @@ class MESGraph(nx.DiGraph):
       return False
     # elif reduced reaction has exactly one side EmptySet, add type four error
     elif len(reduced_reaction.reactants)==0 or len(reduced_reaction.products)==0:
-      if reduced_reaction in self.type_four_errors:
-        return False
-      else:
-        self.type_four_errors.append(reduced_reaction)
-        return True
+      return self.type_four_errors.add(reduced_reaction)
     reactant_soms = list({self.getNode(ms.molecule) for ms in reduced_reaction.reactants})
     product_soms = list({self.getNode(ms.molecule) for ms in reduced_reaction.products})
     reactant_stoichiometry = [ms.stoichiometry for ms in reduced_reaction.reactants]
@@ -458,12 +442,10 @@ class MESGraph(nx.DiGraph):
           return False
       # no buffer; add error
       else:
-        if reduced_reaction in self.type_four_errors:
-          return False
-        else:
-          self.type_four_errors.append(reduced_reaction)
+        is_added = self.type_four_errors.add(reduced_reaction)
+        if is_added:
           print("type four error added!", reduced_reaction)
-          return True
+        return is_added
     if product_lessthan_reactant:
       return processPairs(
           pairs=product_lessthan_reactant, 
@@ -478,60 +460,47 @@ class MESGraph(nx.DiGraph):
           idx_big=1, idx_small=0)
     return False
 
-  def addArc(self, arc_source, arc_destination, reaction):
+  def addArc(self, arc_source, arc_destination, reaction, arc=None):
     """
     Add a single arc (edge) using two SOMs and reaction.
+    The molecules that created the arc are recorded as its
+    provenance (cn.ArcProvenance) to explain type II errors.
     :param SOM arc_source:
     :param SOM arc_destination:
     :param Reaction reaction:
+    :param tuple-Molecule arc: source and destination molecules
     """
     # if there is already a preious reaction,
     if self.has_edge(arc_source, arc_destination):
-      reaction_label = self.get_edge_data(arc_source, arc_destination)[cn.REACTION]
+      edge_data = self.get_edge_data(arc_source, arc_destination)
+      reaction_label = edge_data[cn.REACTION]
+      provenance = edge_data.get(cn.PROVENANCE, [])
       # if reaction.label is not already included in the attribute,
       if reaction.label not in set(reaction_label):
         reaction_label = reaction_label + [reaction.label]
     else:
       reaction_label = [reaction.label]
+      provenance = []
+    if arc is not None:
+      record = cn.ArcProvenance(reaction=reaction.label,
+          source=arc[0].name, destination=arc[1].name)
+      if record not in provenance:
+        provenance = provenance + [record]
     # overwrite the edge with new reactions set
-    self.add_edge(arc_source, arc_destination, reaction=reaction_label)
+    self.add_edge(arc_source, arc_destination, reaction=reaction_label,
+        provenance=provenance)
 
   def getSOMPath(self, som, mole1, mole2):
     """
-    Create an undirected graph between
-    two molecules within a SOM
-    and find the shortest path
+    Find the shortest path between
+    two molecules within a SOM, using
+    the equality graph of the SOM
     :param SOM som:
     :param Molecule mole1:
     :param Molecule mole2:
     :return PathComponents som_path:
     """   
-    molecule1 = mole1.name
-    molecule2 = mole2.name
-    # construct undirected graph
-    subg = nx.Graph()
-    # here, every reaction is 1-1 reaction
-    for reaction in list(som.reactions):
-      node1 = reaction.reactants[0].molecule.name
-      node2 = reaction.products[0].molecule.name
-      if subg.has_edge(node1, node2):
-        reaction_label = subg.get_edge_data(node1, node2)[cn.REACTION]
-        # if reaction.label is not already included in the attribute,
-        if reaction.label not in set(reaction_label):
-          reaction_label = reaction_label + [reaction.label]
-      else:
-        reaction_label = [reaction.label]    
-      subg.add_edge(node1, node2, reaction=reaction_label)
-    path = [short_p for short_p in nx.shortest_path(subg, 
-                                                    source=molecule1, 
-                                                    target=molecule2)]
-    som_path = []
-    for idx in range(len(path)-1):
-      edge_reactions = subg.get_edge_data(path[idx], path[idx+1])[cn.REACTION]
-      som_path.append(cn.PathComponents(node1=path[idx], 
-                                     node2=path[idx+1],
-                                     reactions=edge_reactions))
-    return som_path
+    return som.getEqualityPath(mole1.name, mole2.name)
 
   def printSOMPath(self, molecule_name1, molecule_name2):
     """
@@ -575,23 +544,9 @@ class MESGraph(nx.DiGraph):
     :param Reaction reaction:
     :return bool flag:
     """
-    flag = False
-    for component in self.type_one_errors:
-      if (component.node1==mole1.name) and (component.node2==mole2.name):
-        new_component = cn.PathComponents(node1=mole1.name, 
-                                          node2=mole2.name,
-                                          reactions=component.reactions+[reaction.label])
-        self.type_one_errors.remove(component)
-        self.type_one_errors.append(new_component)
-        flag = True
-        break
-    if not flag:
-      self.type_one_errors.append(cn.PathComponents(node1=mole1.name, 
-                                                    node2=mole2.name,
-                                                    reactions=[reaction.label]))
-      flag = True
-    return flag
-
+    return self.type_one_errors.addPathComponent(mole1.name, mole2.name,
+        reaction.label)
+  
   def checkTypeOneError(self, arc, inequality_reaction=None):
     """
     Check Type I Error of an arc.
@@ -610,55 +565,33 @@ class MESGraph(nx.DiGraph):
     else:
       return False
 
-  def addTypeTwoError(self, cycle):
+  def getArcExplanation(self, som1, som2):
     """
-    Add Type II Error components to self.type_two_errors
-    which is a list of lists
-    All components of resulting PathComponents are str
-    :param list-SOM cycle:
+    Finds the molecules and reactions that created the arc
+    from som1 to som2, using the provenance of the arc.
+    :param SOM som1:
+    :param SOM som2:
+    :return PathComponents: node1, node2 and reactions are lists
+        whose elements match by index
     """
-    # exceptionally, here PathComponents are
-    # node1=[], node2=[], reactions=[] and their index
-    # of each component will match. All elements within nodes
-    # are in the same SOM
-    error_cycle = []
-    for node_idx in range(len(cycle)-1):
-      som1 = cycle[node_idx]
-      som2 = cycle[node_idx+1]
-      som1_moles = {mole.name for mole in list(som1.molecules)}
-      som2_moles = {mole.name for mole in list(som2.molecules)}
-      reactions = self.get_edge_data(som1, som2)[cn.REACTION]
-      # all reactions (in an edge), should create a single PathComponent
-      nodes1 = []
-      nodes2 = []
-      reaction_labels = []
-      for r in reactions:
-        reaction = self.simple.getReaction(r)
-        if reaction.category == cn.REACTION_n_1:
-          sources = {r.molecule.name for r in reaction.reactants}
-          destinations = {p.molecule.name for p in reaction.products}
-        elif reaction.category == cn.REACTION_1_n:
-          sources = {p.molecule.name for p in reaction.products}
-          destinations = {r.molecule.name for r in reaction.reactants}
-        # for any reaction that addes arcs, len(nodes2)==1
-        node2 = list(destinations.intersection(som2_moles))[0]
-        for node1 in list(sources.intersection(som1_moles)):
-          nodes1.append(node1)
-          nodes2.append(node2)
-          reaction_labels.append(reaction.label)
-    error_cycle.append(cn.PathComponents(node1=nodes1, 
-                                         node2=nodes2,
-                                         reactions=reaction_labels))
-    som1 = cycle[-1]
-    som2 = cycle[0]
-    som1_moles = {mole.name for mole in list(som1.molecules)}
-    som2_moles = {mole.name for mole in list(som2.molecules)}
-    reactions = self.get_edge_data(som1, som2)[cn.REACTION]
+    edge_data = self.get_edge_data(som1, som2)
+    records = collections.OrderedDict()  # key: reaction label
+    for record in edge_data.get(cn.PROVENANCE, []):
+      records.setdefault(record.reaction, []).append(record)
     # all reactions (in an edge), should create a single PathComponent
     nodes1 = []
     nodes2 = []
     reaction_labels = []
-    for r in reactions:
+    for r in edge_data[cn.REACTION]:
+      if r in records:
+        for record in records[r]:
+          nodes1.append(record.source)
+          nodes2.append(record.destination)
+          reaction_labels.append(r)
+        continue
+      # Arcs added with SOMs have no provenance
+      som1_moles = {mole.name for mole in list(som1.molecules)}
+      som2_moles = {mole.name for mole in list(som2.molecules)}
       reaction = self.simple.getReaction(r)
       if reaction.category == cn.REACTION_n_1:
         sources = {r.molecule.name for r in reaction.reactants}
@@ -666,16 +599,29 @@ class MESGraph(nx.DiGraph):
       elif reaction.category == cn.REACTION_1_n:
         sources = {p.molecule.name for p in reaction.products}
         destinations = {r.molecule.name for r in reaction.reactants}
-        # for any reaction that addes arcs, len(nodes2)==1
+      # for any reaction that addes arcs, len(nodes2)==1
       node2 = list(destinations.intersection(som2_moles))[0]
       for node1 in list(sources.intersection(som1_moles)):
         nodes1.append(node1)
         nodes2.append(node2)
         reaction_labels.append(reaction.label)
-    error_cycle.append(cn.PathComponents(node1=nodes1, 
-                                        node2=nodes2,
-                                        reactions=reaction_labels))
-    self.type_two_errors.append(error_cycle)  
+    return cn.PathComponents(node1=nodes1, node2=nodes2,
+        reactions=reaction_labels)
+
+  def addTypeTwoError(self, cycle):
+    """
+    Add Type II Error components to self.type_two_errors
+    which is a list of lists
+    All components of resulting PathComponents are str
+    :param list-SOM cycle:
+    """
+    # exceptionally, here PathComponents are
+    # node1=[], node2=[], reactions=[] and their index
+    # of each component will match. All elements within nodes
+    # are in the same SOM
+    error_cycle = [self.getArcExplanation(som1, som2)
+        for som1, som2 in zip(cycle, cycle[1:] + cycle[:1])]
+    self.type_two_errors.append(error_cycle)
 
   def checkTypeTwoError(self):
     """
@@ -737,9 +683,11 @@ class MESGraph(nx.DiGraph):
         cn.REACTION_n_n: self.addMultiMultiReaction,
         }
     # Process each type of reaction
+    reaction_groups = Reaction.groupByCategory(reactions,
+        categories=reaction_dic.keys())
     for category in reaction_dic.keys():
-      for reaction in [r for r in reactions if r.category == category]:
-        func = reaction_dic[category]
+      func = reaction_dic[category]
+      for reaction in reaction_groups[category]:
         func(reaction)
     #
     self.checkTypeTwoError()    
@@ -811,8 +759,9 @@ class MESGraph(nx.DiGraph):
         if sum(flag_loop)==0:
           break
         # if at least one was processed, subset unpressed reactions
-        self.multimulti_reactions = [self.multimulti_reactions[idx] for idx, tr \
-                                     in enumerate(flag_loop) if not tr]
+        self.multimulti_reactions = ErrorCollector(
+            errors=[self.multimulti_reactions[idx] for idx, tr \
+                    in enumerate(flag_loop) if not tr])
       # check SOM cycles (type V error)
       self.checkTypeFiveError()
       # if len(self.type_three_errors)==0 and \
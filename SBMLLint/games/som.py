@@ -6,6 +6,7 @@ from SBMLLint.common.reaction import Reaction
 from SBMLLint.common.simple_sbml import SimpleSBML
 
 from collections import deque
+import networkx as nx
 
 BRACKET_OPEN = "{"
 BRACKET_CLOSE = "}"
@@ -25,6 +26,12 @@ class SOM(object):
     self.molecules = molecules
     self.reactions = reactions
     self.identifier = self.makeId()
+    # Undirected graph of the uni-uni reactions in the SOM
+    self._equality_graph = None
+    self._num_graph_reactions = None
+    # Shortest paths, key: source molecule name,
+    # value: dict of paths keyed by target molecule name
+    self._equality_paths = {}
 
   def __repr__(self):
     return self.identifier        
@@ -59,3 +66,57 @@ class SOM(object):
     new_som = SOM(molecules=new_molecules, reactions=new_reactions)
     return new_som
 
+  def getEqualityGraph(self):
+    """
+    Creates an undirected graph whose nodes are molecule names
+    and whose edges are the uni-uni reactions of the SOM.
+    The graph is built once and rebuilt only if
+    reactions were added to the SOM.
+    :return networkx.Graph:
+    """
+    if (self._equality_graph is None) or  \
+        (self._num_graph_reactions != len(self.reactions)):
+      graph = nx.Graph()
+      # here, every reaction is 1-1 reaction
+      for reaction in list(self.reactions):
+        node1 = reaction.reactants[0].molecule.name
+        node2 = reaction.products[0].molecule.name
+        if graph.has_edge(node1, node2):
+          reaction_label = graph.get_edge_data(node1, node2)[cn.REACTION]
+          # if reaction.label is not already included in the attribute,
+          if reaction.label not in set(reaction_label):
+            reaction_label = reaction_label + [reaction.label]
+        else:
+          reaction_label = [reaction.label]
+        graph.add_edge(node1, node2, reaction=reaction_label)
+      self._equality_graph = graph
+      self._num_graph_reactions = len(self.reactions)
+      self._equality_paths = {}
+    return self._equality_graph
+
+  def getEqualityPath(self, molecule_name1, molecule_name2):
+    """
+    Finds the shortest path of uni-uni reactions
+    between two molecules of the SOM.
+    All shortest paths from molecule_name1 are found
+    by a single breadth first search and reused.
+    :param str molecule_name1:
+    :param str molecule_name2:
+    :return list-PathComponents: som_path
+    """
+    graph = self.getEqualityGraph()
+    if molecule_name1 not in self._equality_paths:
+      self._equality_paths[molecule_name1] =  \
+          nx.single_source_shortest_path(graph, molecule_name1)
+    paths = self._equality_paths[molecule_name1]
+    if molecule_name2 not in paths:
+      raise nx.NetworkXNoPath("No path between %s and %s." % (
+          molecule_name1, molecule_name2))
+    path = paths[molecule_name2]
+    som_path = []
+    for idx in range(len(path)-1):
+      edge_reactions = graph.get_edge_data(path[idx], path[idx+1])[cn.REACTION]
+      som_path.append(cn.PathComponents(node1=path[idx],
+                                        node2=path[idx+1],
+                                        reactions=edge_reactions))
+    return som_path
@@ -18,7 +18,7 @@ INDENT = "  "
 
 
 MoietyComparatorResult = collections.namedtuple('MoietyComparatorResult',
-    'num_reactions num_imbalances report')
+    'num_reactions num_imbalances report imbalanced_reactions')
 
 
 class MoietyComparator(object):
@@ -178,12 +178,14 @@ class MoietyComparator(object):
       simple = SimpleSBML()
       simple.initialize(model_reference)
     num_imbalances = 0
+    imbalanced_reactions = []
     report = NULL_STR
     for reaction in simple.reactions:
       comparator = cls(reaction.reactants, reaction.products)
       stg = comparator.reportDifference()
       if len(stg) > 0:
         num_imbalances += 1
+        imbalanced_reactions.append(reaction.label)
         report = "%s\n***%s\n%s" % (
             report, 
             reaction.getId(is_include_kinetics=False),
@@ -195,5 +197,6 @@ class MoietyComparator(object):
     result = MoietyComparatorResult(
         num_reactions=num_reactions,
         num_imbalances=num_imbalances,
-        report=report)
+        report=report,
+        imbalanced_reactions=imbalanced_reactions)
     return result
@@ -10,7 +10,10 @@ from SBMLLint.common.reaction import Reaction
 from SBMLLint.tools import sbmllint
 from SBMLLint.tools import print_reactions
 
+import json
+import multiprocessing
 import os
+import shutil
 import numpy as np
 import pandas as pd
 
@@ -18,6 +21,22 @@ import pandas as pd
 OUTPUT_FILE = "analyze_moiety_analysis.csv"
 DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(DIR, OUTPUT_FILE)
+SHARD_DIR_SUFFIX = "_shards"
+MANIFEST_FILE = "manifest.json"
+# Columns only used in shard files
+MODEL_NUMBER = "model_number"
+IS_ERROR = "is_error"
+SHARD_COLUMNS = [MODEL_NUMBER, cn.FILENAME, cn.IS_STRUCTURED,
+    cn.NUM_BOUNDARY_REACTIONS, cn.TOTAL_REACTIONS,
+    cn.NUM_IMBALANCED_REACTIONS, IS_ERROR]
+# Keys of a shard
+SHARD_INITIAL = "initial"
+SHARD_FINAL = "final"
+SHARD_PATH = "path"
+SHARD_DATA_DIR = "data_dir"
+SHARD_REPORT_INTERVAL = "report_interval"
+SHARD_REPORT_PROGRESS = "report_progress"
+SHARD_MODEL_ITERATOR = "model_iterator"
 # Miscellaneous
 EXCLUDE_PREFIX = ["node", "x", "species"]
 EXCLUDE_SUFFIX = ["prime", "mrna", "prot"]
@@ -47,79 +66,255 @@ def isStructuredName(name):
     return False
   return True
 
+def _makeRow(item):
+  """
+  Calculates the statistics of one model.
+  :param IteratorItem item:
+  :return dict: key: column, value: list with one value
+  """
+  row = {MODEL_NUMBER: [item.number],
+         cn.FILENAME: [item.filename], 
+         cn.IS_STRUCTURED: [False], 
+         cn.NUM_BOUNDARY_REACTIONS: [0],
+         cn.TOTAL_REACTIONS: [0],
+         cn.NUM_IMBALANCED_REACTIONS: [0],
+         IS_ERROR: [False],
+         }
+  simple = simple_sbml.SimpleSBML()
+  try:
+    simple.initialize(item.model)
+  except:
+    row[IS_ERROR] = [True]
+    return row
+  for reaction in simple.reactions:
+    if (len(reaction.reactants) == 0) or (len(reaction.products) == 0):
+        row[cn.NUM_BOUNDARY_REACTIONS] =  \
+            [row[cn.NUM_BOUNDARY_REACTIONS][0] + 1]
+    molecules = util.uniqueify([m.molecule 
+        for m in set(reaction.reactants).union(reaction.products)])
+    if any([isStructuredName(m.name) for m in molecules]):
+        row[cn.IS_STRUCTURED] = [True]
+  try:
+    mcr = sbmllint.lint(model_reference=item.model, is_report=False,
+        mass_balance_check=cn.MOIETY_ANALYSIS)
+    row[cn.TOTAL_REACTIONS] = [mcr.num_reactions if mcr.num_reactions > 0 else np.nan]
+    row[cn.NUM_IMBALANCED_REACTIONS] = [mcr.num_imbalances]
+  except:
+    row[cn.TOTAL_REACTIONS] = [None]
+    row[cn.NUM_IMBALANCED_REACTIONS] = [0]
+  return row
+
+def _truncatePartialLine(shard_path):
+  """
+  Removes a last line that was not completely written, as happens
+  when a run is interrupted while appending to a shard file.
+  :param str shard_path:
+  """
+  with open(shard_path, "rb+") as fd:
+    content = fd.read()
+    if (len(content) == 0) or content.endswith(b"\n"):
+      return
+    fd.truncate(content.rfind(b"\n") + 1)
+
+def _getCompletedNumbers(shard_path):
+  """
+  Model numbers already written to a shard file.
+  :param str shard_path:
+  :return set-int:
+  """
+  if not os.path.isfile(shard_path):
+    return set()
+  _truncatePartialLine(shard_path)
+  try:
+    df = pd.read_csv(shard_path)
+  except pd.errors.EmptyDataError:
+    return set()
+  return set(df[MODEL_NUMBER].tolist())
+
+def _processShard(shard):
+  """
+  Appends the statistics of the models in a shard that are not
+  yet in its shard file. Runs in a worker process.
+  :param dict shard: SHARD_* keys
+  :return int: number of models processed
+  """
+  shard_path = shard[SHARD_PATH]
+  completed = _getCompletedNumbers(shard_path)
+  if shard[SHARD_MODEL_ITERATOR] is None:
+    sbmliter = simple_sbml.modelIterator(initial=shard[SHARD_INITIAL],
+        final=shard[SHARD_FINAL], data_dir=shard[SHARD_DATA_DIR],
+        exclude=completed)
+  else:
+    sbmliter = shard[SHARD_MODEL_ITERATOR]
+  rows = []
+  num_processed = 0
+  def appendRows():
+    if len(rows) == 0:
+      return
+    df = pd.concat([pd.DataFrame(r) for r in rows])
+    is_header = not os.path.isfile(shard_path)
+    df.to_csv(shard_path, mode="a", header=is_header, index=False)
+    del rows[:]
+  #
+  for item in sbmliter:
+    if item.number in completed:
+      continue
+    if shard[SHARD_REPORT_PROGRESS]:
+      print("*Processing file %s, number %d"
+           % (item.filename, item.number))
+    row = _makeRow(item)
+    if row[IS_ERROR][0] and shard[SHARD_REPORT_PROGRESS]:
+      print("  Error in model number %d." % item.number)
+    rows.append(row)
+    num_processed += 1
+    if len(rows) >= shard[SHARD_REPORT_INTERVAL]:
+      appendRows()
+  appendRows()
+  return num_processed
+
+def _makeShards(initial, final, num_shard, shard_dir, data_dir,
+    report_interval, report_progress):
+  """
+  Splits the range of models into contiguous shards.
+  :return list-dict:
+  """
+  size, remainder = divmod(max(final - initial, 0), num_shard)
+  shards = []
+  start = initial
+  for idx in range(num_shard):
+    end = start + size + (1 if idx < remainder else 0)
+    shards.append({
+        SHARD_INITIAL: start,
+        SHARD_FINAL: end,
+        SHARD_PATH: os.path.join(shard_dir, "shard_%d.csv" % idx),
+        SHARD_DATA_DIR: data_dir,
+        SHARD_REPORT_INTERVAL: report_interval,
+        SHARD_REPORT_PROGRESS: report_progress,
+        SHARD_MODEL_ITERATOR: None,
+        })
+    start = end
+  return shards
+
+def _writeManifest(shard_dir, manifest, is_resume):
+  """
+  Writes the manifest of a run, or verifies that a resumed
+  run has the same parameters.
+  :param str shard_dir:
+  :param dict manifest:
+  :param bool is_resume:
+  """
+  path = os.path.join(shard_dir, MANIFEST_FILE)
+  if is_resume and os.path.isfile(path):
+    with open(path, "r") as fd:
+      old_manifest = json.load(fd)
+    if old_manifest != manifest:
+      raise ValueError(
+          "%s was created by a run with different parameters. %s"
+          % (shard_dir, "Use is_resume=False to start over."))
+    return
+  with open(path, "w") as fd:
+    json.dump(manifest, fd, indent=2)
+
+def mergeShards(shard_paths, out_path=OUTPUT_PATH, min_frc=-1):
+  """
+  Merges the shard files into the final statistics.
+  :param list-str shard_paths:
+  :param str out_path: Path to the output CSV file
+  :param float min_frc: Filter to select only those models
+      that have at least the specified fraction of reactions
+      balanced according to moiety_analysis
+  :return pd.DataFrame:
+  """
+  dfs = [pd.read_csv(p) for p in shard_paths
+      if os.path.isfile(p) and os.path.getsize(p) > 0]
+  if len(dfs) == 0:
+    dfs = [pd.DataFrame({c: [] for c in SHARD_COLUMNS}).astype(
+        {IS_ERROR: bool})]
+  df_count = pd.concat(dfs)
+  df_count = df_count[~df_count[IS_ERROR]]
+  df_count = df_count.sort_values(MODEL_NUMBER)
+  df_count = df_count.drop(columns=[MODEL_NUMBER, IS_ERROR])
+  df_count[cn.NUM_BALANCED_REACTIONS] =  \
+      df_count[cn.TOTAL_REACTIONS]  \
+      - df_count[cn.NUM_IMBALANCED_REACTIONS]
+  denom =  (df_count[cn.TOTAL_REACTIONS] 
+      - df_count[cn.NUM_BOUNDARY_REACTIONS])
+  denom = [np.nan if np.isclose(v, 0) else v for v in denom]
+  df_count[cn.FRAC_BALANCED_REACTIONS] =  \
+      1.0*df_count[cn.NUM_BALANCED_REACTIONS] / denom
+  df_count[cn.FRAC_BOUNDARY_REACTIONS] =  \
+      1.0*df_count[cn.NUM_BOUNDARY_REACTIONS] / (
+      df_count[cn.TOTAL_REACTIONS])
+  if min_frc < 0:
+    df = df_count
+  else:
+    df = df_count[df_count[cn.FRAC_BALANCED_REACTIONS] > min_frc]
+  df = df.sort_values(cn.FRAC_BALANCED_REACTIONS)
+  df.to_csv(out_path, index=False)
+  return df
+
 def calcStats(initial=0, final=50, out_path=OUTPUT_PATH, 
     report_interval=50, report_progress=True, min_frc=-1,
-    data_dir=cn.BIOMODELS_DIR):
+    data_dir=cn.BIOMODELS_DIR, model_iterator=None,
+    num_worker=1, shard_dir=None, is_resume=True, is_keep_shards=False):
   """
   Calculates statistics for structured names.
+  Results are appended to per-shard CSV files in shard_dir as models
+  are processed. An interrupted run resumes after the last model
+  written to each shard. When all shards are complete, they
+  are merged into out_path.
   :param int initial: Index of first model to process
   :param int final: Index of final model to process
   :param str out_path: Path to the output CSV file
-  :param int report_interval: Number of files processed before
-      a report is written
+  :param int report_interval: Number of models processed before
+      their results are appended to the shard file
   :param bool report_progress: report file being processed
   :param float min_frc: Filter to select only those models
       that have at least the specified fraction of reactions
       balanced according to moiety_analysis
+  :param iterator model_iterator: iterator of IteratorItem
+      used instead of the models in data_dir (e.g.,
+      URLDownloader.modelIterator). Processed as a single shard.
+  :param int num_worker: number of worker processes
+  :param str shard_dir: directory of shard files and manifest;
+      default is out_path with SHARD_DIR_SUFFIX
+  :param bool is_resume: continue from existing shard files
+  :param bool is_keep_shards: keep shard_dir after the merge
+  :return pd.DataFrame:
   """
-  def writeDF(dfs):
-    df_count = pd.concat(dfs)
-    df_count[cn.NUM_BALANCED_REACTIONS] =  \
-        df_count[cn.TOTAL_REACTIONS]  \
-        - df_count[cn.NUM_IMBALANCED_REACTIONS]
-    denom =  (df_count[cn.TOTAL_REACTIONS] 
-        - df_count[cn.NUM_BOUNDARY_REACTIONS])
-    denom = [np.nan if np.isclose(v, 0) else v for v in denom]
-    df_count[cn.FRAC_BALANCED_REACTIONS] =  \
-        1.0*df_count[cn.NUM_BALANCED_REACTIONS] / denom
-    df_count[cn.FRAC_BOUNDARY_REACTIONS] =  \
-        1.0*df_count[cn.NUM_BOUNDARY_REACTIONS] / (
-        df_count[cn.TOTAL_REACTIONS])
-    if min_frc < 0:
-      df = df_count
-    else:
-      df = df_count[df_count[cn.FRAC_BALANCED_REACTIONS] > min_frc]
-    df = df.sort_values(cn.FRAC_BALANCED_REACTIONS)
-    df.to_csv(out_path, index=False)
-  #
-  dfs = []
-  sbmliter = simple_sbml.modelIterator(initial=initial, final=final,
-      data_dir=data_dir)
-  for item in sbmliter:
-    if report_progress:
-      print("*Processing file %s, number %d"
-           % (item.filename, item.number))
-    simple = simple_sbml.SimpleSBML()
-    try:
-      simple.initialize(item.model)
-    except:
-      print("  Error in model number %d." % item.number)
-      continue
-    row = {cn.FILENAME: [item.filename], 
-           cn.IS_STRUCTURED: [False], 
-           cn.NUM_BOUNDARY_REACTIONS: [0],
-           cn.TOTAL_REACTIONS: [0],
-           cn.NUM_IMBALANCED_REACTIONS: [0],
-           }
-    for reaction in simple.reactions:
-      if (len(reaction.reactants) == 0) or (len(reaction.products) == 0):
-          row[cn.NUM_BOUNDARY_REACTIONS] =  \
-              [row[cn.NUM_BOUNDARY_REACTIONS][0] + 1]
-      molecules = util.uniqueify([m.molecule 
-          for m in set(reaction.reactants).union(reaction.products)])
-      if any([isStructuredName(m.name) for m in molecules]):
-          row[cn.IS_STRUCTURED] = [True]
-    try:
-      mcr = sbmllint.lint(model_reference=item.model, is_report=False)
-      row[cn.TOTAL_REACTIONS] = [mcr.num_reactions if mcr.num_reactions > 0 else np.nan]
-      row[cn.NUM_IMBALANCED_REACTIONS] = [mcr.num_imbalances]
-    except:
-      row[cn.TOTAL_REACTIONS] = [None]
-      row[cn.NUM_IMBALANCED_REACTIONS] = [0]
-    dfs.append(pd.DataFrame(row))
-    if item.number % report_interval == 0:
-      writeDF(dfs)
-  writeDF(dfs)
+  if shard_dir is None:
+    shard_dir = os.path.splitext(out_path)[0] + SHARD_DIR_SUFFIX
+  if (not is_resume) and os.path.isdir(shard_dir):
+    shutil.rmtree(shard_dir)
+  os.makedirs(shard_dir, exist_ok=True)
+  if model_iterator is not None:
+    num_worker = 1
+  num_shard = max(num_worker, 1)
+  shards = _makeShards(initial, final, num_shard, shard_dir, data_dir,
+      report_interval, report_progress)
+  manifest = {
+      "initial": initial,
+      "final": final,
+      "data_dir": data_dir,
+      "shards": [os.path.basename(s[SHARD_PATH]) for s in shards],
+      }
+  if model_iterator is not None:
+    # The models are not identified by data_dir
+    manifest["data_dir"] = None
+  _writeManifest(shard_dir, manifest, is_resume)
+  if model_iterator is not None:
+    shards[0][SHARD_MODEL_ITERATOR] = model_iterator
+  if num_shard == 1:
+    for shard in shards:
+      _processShard(shard)
+  else:
+    with multiprocessing.Pool(num_shard) as pool:
+      pool.map(_processShard, shards)
+  df = mergeShards([s[SHARD_PATH] for s in shards], out_path=out_path,
+      min_frc=min_frc)
+  if not is_keep_shards:
+    shutil.rmtree(shard_dir)
+  return df
 
 
 if __name__ == '__main__':
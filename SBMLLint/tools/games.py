@@ -1,12 +1,13 @@
 #!/usr/bin/env python
 """
 Runs the GAMES algorithm for a local XML file.
-Usage: games <filepath>
+Usage: games <filepath> [--format text|json|ndjson] [--check]
 """
 
 from SBMLLint.common import constants as cn
 from SBMLLint.common import util
 from SBMLLint.tools import sbmllint
+from SBMLLint.tools import structured_output
 
 import argparse
 
@@ -15,13 +16,24 @@ def main():
   parser.add_argument('xml_file', type=open, help='SBML file')
   parser.add_argument('--config', type=open,
       help="SBMLLint configuration file")
+  parser.add_argument('--format', choices=cn.OUTPUT_FORMATS,
+      default=cn.FORMAT_TEXT,
+      help="Output format; ndjson writes one line per model")
+  parser.add_argument('--check', action='store_true',
+      help="Stop at the first error and report only that error")
   args = parser.parse_args()
-  for fid in util.getNextFid(args.xml_file):
+  mode = cn.MODE_CHECK if args.check else cn.MODE_REPORT
+  is_print = args.format == cn.FORMAT_TEXT
+  for fid in util.getNextFid(args.xml_file, is_print=is_print):
     util.runFunction(sbmllint.lint, kwargs={
         "model_reference": fid,
         "mass_balance_check": cn.GAMES,
         "config_fid": args.config,
-        })
+        "output_format": args.format,
+        "mode": mode,
+        },
+        output_format=args.format,
+        model_name=structured_output.getModelName(fid))
 
 
 if __name__ == '__main__':
@@ -6,28 +6,66 @@ inconsistencies.
 
 from SBMLLint.common import constants as cn
 from SBMLLint.common import simple_sbml
-from SBMLLint.common import stoichiometry_matrix
 from SBMLLint.common import util
+from SBMLLint.tools import structured_output
 
 import argparse
 import sys
+import time
 
 
-def LPAnalysis(fid, is_report=False):
+def LPAnalysis(fid, is_report=False, file_out=sys.stdout,
+    output_format=cn.FORMAT_TEXT, is_decompose=False, num_worker=1,
+    is_check=False):
   """
-  Does LP analysis for a simple model.
+  Does LP analysis for a simple model. If the model is not
+  consistent, the species that cannot have a positive mass
+  are reported (except with is_check).
   :param IOStream fid: XML file
-  :param bool: True if model is stoichiometric consistent.
+  :param bool is_report: report optimization warnings
+  :param TextIOWrapper file_out: stream for structured output
+  :param str output_format: cn.FORMAT_TEXT, cn.FORMAT_JSON, cn.FORMAT_NDJSON
+  :param bool is_decompose: solve connected components separately
+  :param int num_worker: processes for solving components
+  :param bool is_check: stop at the first inconsistent component
+      and report its reactions that cause the inconsistency
+  :return bool: True if model is stoichiometric consistent.
   """
+  from SBMLLint.common import stoichiometry_matrix
+  start_time = time.time()
+  model_name = structured_output.getModelName(fid)
   simple = simple_sbml.SimpleSBML()
   simple.initialize(fid)
+  timings = {"parse": time.time() - start_time}
   sm_matrix = stoichiometry_matrix.StoichiometryMatrix(
       simple=simple)
-  is_consistent = sm_matrix.isConsistent(is_report_warning=is_report)
-  if is_consistent:
+  is_consistent = sm_matrix.isConsistent(is_report_warning=is_report,
+      is_decompose=is_decompose, num_worker=num_worker,
+      is_fail_fast=is_check)
+  unconserved_species = None
+  if not (is_consistent or is_check):
+    unconserved_species = sm_matrix.getUnconservedSpecies()
+  timings["analysis"] = time.time() - start_time - timings["parse"]
+  if output_format != cn.FORMAT_TEXT:
+    kwargs = {}
+    if is_check:
+      kwargs[cn.RESULT_REACTIONS] = sm_matrix.inconsistent_reactions
+    else:
+      kwargs[cn.RESULT_UNCONSERVED_SPECIES] = unconserved_species
+    result = structured_output.makeResult(cn.LP_ANALYSIS,
+        model_name, len(sm_matrix.reactions), timings,
+        is_consistent=bool(is_consistent),
+        num_species=len(sm_matrix.molecules), **kwargs)
+    structured_output.writeResult(result, file_out=file_out,
+        output_format=output_format)
+  elif is_consistent:
     print("Model is consistent.")
+  elif is_check:
+    print("Model is NOT consistent: reactions %s"
+        % ", ".join(sm_matrix.inconsistent_reactions))
   else:
     print("Model is NOT consistent!")
+    print("Unconserved species: %s" % ", ".join(sorted(unconserved_species)))
   return is_consistent
 
 def main():
@@ -46,11 +84,27 @@ def main():
       type=str2Bool,
       help="Print warnings if ill-formed matrix True or False",
       default = ['True'])
+  parser.add_argument('--format', choices=cn.OUTPUT_FORMATS,
+      default=cn.FORMAT_TEXT,
+      help="Output format; ndjson writes one line per model")
+  parser.add_argument('--decompose', action='store_true',
+      help="Solve the connected components of the model separately")
+  parser.add_argument('--num_worker', type=int, default=1,
+      help="Number of processes for solving components")
+  parser.add_argument('--check', action='store_true',
+      help="Stop at the first inconsistent component and report it")
   args = parser.parse_args()
-  for fid in util.getNextFid(args.xml_fid):
+  is_print = args.format == cn.FORMAT_TEXT
+  for fid in util.getNextFid(args.xml_fid, is_print=is_print):
     util.runFunction(LPAnalysis,
         pargs=[fid], 
-        kwargs={"is_report": args.report_warnings[0]},
+        kwargs={"is_report": args.report_warnings[0],
+                "output_format": args.format,
+                "is_decompose": args.decompose,
+                "num_worker": args.num_worker,
+                "is_check": args.check},
+        output_format=args.format,
+        model_name=structured_output.getModelName(fid),
         )
 
 
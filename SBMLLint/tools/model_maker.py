@@ -15,13 +15,18 @@ TODO:
    from longest to shortest.
 """
 
-import pandas as pd
+import re
 import sys
 
 EXTRANEOUS = ["+", "->", "-", "(", ")", "*", "\n", ";", ","]
 UNDERSCORE = "_"
 DOUBLEUNDERSCORE = "__"
 IGNORE_SYMBOLS = ["pow", "/"]
+LABEL_SEPARATOR = ":"
+# Symbols are delimited by whitespace, the extraneous strings,
+# reaction labels and assignments
+TOKEN_PATTERN = re.compile(r"[^\s%s]+" % re.escape(
+    "".join(sorted(set("".join(EXTRANEOUS) + LABEL_SEPARATOR + "=")))))
 
 class ModelMaker(object):
   """
@@ -35,6 +40,7 @@ class ModelMaker(object):
       str - file path or string of reactions
     """
     self._reaction_strs = self._getReactionstrs(in_arg)
+    self._line_symbols = None  # symbols in each reaction line
     self.symbols = None  # symbols found
     self.model_str = None  # full model
 
@@ -116,19 +122,20 @@ class ModelMaker(object):
 
   def replaceSymbols(self, symbol_dict, is_sort=True):
     """
-    Replaces the symbol (key) with its value.
+    Replaces the symbol (key) with its value in a single pass.
+    Only whole symbols are replaced, and replacements are not
+    themselves replaced.
     :param dict symbol_dict:
-    :param bool is_sort: sort replacement strings by size to
-        avoid substrint replacements
+    :param bool is_sort: not used; kept for compatibility
     Updates self.model_str
     :return str:
     """
-    ser = pd.Series([len(k) for k in symbol_dict.keys()])
-    ser.index = [s for s in symbol_dict.keys()]
-    if is_sort:
-      ser = ser.sort_values(ascending=False)
-    for k in ser.index:
-      self.model_str = self.model_str.replace(k, symbol_dict[k])
+    if self.model_str is None:
+      self.makeModelStr()
+    def replace(match):
+      symbol = match.group(0)
+      return symbol_dict.get(symbol, symbol)
+    self.model_str = TOKEN_PATTERN.sub(replace, self.model_str)
     return self.model_str
 
   def makeModelStr(self):
@@ -156,30 +163,31 @@ class ModelMaker(object):
     :param list-str reaction_strs: List of reaction strings
     :return list-str: list of unique symbols found
     """
-    self.symbols = []
-    #
-    for line in self._reaction_strs:
-      # Remove the reaction label
-      pieces = line.split(":")
-      if len(pieces) == 2:
-        piece = pieces[1]
-      else:
-        piece = pieces[0]
-      for stg in EXTRANEOUS:
-        piece = piece.replace(stg, " ")
-      line_symbols = piece.split(" ")
-      line_symbols = [s for s in line_symbols if len(s) > 0]
-      for sym in line_symbols:
-        try:
-          float(sym)
-        except:
-          self.symbols.append(sym)
-    # Get unique symbols and sort
-    self.symbols = [s for s in set(self.symbols)
-        if not s in IGNORE_SYMBOLS]
-    self.symbols.sort()
+    if self._line_symbols is None:
+      self._line_symbols = [self._tokenize(l) for l in self._reaction_strs]
+    symbols = set([s for l in self._line_symbols for s in l])
+    self.symbols = sorted(symbols.difference(IGNORE_SYMBOLS))
     return self.symbols
 
+  @staticmethod
+  def _tokenize(line):
+    """
+    Finds the symbols in a reaction line, omitting the label
+    and numbers.
+    :param str line:
+    :return list-str:
+    """
+    pieces = line.split(LABEL_SEPARATOR)
+    if len(pieces) == 2:
+      line = pieces[1]
+    symbols = []
+    for sym in TOKEN_PATTERN.findall(line):
+      try:
+        float(sym)
+      except ValueError:
+        symbols.append(sym)
+    return symbols
+
 
 if __name__ == '__main__':
   in_arg = sys.stdin.read()
@@ -1,12 +1,13 @@
 #!/usr/bin/env python
 """
 Runs moiety analysis for a local XML file.
-Usage: moiety_analysis <filepath>
+Usage: moiety_analysis <filepath> [--format text|json|ndjson]
 """
 
 from SBMLLint.common import constants as cn
 from SBMLLint.common import util
 from SBMLLint.tools import sbmllint
+from SBMLLint.tools import structured_output
 
 import argparse
 
@@ -15,13 +16,20 @@ def main():
   parser.add_argument('xml_file', type=open, help='SBML or zip file')
   parser.add_argument('--config', type=open,
       help="SBMLLint configuration file")
+  parser.add_argument('--format', choices=cn.OUTPUT_FORMATS,
+      default=cn.FORMAT_TEXT,
+      help="Output format; ndjson writes one line per model")
   args = parser.parse_args()
-  for fid in util.getNextFid(args.xml_file):
+  is_print = args.format == cn.FORMAT_TEXT
+  for fid in util.getNextFid(args.xml_file, is_print=is_print):
     util.runFunction(sbmllint.lint, kwargs={
         "model_reference": fid,
         "mass_balance_check": cn.MOIETY_ANALYSIS,
         "config_fid": args.config,
-        })
+        "output_format": args.format,
+        },
+        output_format=args.format,
+        model_name=structured_output.getModelName(fid))
 
 
 if __name__ == '__main__':
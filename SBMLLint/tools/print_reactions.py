@@ -7,7 +7,6 @@ from SBMLLint.common import util
 
 import argparse
 import sys
-import libsbml
 
 
 def prettyPrint(model_reference, file_out=sys.stdout, **kwargs):
@@ -16,13 +15,8 @@ def prettyPrint(model_reference, file_out=sys.stdout, **kwargs):
   :param str model_reference: file, xml string, antimony string
   :param dict kwargs: arguments to Reaction.getId
   """
-  xml = util.getXML(model_reference)
-  reader = libsbml.SBMLReader()
-  document = reader.readSBMLFromString(xml)
-  util.checkSBMLDocument(document)
-  model = document.getModel()
   simple = SimpleSBML()
-  simple.initialize(model)
+  simple.initialize(model_reference)
   stgs = []
   for reaction in simple.reactions:
     stg = reaction.getId(**kwargs)
@@ -5,13 +5,12 @@ from SBMLLint.common import config
 from SBMLLint.common import constants as cn
 from SBMLLint.common.simple_sbml import SimpleSBML
 from SBMLLint.common import util
-from SBMLLint.games.games_pp import GAMES_PP
-from SBMLLint.games.games_report import GAMESReport
-from SBMLLint.moiety_analysis.moiety_comparator import MoietyComparator
+from SBMLLint.tools import structured_output
 
+import collections
 import os
 import sys
-import libsbml
+import time
 
 TYPE_I = "type1"
 TYPE_II = "type2"
@@ -19,6 +18,10 @@ TYPE_III = "type3"
 CANCELING = "canceling"
 ECHELON = "echelon"
 GAMES = "games"
+# Result of the check mode. certificate is the error record
+# (GAMESReport.makeErrorRecord) of the first error, or None.
+CheckResult = collections.namedtuple("CheckResult",
+    "is_consistent certificate")
 
 
 def lint(model_reference=None, 
@@ -26,9 +29,13 @@ def lint(model_reference=None,
     mass_balance_check=GAMES,
     config_fid=None,
     is_report=True,
-    implicit_games=False):
+    implicit_games=False,
+    output_format=cn.FORMAT_TEXT,
+    mode=cn.MODE_REPORT):
   """
-  Reports on errors found in a model
+  Reports on errors found in a model.
+  In check mode (cn.MODE_CHECK), GAMES stops at the first error
+  and only that error is reported.
   :param str model_reference: 
       libsbml_model file in
       file, antimony string, xml string
@@ -37,75 +44,164 @@ def lint(model_reference=None,
   :param str mass_balance_check: how check for mass balance
   :param TextIOWrapper config_fid: readable stream
   :param bool is_report: print result
-  :return MoietyComparatorResult/null/None:
+  :param str output_format: cn.FORMAT_TEXT, cn.FORMAT_JSON, cn.FORMAT_NDJSON
+  :param str mode: cn.MODE_REPORT or cn.MODE_CHECK
+  :return MoietyComparatorResult/bool/CheckResult/None:
+      CheckResult in check mode
   """
+  if not mode in cn.LINT_MODES:
+    raise ValueError("Invalid mode: %s" % mode)
+  is_check = mode == cn.MODE_CHECK
+  if is_check and (mass_balance_check != GAMES):
+    raise ValueError("Check mode is only supported for %s." % GAMES)
+  start_time = time.time()
+  model_name = structured_output.getModelName(model_reference)
+  is_structured = output_format != cn.FORMAT_TEXT
   config.setConfiguration(fid=config_fid)
   config_dct = config.getConfiguration()
-  if util.isSBMLModel(model_reference):
-    model = model_reference
-  else:
-    xml = util.getXML(model_reference)
-    reader = libsbml.SBMLReader()
-    document = reader.readSBMLFromString(xml)
-    util.checkSBMLDocument(document)
-    model = document.getModel()
-  #
   simple = SimpleSBML()
-  simple.initialize(model)
+  if config_dct[cn.CFG_STREAM_SBML]:
+    simple.initializeFromStream(model_reference)
+  else:
+    simple.initialize(model_reference)
+  timings = {"parse": time.time() - start_time}
   if mass_balance_check==cn.MOIETY_ANALYSIS:
+    from SBMLLint.moiety_analysis.moiety_comparator import MoietyComparator
     result = MoietyComparator.analyzeReactions(simple)
-    if is_report:
+    timings["analysis"] = time.time() - start_time - timings["parse"]
+    if is_report and is_structured:
+      structured_result = structured_output.makeResult(cn.MOIETY_ANALYSIS,
+          model_name, result.num_reactions, timings,
+          num_imbalances=result.num_imbalances,
+          imbalanced_reactions=result.imbalanced_reactions)
+      structured_output.writeResult(structured_result, file_out=file_out,
+          output_format=output_format)
+    elif is_report:
       for line in result.report.split('\n'):
           file_out.write("%s\n" % line)
     return result
   elif mass_balance_check == GAMES:
+    from SBMLLint.games.games_pp import GAMES_PP
+    from SBMLLint.games.games_report import GAMESReport, writeComponentReport
     if implicit_games:
-      for ignored in config_dct[cn.CFG_IGNORED_MOLECULES]:
-        simple = removeIgnored(simple, ignored)
-    m = GAMES_PP(simple)
-    games_result = m.analyze(simple.reactions)
-    if games_result and is_report:
-      gr = GAMESReport(m, explain_threshold=config_dct[cn.CFG_GAMES_THRESHOLD])
-      errortype_dic = {TYPE_I: gr.reportTypeOneError,
-                       TYPE_II: gr.reportTypeTwoError,
-                       TYPE_III: gr.reportTypeThreeError,
-                       CANCELING: gr.reportCancelingError,
-                       ECHELON: gr.reportEchelonError
-                      }
-      for errors in m.error_summary:
-        for category in errortype_dic.keys():
-          if errors.type == category:
-            func = errortype_dic[category]            
-            report, _ = func(errors.errors, explain_details=True)
-            print(report)
+      simple = removeIgnored(simple, config_dct[cn.CFG_IGNORED_MOLECULES])
+    if config_dct[cn.CFG_DECOMPOSE_COMPONENTS]:
+      games_result, games_pps = GAMES_PP.analyzeComponents(simple,
+          suppress_message=is_structured or is_check,
+          memory_limit=config_dct[cn.CFG_GAMES_MEMORY_LIMIT],
+          fail_fast=is_check)
+    else:
+      m = GAMES_PP(simple)
+      games_result = m.analyze(simple.reactions,
+          suppress_message=is_structured or is_check,
+          memory_limit=config_dct[cn.CFG_GAMES_MEMORY_LIMIT],
+          fail_fast=is_check)
+      games_pps = [m]
+    timings["analysis"] = time.time() - start_time - timings["parse"]
+    if is_check:
+      certificate = None
+      if games_result:
+        # The analysis stopped at the component with the error
+        m = games_pps[-1]
+        summary = m.error_summary[0]
+        gr = GAMESReport(m, explain_threshold=config_dct[cn.CFG_GAMES_THRESHOLD])
+        certificate = gr.makeErrorRecord(summary.type, summary.errors[0])
+      result = CheckResult(is_consistent=not games_result,
+          certificate=certificate)
+      if is_report:
+        writeCheckResult(result, model_name,
+            sum([len(m.reactions) for m in games_pps]), timings,
+            file_out=file_out, output_format=output_format)
+      return result
+    if is_report and is_structured:
+      errors = []
+      for m in games_pps:
+        gr = GAMESReport(m, explain_threshold=config_dct[cn.CFG_GAMES_THRESHOLD])
+        for summary in m.error_summary:
+          errors = errors + [gr.makeErrorRecord(summary.type, e)
+              for e in summary.errors]
+      structured_result = structured_output.makeResult(cn.GAMES,
+          model_name, sum([len(m.reactions) for m in games_pps]), timings,
+          is_consistent=not games_result,
+          errors=errors)
+      structured_output.writeResult(structured_result, file_out=file_out,
+          output_format=output_format)
+    elif games_result and is_report:
+      writeComponentReport(games_pps, file_out=file_out,
+          explain_threshold=config_dct[cn.CFG_GAMES_THRESHOLD],
+          explain_details=True,
+          max_errors=config_dct[cn.CFG_GAMES_MAX_ERRORS],
+          max_explained_errors=config_dct[cn.CFG_GAMES_MAX_EXPLAINED_ERRORS])
     return games_result
   else:
     print ("Specified method doesn't exist")
     return None
 
+def writeCheckResult(result, model_name, num_reactions, timings,
+    file_out=sys.stdout, output_format=cn.FORMAT_TEXT):
+  """
+  Writes the result of the check mode.
+  :param CheckResult result:
+  :param str model_name:
+  :param int num_reactions: reactions analyzed
+  :param dict timings: key: step, value: elapsed seconds
+  :param TextIOWrapper file_out:
+  :param str output_format: cn.FORMAT_TEXT, cn.FORMAT_JSON, cn.FORMAT_NDJSON
+  """
+  if output_format != cn.FORMAT_TEXT:
+    errors = []
+    if result.certificate is not None:
+      errors = [result.certificate]
+    structured_result = structured_output.makeResult(cn.GAMES,
+        model_name, num_reactions, timings,
+        is_consistent=result.is_consistent,
+        errors=errors)
+    structured_output.writeResult(structured_result, file_out=file_out,
+        output_format=output_format)
+  elif result.is_consistent:
+    file_out.write("Model is consistent.\n")
+  else:
+    file_out.write("Model is NOT consistent: %s error in reactions %s\n"
+        % (result.certificate[cn.RESULT_TYPE],
+        ", ".join(result.certificate[cn.RESULT_REACTIONS])))
+
 def removeIgnored(simple, ignored):
   """
-  Remove an ignored molecule
-  from all reactions in a simpleSBML model.
+  Removes ignored molecules from all reactions in a simpleSBML model
+  in a single pass. The model is not changed: only reactions that
+  contain an ignored molecule are copied, and the others are shared
+  with the model. Molecules and moieties are shared as well.
   :param SimpleSBML simple:
-  :param str ignored: a molecule name
-  :return SimpleSBML:
+  :param str/collection-str ignored: molecule names
+  :return SimpleSBML: view of the model without the ignored molecules
   """
-  modified_reactions = []
-  for r in simple.reactions:
-    modified = False
-    reactant_names = [reactant.molecule.name for reactant in r.reactants]
-    product_names = [product.molecule.name for product in r.products]
-    if ignored in reactant_names:
-      r.reactants = [ms for ms in r.reactants 
-          if ms.molecule.name != ignored]
-      modified = True
-    if ignored in product_names:
-      r.products = [ms for ms in r.products
-           if ms.molecule.name != ignored]
-      modified = True
-    r.identifier = r.makeIdentifier()
-    r.category = r.getCategory()
-    if modified:
-      modified_reactions.append(r)
-  return simple
+  from SBMLLint.common.reaction import Reaction
+  if isinstance(ignored, str):
+    ignored = [ignored]
+  ignored = set(ignored)
+  def isIgnored(m_s):
+    return m_s.molecule.name in ignored
+  #
+  reactions = list(simple.reactions)
+  modified_indices = [idx for idx, r in enumerate(reactions)
+      if any([isIgnored(m_s) for m_s in r.reactants + r.products])]
+  components = [cn.ReactionComponents(label=reactions[idx].label,
+      reactants=[m_s for m_s in reactions[idx].reactants
+          if not isIgnored(m_s)],
+      products=[m_s for m_s in reactions[idx].products
+          if not isIgnored(m_s)])
+      for idx in modified_indices]
+  # Categorize the modified reactions together
+  categories = Reaction.categorize(components)
+  for idx, component, category in zip(modified_indices, components,
+      categories):
+    r = reactions[idx]
+    reactions[idx] = Reaction.makeFromParts(r.label, component.reactants,
+        component.products, kinetics_law=r.kinetics_law,
+        kinetics_terms=r.kinetics_terms, category=category)
+  view = SimpleSBML()
+  view.reactions = reactions
+  view.molecules = simple.molecules
+  view.moietys = simple.moietys
+  view.moiety_registry = simple.moiety_registry
+  return view
@@ -0,0 +1 @@
+python %~dp0sbmllint_serve %1 %2 %3 %4 %5 %6 %7 %8 %9
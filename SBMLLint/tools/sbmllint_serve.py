@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+"""
+Long-running lint server that avoids paying the startup cost
+of python, libsbml and pandas for every model.
+Usage: sbmllint_serve [--socket <path>]
+
+Requests and responses are JSON-RPC 2.0 objects, one per line,
+read from stdin and written to stdout (or exchanged over a
+Unix socket if --socket is given). Supported methods:
+  lint  params: model (path, XML or Antimony string),
+                mass_balance_check (games or moiety_analysis),
+                config (optional path to a configuration file),
+                format (optional, json or text)
+  shutdown
+For example,
+  {"jsonrpc": "2.0", "id": 1, "method": "lint",
+   "params": {"model": "model.xml", "mass_balance_check": "games"}}
+
+Parsed configurations are cached by the config module, and
+results are cached by the model contents, method, configuration
+and format. A batch of requests can be run from another process
+with common.runner.Runner:
+    runner = Runner(path_to_this_module)
+    runner.execute([], "\\n".join(json_requests))
+"""
+
+from SBMLLint.common import constants as cn
+from SBMLLint.tools import sbmllint
+
+import argparse
+import collections
+import contextlib
+import hashlib
+import inspect
+import io
+import json
+import os
+import sys
+
+JSONRPC_VERSION = "2.0"
+METHOD_LINT = "lint"
+METHOD_SHUTDOWN = "shutdown"
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+LINT_ERROR = -32000
+MAX_CACHED_RESULTS = 256
+SERVER_CHECKS = [cn.GAMES, cn.MOIETY_ANALYSIS]
+SERVER_FORMATS = [cn.FORMAT_JSON, cn.FORMAT_TEXT]
+
+
+class LintServer(object):
+  """Answers lint requests, caching results across requests."""
+
+  def __init__(self, max_cached_results=MAX_CACHED_RESULTS):
+    """
+    :param int max_cached_results: size of the result cache
+    """
+    self.max_cached_results = max_cached_results
+    # key: (model digest, method, config, format), value: result
+    self._results = collections.OrderedDict()
+    self.is_shutdown = False
+
+  @staticmethod
+  def _readReference(reference):
+    """
+    Provides the contents of a file reference, or the
+    reference itself if it is not a file.
+    :param str reference:
+    :return str:
+    """
+    if reference is not None and os.path.isfile(reference):
+      with open(reference, "r") as fd:
+        return fd.read()
+    return reference
+
+  def lint(self, model, mass_balance_check=cn.GAMES, config=None,
+      format=cn.FORMAT_JSON):
+    """
+    Lints a model, reusing the result of an identical request.
+    :param str model: path, XML or Antimony string
+    :param str mass_balance_check: cn.GAMES or cn.MOIETY_ANALYSIS
+    :param str config: path to a configuration file
+    :param str format: cn.FORMAT_JSON or cn.FORMAT_TEXT
+    :return dict: structured result, or report for cn.FORMAT_TEXT
+    """
+    if not isinstance(model, str):
+      raise ValueError("model must be a path, XML or Antimony string.")
+    if not mass_balance_check in SERVER_CHECKS:
+      raise ValueError("Invalid mass_balance_check: %s"
+          % mass_balance_check)
+    if not format in SERVER_FORMATS:
+      raise ValueError("Invalid format: %s" % format)
+    model_stg = self._readReference(model)
+    config_stg = self._readReference(config)
+    digest = hashlib.sha1(model_stg.encode("utf-8")).hexdigest()
+    key = (digest, mass_balance_check, config_stg, format)
+    if key in self._results:
+      self._results.move_to_end(key)
+      cached_result = self._results[key]
+    else:
+      cached_result = self._lint(model_stg, mass_balance_check,
+          config_stg, format)
+      self._results[key] = cached_result
+      if len(self._results) > self.max_cached_results:
+        self._results.popitem(last=False)
+    # The cached result is shared by requests for other paths
+    result = dict(cached_result)
+    if (format == cn.FORMAT_JSON) and os.path.isfile(model):
+      result[cn.RESULT_MODEL] = model
+    return result
+
+  @staticmethod
+  def _lint(model_stg, mass_balance_check, config_stg, format):
+    """
+    Lints the contents of a model.
+    :param str model_stg: XML or Antimony string
+    :param str mass_balance_check: cn.GAMES or cn.MOIETY_ANALYSIS
+    :param str config_stg: contents of a configuration file
+    :param str format: cn.FORMAT_JSON or cn.FORMAT_TEXT
+    :return dict:
+    """
+    config_fid = None
+    if config_stg is not None:
+      config_fid = io.StringIO(config_stg)
+    file_out = io.StringIO()
+    if format == cn.FORMAT_JSON:
+      output_format = cn.FORMAT_NDJSON
+    else:
+      output_format = cn.FORMAT_TEXT
+    # Messages written by the analyses must not corrupt the responses
+    with contextlib.redirect_stdout(sys.stderr):
+      sbmllint.lint(model_reference=model_stg,
+          file_out=file_out,
+          mass_balance_check=mass_balance_check,
+          config_fid=config_fid,
+          output_format=output_format)
+    if format == cn.FORMAT_JSON:
+      return json.loads(file_out.getvalue())
+    return {"report": file_out.getvalue()}
+
+  def handle(self, request):
+    """
+    Answers a single JSON-RPC request.
+    :param dict request:
+    :return dict: response
+    """
+    request_id = None
+    if isinstance(request, dict):
+      request_id = request.get("id")
+    def makeError(code, message):
+      return {"jsonrpc": JSONRPC_VERSION, "id": request_id,
+          "error": {"code": code, "message": message}}
+    #
+    if (not isinstance(request, dict)) or (not "method" in request):
+      return makeError(INVALID_REQUEST, "Invalid request.")
+    method = request["method"]
+    params = request.get("params", {})
+    if method == METHOD_SHUTDOWN:
+      self.is_shutdown = True
+      result = True
+    elif method == METHOD_LINT:
+      if not isinstance(params, dict):
+        return makeError(INVALID_PARAMS, "params must be an object.")
+      try:
+        inspect.signature(self.lint).bind(**params)
+      except TypeError as e:
+        return makeError(INVALID_PARAMS, str(e))
+      try:
+        result = self.lint(**params)
+      except SystemExit:
+        return makeError(LINT_ERROR, "Invalid configuration.")
+      except Exception as e:
+        # A model that cannot be analyzed must not end the server
+        return makeError(LINT_ERROR, "%s: %s" % (type(e).__name__, str(e)))
+    else:
+      return makeError(METHOD_NOT_FOUND, "Unknown method: %s" % method)
+    return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+  def handleLine(self, line):
+    """
+    Answers a request serialized as a line of JSON.
+    :param str line:
+    :return str/None: serialized response; None for blank lines
+    """
+    if len(line.strip()) == 0:
+      return None
+    try:
+      request = json.loads(line)
+    except ValueError as e:
+      response = {"jsonrpc": JSONRPC_VERSION, "id": None,
+          "error": {"code": PARSE_ERROR, "message": str(e)}}
+    else:
+      response = self.handle(request)
+    return json.dumps(response)
+
+  def serve(self, file_in=sys.stdin, file_out=sys.stdout):
+    """
+    Answers requests, one per line, until the input ends
+    or a shutdown request is received.
+    :param TextIOWrapper file_in:
+    :param TextIOWrapper file_out:
+    """
+    for line in file_in:
+      response = self.handleLine(line)
+      if response is None:
+        continue
+      file_out.write("%s\n" % response)
+      file_out.flush()
+      if self.is_shutdown:
+        break
+
+  def serveSocket(self, path):
+    """
+    Answers requests on a Unix socket. Each connection
+    sends requests and receives responses one per line.
+    :param str path: path of the socket
+    """
+    import socketserver
+    server = self
+    class Handler(socketserver.StreamRequestHandler):
+      def handle(self):
+        file_in = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        file_out = io.TextIOWrapper(self.wfile, encoding="utf-8")
+        server.serve(file_in=file_in, file_out=file_out)
+    if os.path.exists(path):
+      os.remove(path)
+    with socketserver.UnixStreamServer(path, Handler) as unix_server:
+      while not self.is_shutdown:
+        unix_server.handle_request()
+    os.remove(path)
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Serve lint requests as JSON-RPC.')
+  parser.add_argument('--socket', type=str, default=None,
+      help="Path of a Unix socket; default is stdin/stdout")
+  args = parser.parse_args()
+  server = LintServer()
+  if args.socket is None:
+    server.serve()
+  else:
+    server.serveSocket(args.socket)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,66 @@
+"""
+Machine-readable results of the lint tools.
+
+A result is a dictionary keyed by the cn.RESULT_* constants.
+It is written either as a JSON document (cn.FORMAT_JSON)
+or as a single line (cn.FORMAT_NDJSON) so that batch runs
+produce one line per model as soon as the model is analyzed.
+"""
+
+from SBMLLint.common import constants as cn
+
+import json
+import os
+import sys
+
+
+def getModelName(model_reference):
+  """
+  Finds a name for the model that is used in results.
+  :param str/TextIOWrapper/libsbml.Model model_reference:
+  :return str/None:
+  """
+  if isinstance(model_reference, str):
+    if os.path.isfile(model_reference):
+      return model_reference
+    return None
+  name = getattr(model_reference, "name", None)
+  if isinstance(name, str):
+    return name
+  if "getId" in dir(model_reference):
+    return model_reference.getId()
+  return None
+
+def makeResult(tool, model_name, num_reactions, timings, **kwargs):
+  """
+  Constructs the result for one model.
+  :param str tool: cn.GAMES, cn.MOIETY_ANALYSIS, cn.LP_ANALYSIS
+  :param str model_name:
+  :param int num_reactions:
+  :param dict timings: key: step, value: elapsed seconds
+  :param dict kwargs: tool specific entries
+  :return dict:
+  """
+  result = {
+      cn.RESULT_TOOL: tool,
+      cn.RESULT_MODEL: model_name,
+      cn.RESULT_NUM_REACTIONS: num_reactions,
+      }
+  result.update(kwargs)
+  result[cn.RESULT_TIMINGS] = {k: round(v, 6) for k, v in timings.items()}
+  return result
+
+def writeResult(result, file_out=sys.stdout, output_format=cn.FORMAT_JSON):
+  """
+  Writes a result and flushes the stream.
+  :param dict result:
+  :param TextIOWrapper file_out:
+  :param str output_format: cn.FORMAT_JSON or cn.FORMAT_NDJSON
+  """
+  if output_format == cn.FORMAT_NDJSON:
+    file_out.write("%s\n" % json.dumps(result, separators=(",", ":")))
+  elif output_format == cn.FORMAT_JSON:
+    file_out.write("%s\n" % json.dumps(result, indent=2))
+  else:
+    raise ValueError("Invalid output format: %s" % output_format)
+  file_out.flush()
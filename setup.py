@@ -32,6 +32,8 @@ def doSetup(install_requires):
           'SBMLLint/tools/make_moiety_structure.bat',
           'SBMLLint/tools/print_reactions',
           'SBMLLint/tools/print_reactions.bat',
+          'SBMLLint/tools/sbmllint_serve',
+          'SBMLLint/tools/sbmllint_serve.bat',
           ],
       url='https://github.com/ModelEngineering/SBMLLint',
       description='Linter for SBML models.',
@@ -0,0 +1,85 @@
+"""
+Tests for antimony_parser
+"""
+from SBMLLint.common import antimony_parser
+from SBMLLint.common import constants as cn
+from SBMLLint.common import exceptions
+from SBMLLint.common.simple_sbml import SimpleSBML
+from SBMLLint.common import util
+
+import libsbml
+import os
+import unittest
+
+
+IGNORE_TEST = False
+ANTIMONY_FILE = os.path.join(cn.TEST_DIR, "test_file3.antimony")
+ANTIMONY_STG = '''
+// Reaction list
+model *test()
+  J1: 2Glu + 2 A_P_P_P -> 2Glu_P + A_P_P + A_P_P; k1*Glu
+  $S1 => S2; k2*S1; S2 = 1
+  -> S1; 1  # source
+  species Glu, A_P_P_P
+  Glu = 0
+  k1 = 0.1
+end
+'''
+UNSUPPORTED_STGS = [
+    "A -> B; k*A\nB := 2*A",  # Assignment rule
+    "A -> B; k*A\nat (time > 1): A = 1",  # Event
+    "A -> B; k*(A",  # Bad rate law
+    "A -> B -> C; 1",
+    "A in cell -> B; 1",
+    "model a()\nend\nmodel b()\nend",
+    ]
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+  def testParseReactions(self):
+    if IGNORE_TEST:
+      return
+    reactions = antimony_parser.parseReactions(ANTIMONY_STG)
+    self.assertEqual([r.label for r in reactions], ["J1", "_J0", "_J1"])
+    reaction = reactions[0]
+    self.assertEqual([(m_s.molecule.name, m_s.stoichiometry)
+        for m_s in reaction.reactants], [("Glu", 2), ("A_P_P_P", 2)])
+    self.assertEqual([(m_s.molecule.name, m_s.stoichiometry)
+        for m_s in reaction.products], [("Glu_P", 2), ("A_P_P", 2)])
+    self.assertEqual(reaction.kinetics_law, "k1 * Glu")
+    self.assertEqual(sorted(reaction.kinetics_terms), ["Glu", "k1"])
+    self.assertEqual(reaction.category, reaction.getCategory())
+    self.assertEqual(reactions[1].reactants[0].molecule.name, "S1")
+    self.assertEqual(reactions[2].category, cn.REACTION_BOUNDARY)
+
+  def testParseReactionsUnsupported(self):
+    if IGNORE_TEST:
+      return
+    for stg in UNSUPPORTED_STGS:
+      self.assertIsNone(antimony_parser.parseReactions(stg), stg)
+
+  def testSimpleSBML(self):
+    if IGNORE_TEST:
+      return
+    simple = SimpleSBML()
+    simple.initialize(ANTIMONY_FILE)
+    self.assertEqual(len(simple.reactions), 4)
+    self.assertEqual(sorted([m.name for m in simple.molecules]),
+        ["A", "A_P_P", "A_P_P_P", "Fru", "Glu", "Glu_P"])
+    # Same reactions as the SBML created by Tellurium
+    try:
+      xml = util.getXMLFromAntimony(util.getModelString(ANTIMONY_FILE))
+    except exceptions.MissingTelluriumError:
+      return
+    simple_xml = SimpleSBML()
+    simple_xml.initialize(xml)
+    self.assertEqual([r.identifier for r in simple.reactions],
+        [r.identifier for r in simple_xml.reactions])
+
+
+if __name__ == '__main__':
+  unittest.main()
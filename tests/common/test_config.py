@@ -1,6 +1,7 @@
 from SBMLLint.common import config
 from SBMLLint.common import constants as cn
 
+import io
 import os
 import unittest
 
@@ -42,6 +43,16 @@ class TestFunctions(unittest.TestCase):
     # TESTING
     with self.assertRaises(SystemExit):
       config.setConfiguration(path=TEST_BAD_CONFIG_FILE)
+
+  def testParsedConfigurationsBounded(self):
+    config._parsed_configurations.clear()
+    for idx in range(config.MAX_PARSED_CONFIGURATIONS + 2):
+      fid = io.StringIO("%s: %d" % (cn.CFG_GAMES_THRESHOLD, idx))
+      config.setConfiguration(fid=fid)
+      self.assertEqual(config.getConfiguration()[cn.CFG_GAMES_THRESHOLD],
+          idx)
+    self.assertEqual(len(config._parsed_configurations),
+        config.MAX_PARSED_CONFIGURATIONS)
       
     
 
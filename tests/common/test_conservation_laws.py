@@ -0,0 +1,99 @@
+"""
+Tests for conservation_laws
+"""
+from SBMLLint.common import constants as cn
+from SBMLLint.common import conservation_laws
+from SBMLLint.common.conservation_laws import ConservationLaws
+from SBMLLint.common import exceptions
+from SBMLLint.common.simple_sbml import SimpleSBML
+from SBMLLint.common.stoichiometry_matrix import StoichiometryMatrix
+
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+# E + S -> ES, ES -> E + P, P -> S (all of S, ES and P are one moiety)
+ANTIMONY_STG = '''
+E + S -> ES; k1*E*S
+ES -> E + P; k2*ES
+P -> S; k3*P
+'''
+FRACTION_STG = '''
+A -> 0.5 B; k1*A
+'''
+
+
+#############################
+# Tests
+#############################
+class TestConservationLaws(unittest.TestCase):
+
+  def _getLaws(self, model_reference, **kwargs):
+    simple = SimpleSBML()
+    simple.initialize(model_reference)
+    sm_matrix = StoichiometryMatrix(simple)
+    return sm_matrix, ConservationLaws(sm_matrix, **kwargs)
+
+  def _check(self, sm_matrix, laws):
+    values = sm_matrix.stoichiometry_matrix.loc[laws.molecules].to_numpy(
+        dtype=float)
+    rank = np.linalg.matrix_rank(values)
+    self.assertEqual(laws.rank, rank)
+    self.assertEqual(len(laws), values.shape[0] - rank)
+    if len(laws) == 0:
+      return
+    matrix = laws.getSparseMatrix().toarray()
+    self.assertTrue(np.allclose(matrix.dot(values), 0))
+    self.assertEqual(np.linalg.matrix_rank(matrix), len(laws))
+    for law in laws.laws:
+      for value in law.values():
+        self.assertTrue(isinstance(value, int))
+        self.assertNotEqual(value, 0)
+
+  def testConstructor(self):
+    if IGNORE_TEST:
+      return
+    sm_matrix, laws = self._getLaws(ANTIMONY_STG)
+    self._check(sm_matrix, laws)
+    self.assertEqual(sorted([sorted(l.items()) for l in laws.laws]),
+        [[("E", 1), ("ES", 1)], [("ES", 1), ("P", 1), ("S", 1)]])
+    self.assertEqual(len(laws.getNonNegativeLaws()), 2)
+    self.assertEqual(ConservationLaws.makeLawString({"B": -2, "A": 1}),
+        "A - 2 B")
+    self.assertTrue("E + ES" in str(laws))
+    matrix = laws.getMatrix()
+    self.assertEqual(matrix.shape, (2, 4))
+    self.assertEqual(matrix.loc[:, "ES"].tolist(), [1, 1])
+
+  def testFractions(self):
+    if IGNORE_TEST:
+      return
+    sm_matrix, laws = self._getLaws(FRACTION_STG)
+    self._check(sm_matrix, laws)
+    self.assertEqual(laws.laws, [{"A": 1, "B": 2}])
+
+  def testModels(self):
+    if IGNORE_TEST:
+      return
+    for path in [cn.TEST_FILE3, cn.TEST_FILE4, cn.TEST_FILE6,
+        cn.TEST_FILE12, cn.TEST_FILE_GAMES_PP1]:
+      sm_matrix, laws = self._getLaws(path)
+      self._check(sm_matrix, laws)
+    # Consistent models have non-negative bases
+    sm_matrix, laws = self._getLaws(cn.TEST_FILE3)
+    self.assertEqual(len(laws.getNonNegativeLaws()), len(laws))
+
+  def testLimits(self):
+    if IGNORE_TEST:
+      return
+    with self.assertRaises(exceptions.ConservationLawLimitError):
+      self._getLaws(cn.TEST_FILE3, max_nonzeros=1)
+    with self.assertRaises(exceptions.ConservationLawLimitError):
+      self._getLaws(cn.TEST_FILE3, timeout=0)
+    _, laws = self._getLaws(cn.TEST_FILE3, max_nonzeros=None, timeout=None)
+    self.assertGreater(len(laws), 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
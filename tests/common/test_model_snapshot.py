@@ -0,0 +1,117 @@
+from SBMLLint.common import constants as cn
+from SBMLLint.common import model_snapshot
+from SBMLLint.common.model_snapshot import ModelSnapshot
+from SBMLLint.common.reaction import Reaction
+from SBMLLint.common.simple_sbml import SimpleSBML
+from SBMLLint.common.stoichiometry_matrix import StoichiometryMatrix
+
+import os
+import unittest
+
+
+IGNORE_TEST = False
+TEST_SNAPSHOT_PATH = os.path.join(cn.TEST_DIR, "test_model_snapshot.snap")
+MODEL_FILES = [
+    cn.TEST_FILE,
+    cn.TEST_FILE2,
+    cn.TEST_FILE4,
+    cn.TEST_FILE_GAMES_PP1,
+    cn.TEST_FILE_GAMESREPORT1,
+    os.path.join(cn.TEST_DIR, "test_BIOMD0000000010_url.xml"),
+    ]
+
+
+#############################
+# Tests
+#############################
+class TestModelSnapshot(unittest.TestCase):
+
+  def tearDown(self):
+    if os.path.isfile(TEST_SNAPSHOT_PATH):
+      os.remove(TEST_SNAPSHOT_PATH)
+
+  def makeSnapshot(self, path):
+    simple = SimpleSBML()
+    simple.initialize(path)
+    simple.writeSnapshot(TEST_SNAPSHOT_PATH)
+    new_simple = SimpleSBML()
+    new_simple.initializeFromSnapshot(TEST_SNAPSHOT_PATH)
+    return simple, new_simple
+
+  def testRoundTrip(self):
+    if IGNORE_TEST:
+      return
+    for path in MODEL_FILES:
+      simple, new_simple = self.makeSnapshot(path)
+      self.assertEqual(len(simple.reactions), len(new_simple.reactions))
+      for reaction, new_reaction in zip(simple.reactions,
+          new_simple.reactions):
+        self.assertEqual(reaction.identifier, new_reaction.identifier)
+        self.assertEqual(reaction.category, new_reaction.category)
+        self.assertEqual(reaction.kinetics_law, new_reaction.kinetics_law)
+        self.assertEqual(reaction.kinetics_terms,
+            new_reaction.kinetics_terms)
+      self.assertEqual([m.name for m in simple.molecules],
+          [m.name for m in new_simple.molecules])
+      self.assertEqual([m.name for m in simple.moietys],
+          [m.name for m in new_simple.moietys])
+
+  def testArrays(self):
+    if IGNORE_TEST:
+      return
+    simple, _ = self.makeSnapshot(cn.TEST_FILE2)
+    snapshot = ModelSnapshot(TEST_SNAPSHOT_PATH)
+    self.assertEqual(snapshot.reaction_labels,
+        [r.label for r in simple.reactions])
+    num_reaction = len(simple.reactions)
+    self.assertEqual(len(snapshot.arrays["category_offsets"]),
+        num_reaction + 1)
+    self.assertEqual(len(snapshot.arrays["reactant_offsets"]),
+        num_reaction + 1)
+    for name, array in snapshot.arrays.items():
+      self.assertEqual(array.ctypes.data % model_snapshot.ALIGNMENT, 0)
+    reaction = simple.reactions[0]
+    species = snapshot.species_names
+    reactants = snapshot.arrays["reactant_species"][
+        :snapshot.arrays["reactant_offsets"][1]]
+    self.assertEqual([species[n] for n in reactants],
+        [m_s.molecule.name for m_s in reaction.reactants])
+
+  def testCategory(self):
+    if IGNORE_TEST:
+      return
+    simple = SimpleSBML()
+    simple.initialize(cn.TEST_FILE2)
+    simple.writeSnapshot(TEST_SNAPSHOT_PATH)
+    snapshot = ModelSnapshot(TEST_SNAPSHOT_PATH)
+    # Loaded reactions use the stored categories
+    get_category = Reaction.getCategory
+    def getCategory(_):
+      raise RuntimeError("Reaction was categorized.")
+    Reaction.getCategory = getCategory
+    try:
+      reactions = snapshot.makeReactions()
+    finally:
+      Reaction.getCategory = get_category
+    self.assertEqual([r.category for r in reactions],
+        [r.category for r in simple.reactions])
+
+  def testConsistency(self):
+    if IGNORE_TEST:
+      return
+    for path in [cn.TEST_FILE2, cn.TEST_FILE_GAMES_PP1]:
+      simple, new_simple = self.makeSnapshot(path)
+      self.assertEqual(StoichiometryMatrix(simple).isConsistent(),
+          StoichiometryMatrix(new_simple).isConsistent())
+
+  def testBadFile(self):
+    if IGNORE_TEST:
+      return
+    with open(TEST_SNAPSHOT_PATH, "wb") as fd:
+      fd.write(b"<sbml/>")
+    with self.assertRaises(ValueError):
+      ModelSnapshot(TEST_SNAPSHOT_PATH)
+
+
+if __name__ == '__main__':
+  unittest.main()
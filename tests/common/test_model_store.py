@@ -0,0 +1,113 @@
+from SBMLLint.common import constants as cn
+from SBMLLint.common import simple_sbml
+from SBMLLint.common.model_store import ModelStore, IndexEntry
+from SBMLLint.common import util
+
+import os
+import pickle
+import unittest
+import zipfile
+
+
+IGNORE_TEST = False
+TEST_ZIP_FILENAME = "test_model_store.zip"
+TEST_ZIP_PATH = os.path.join(cn.TEST_DIR, TEST_ZIP_FILENAME)
+MODEL_FILES = [
+    "test_BIOMD0000000010_url.xml",
+    "test_BIOMD0000000145_url.xml",
+    "test_BIOMD0000000147_url.xml",
+    "test_file2.xml",
+    "test_file4.xml",
+    ]
+
+
+def readFile(filename):
+  with open(os.path.join(cn.TEST_DIR, filename), "r") as fd:
+    return fd.read()
+
+
+#############################
+# Tests
+#############################
+class TestModelStore(unittest.TestCase):
+
+  def setUp(self):
+    # Mix compressed and stored entries
+    with zipfile.ZipFile(TEST_ZIP_PATH, "w") as zipper:
+      for num, filename in enumerate(MODEL_FILES):
+        if num % 2 == 0:
+          compression = zipfile.ZIP_DEFLATED
+        else:
+          compression = zipfile.ZIP_STORED
+        zipper.write(os.path.join(cn.TEST_DIR, filename), filename,
+            compress_type=compression)
+    self.store = ModelStore(TEST_ZIP_PATH)
+
+  def tearDown(self):
+    self.store.close()
+    if os.path.isfile(TEST_ZIP_PATH):
+      os.remove(TEST_ZIP_PATH)
+
+  def testConstructor(self):
+    if IGNORE_TEST:
+      return
+    self.assertEqual(len(self.store), len(MODEL_FILES))
+    self.assertEqual(self.store.names, MODEL_FILES)
+    self.assertTrue(isinstance(self.store.index[0], IndexEntry))
+
+  def testGetModelId(self):
+    if IGNORE_TEST:
+      return
+    self.assertEqual(ModelStore.getModelId(MODEL_FILES[0]),
+        "BIOMD0000000010")
+    self.assertIsNone(ModelStore.getModelId("test_file2.xml"))
+
+  def testRead(self):
+    if IGNORE_TEST:
+      return
+    for num, filename in enumerate(MODEL_FILES):
+      self.assertEqual(self.store.read(filename), readFile(filename))
+      self.assertEqual(self.store.read(num), readFile(filename))
+    self.assertEqual(self.store.read("BIOMD0000000147"),
+        readFile(MODEL_FILES[2]))
+    with self.assertRaises(KeyError):
+      self.store.read("BIOMD0000000999")
+
+  def testGetShard(self):
+    if IGNORE_TEST:
+      return
+    for num_shard in [1, 2, 3, 7]:
+      names = []
+      for shard in range(num_shard):
+        names.extend(self.store.getShard(shard, num_shard))
+      self.assertEqual(names, MODEL_FILES)
+
+  def testPickle(self):
+    if IGNORE_TEST:
+      return
+    self.store.read(0)
+    store = pickle.loads(pickle.dumps(self.store))
+    self.assertEqual(store.index, self.store.index)
+    self.assertEqual(store.read(MODEL_FILES[1]), readFile(MODEL_FILES[1]))
+    store.close()
+
+  def testModelIterator(self):
+    if IGNORE_TEST:
+      return
+    items = list(self.store.modelIterator(initial=1, final=3))
+    self.assertEqual([i.number for i in items], [1, 2])
+    self.assertEqual([i.filename for i in items], MODEL_FILES[1:3])
+    for item in items:
+      self.assertTrue(util.isSBMLModel(item.model))
+    items = list(simple_sbml.modelIterator(initial=3, final=100,
+        data_dir=cn.TEST_DIR, zip_filename=TEST_ZIP_FILENAME))
+    self.assertEqual([i.filename for i in items], MODEL_FILES[3:])
+    # Excluded models are not read
+    self.store.read = None
+    items = list(self.store.modelIterator(initial=1, final=3,
+        exclude={1, 2}))
+    self.assertEqual(items, [])
+
+
+if __name__ == '__main__':
+  unittest.main()
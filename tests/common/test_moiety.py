@@ -3,7 +3,9 @@ Tests for Moiety and MoietyStoichiometry
 """
 from SBMLLint.common import constants as cn
 from SBMLLint.common import config
-from SBMLLint.common.moiety import Moiety, MoietyStoichiometry
+from SBMLLint.common.moiety import Moiety, MoietyStoichiometry,  \
+    MoietyRegistry, makeMoiety, getActiveRegistrys
+from SBMLLint.common.simple_sbml import SimpleSBML
 from SBMLLint.common import util
 
 import itertools
@@ -31,6 +33,55 @@ class TestMoiety(unittest.TestCase):
     if IGNORE_TEST:
       return
     self.assertEqual(Moiety(MOIETY_NAME1).name, MOIETY_NAME1)
+    # No module-level list of moieties accumulates
+    self.assertIsNone(Moiety.__init__.__defaults__[0])
+    other_moietys = []
+    Moiety(MOIETY_NAME1, other_moietys)
+    Moiety(MOIETY_NAME1, other_moietys)
+    Moiety(MOIETY_NAME2, other_moietys)
+    self.assertEqual([m.name for m in other_moietys],
+        [MOIETY_NAME1, MOIETY_NAME2])
+
+
+class TestMoietyRegistry(unittest.TestCase):
+
+  def testGet(self):
+    if IGNORE_TEST:
+      return
+    registry = MoietyRegistry()
+    moiety = registry.get(MOIETY_NAME1)
+    self.assertTrue(registry.get(MOIETY_NAME1) is moiety)
+    self.assertTrue(MOIETY_NAME1 in registry)
+    self.assertFalse(MOIETY_NAME2 in registry)
+    self.assertEqual(len(registry), 1)
+    registry.clear()
+    self.assertEqual(len(registry), 0)
+
+  def testScope(self):
+    if IGNORE_TEST:
+      return
+    registry = MoietyRegistry()
+    with registry:
+      m_s1 = MoietyStoichiometry.make("%s_2" % MOIETY_NAME1)
+      m_s2 = MoietyStoichiometry.make(MOIETY_NAME1)
+      self.assertTrue(m_s1.moiety is m_s2.moiety)
+      self.assertTrue(makeMoiety(MOIETY_NAME1) is m_s1.moiety)
+    self.assertEqual(len(getActiveRegistrys()), 0)
+    self.assertFalse(makeMoiety(MOIETY_NAME1) is m_s1.moiety)
+    self.assertEqual(len(registry), 1)
+
+  def testSimpleSBML(self):
+    if IGNORE_TEST:
+      return
+    simple1 = SimpleSBML()
+    simple1.initialize(cn.TEST_FILE4)
+    simple2 = SimpleSBML()
+    simple2.initialize(cn.TEST_FILE4)
+    registry = simple1.moiety_registry
+    self.assertEqual(len(registry), len(simple1.moietys))
+    for moiety in simple1.moietys:
+      self.assertTrue(registry.get(moiety.name) is moiety)
+    self.assertFalse(simple1.moietys[0] is simple2.moietys[0])
 
 
 class TestMoietyStoichiometry(unittest.TestCase):
@@ -83,6 +83,33 @@ class TestReaction(unittest.TestCase):
     trues = [r.category == cn.REACTION_1_n for r in reactions]
     self.assertTrue(all(trues))
 
+  def testCategorize(self):
+    if IGNORE_TEST:
+      return
+    self.assertEqual(Reaction.categorize([]), [])
+    for path in [cn.TEST_FILE, cn.TEST_FILE2, cn.TEST_FILE4,
+        cn.TEST_FILE_GAMES_PP1,
+        os.path.join(cn.TEST_DIR, "test_BIOMD0000000010_url.xml")]:
+      simple = SimpleSBML()
+      simple.initialize(path)
+      self.assertEqual(Reaction.categorize(simple.reactions),
+          [r.getCategory() for r in simple.reactions])
+
+  def testGroupByCategory(self):
+    if IGNORE_TEST:
+      return
+    groups = Reaction.groupByCategory(self.reactions)
+    self.assertEqual(sum([len(v) for v in groups.values()]),
+        len(self.reactions))
+    for category, reactions in groups.items():
+      self.assertEqual(reactions,
+          Reaction.find(self.reactions, category=category))
+    groups = Reaction.groupByCategory(self.reactions,
+        categories=[cn.REACTION_n_n, cn.REACTION_1_n])
+    self.assertEqual(list(groups.keys()),
+        [cn.REACTION_n_n, cn.REACTION_1_n])
+    self.assertGreater(len(groups[cn.REACTION_1_n]), 0)
+
 
 if __name__ == '__main__':
   unittest.main()
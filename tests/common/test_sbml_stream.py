@@ -0,0 +1,98 @@
+"""
+Tests for sbml_stream
+"""
+from SBMLLint.common import constants as cn
+from SBMLLint.common import sbml_stream
+from SBMLLint.common.simple_sbml import SimpleSBML
+
+import glob
+import os
+import unittest
+
+
+IGNORE_TEST = False
+ANTIMONY_FILE = os.path.join(cn.TEST_DIR, "test_file3.antimony")
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+  def _compare(self, reactions1, reactions2):
+    self.assertEqual([r.identifier for r in reactions1],
+        [r.identifier for r in reactions2])
+    self.assertEqual([r.category for r in reactions1],
+        [r.category for r in reactions2])
+    self.assertEqual([sorted(r.kinetics_terms) for r in reactions1],
+        [sorted(r.kinetics_terms) for r in reactions2])
+
+  def testExtractReactions(self):
+    if IGNORE_TEST:
+      return
+    # Cross-check with libsbml on the test models
+    paths = glob.glob(os.path.join(cn.TEST_DIR, "*.xml"))
+    self.assertGreater(len(paths), 0)
+    for path in paths:
+      simple = SimpleSBML()
+      simple.initialize(path)
+      self._compare(sbml_stream.extractReactions(path), simple.reactions)
+
+  def testExtractReactionsChunks(self):
+    if IGNORE_TEST:
+      return
+    simple = SimpleSBML()
+    simple.initialize(cn.TEST_FILE)
+    chunk_size = sbml_stream.CHUNK_SIZE
+    try:
+      sbml_stream.CHUNK_SIZE = 7
+      reactions = sbml_stream.extractReactions(cn.TEST_FILE)
+    finally:
+      sbml_stream.CHUNK_SIZE = chunk_size
+    self._compare(reactions, simple.reactions)
+    with open(cn.TEST_FILE, "r") as fd:
+      xml = fd.read()
+    self._compare(sbml_stream.extractReactions(xml), simple.reactions)
+    reactions = sbml_stream.extractReactions(open(cn.TEST_FILE, "r"))
+    self._compare(reactions, simple.reactions)
+
+  def testExtractReactionsInvalid(self):
+    if IGNORE_TEST:
+      return
+    with self.assertRaises(ValueError):
+      sbml_stream.extractReactions("<sbml><model>")
+    with self.assertRaises(ValueError):
+      sbml_stream.extractReactions("<model></model>")
+
+  def testInitializeFromStream(self):
+    if IGNORE_TEST:
+      return
+    self.assertTrue(sbml_stream.isStreamable(cn.TEST_FILE2))
+    self.assertFalse(sbml_stream.isStreamable(ANTIMONY_FILE))
+    # Files are checked without changing their position
+    for path, is_streamable in [(cn.TEST_FILE2, True),
+        (ANTIMONY_FILE, False)]:
+      for mode in ["r", "rb"]:
+        with open(path, mode) as fd:
+          self.assertEqual(sbml_stream.isStreamable(fd), is_streamable)
+          self.assertEqual(fd.tell(), 0)
+    with open(cn.TEST_FILE2, "r") as fd:
+      sbml_stream.extractReactions(fd)
+      self.assertFalse(fd.closed)
+    for path in [cn.TEST_FILE2, ANTIMONY_FILE]:
+      simple = SimpleSBML()
+      simple.initialize(path)
+      stream_simple = SimpleSBML()
+      stream_simple.initializeFromStream(path)
+      self._compare(stream_simple.reactions, simple.reactions)
+      stream_simple = SimpleSBML()
+      stream_simple.initializeFromStream(open(path, "r"))
+      self._compare(stream_simple.reactions, simple.reactions)
+      self.assertEqual([m.name for m in stream_simple.molecules],
+          [m.name for m in simple.molecules])
+      self.assertEqual([m.name for m in stream_simple.moietys],
+          [m.name for m in simple.moietys])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,7 +2,8 @@
 Tests for simple_sbml
 """
 from SBMLLint.common import constants as cn
-from SBMLLint.common.molecule import Molecule
+from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
+from SBMLLint.common.reaction import Reaction
 from SBMLLint.common import simple_sbml
 from SBMLLint.common.simple_sbml import SimpleSBML
 from SBMLLint.common import util
@@ -83,6 +84,38 @@ class TestSimpleSBML(unittest.TestCase):
     reaction1 = self.simple.getReaction(label)
     self.assertTrue(reaction.isEqual(reaction1))
 
+  def testGetComponents(self):
+    if IGNORE_TEST:
+      return
+    def makeReaction(label, reactant, product):
+      return Reaction.makeFromParts(label,
+          [MoleculeStoichiometry(Molecule(reactant), 1.0)],
+          [MoleculeStoichiometry(Molecule(product), 1.0)])
+    simple = SimpleSBML()
+    simple.reactions = [makeReaction("J0", "S1", "S2"),
+        makeReaction("J1", "S3", "S4"), makeReaction("J2", "S2", "S5")]
+    simple.molecules = simple._getMolecules()
+    components = simple.getComponents()
+    self.assertEqual(len(components), 2)
+    self.assertEqual([r.label for r in components[0].reactions],
+        ["J0", "J2"])
+    self.assertEqual([m.name for m in components[1].molecules],
+        ["S3", "S4"])
+    for path in [cn.TEST_FILE, cn.TEST_FILE_GAMES_PP2]:
+      simple = SimpleSBML()
+      simple.initialize(path)
+      components = simple.getComponents()
+      labels = [r.label for c in components for r in c.reactions]
+      self.assertEqual(sorted(labels),
+          sorted([r.label for r in simple.reactions]))
+      # Non-boundary reactions do not share molecules across components
+      names = [set([m_s.molecule.name for r in c.reactions
+          if r.category != cn.REACTION_BOUNDARY
+          for m_s in r.reactants + r.products]) for c in components]
+      for idx, names1 in enumerate(names):
+        for names2 in names[idx+1:]:
+          self.assertEqual(len(names1.intersection(names2)), 0)
+
 
 class TestFunctions(unittest.TestCase):
 
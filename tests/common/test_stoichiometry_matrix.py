@@ -6,6 +6,7 @@ from SBMLLint.common.reaction import Reaction
 from SBMLLint.common.simple_sbml import SimpleSBML
 from SBMLLint.games.som import SOM
 from SBMLLint.common.simple_sbml import SimpleSBML
+from SBMLLint.common import stoichiometry_matrix
 from SBMLLint.common.stoichiometry_matrix import StoichiometryMatrix
 
 from scipy.optimize import linprog
@@ -79,6 +80,85 @@ class TestStoichiometryMatrix(unittest.TestCase):
     self.assertTrue(self.consistent_matrix.isConsistent())
     self.assertFalse(self.inconsistent_matrix.isConsistent())
 
+  def testGetComponents(self):
+    if IGNORE_TEST:
+      return
+    components = self.repeated_species_matrix.getComponents()
+    self.assertEqual(len(components), 2)
+    components = sorted([(sorted(m), sorted(r)) for m, r in components])
+    self.assertEqual(components[0],
+        (['S0', 'S1', 'S2', 'S3'], ['J0', 'J1', 'J2']))
+    self.assertEqual(components[1], (['S4', 'S5'], ['J3']))
+
+  def testIsConsistentDecompose(self):
+    if IGNORE_TEST:
+      return
+    self.assertTrue(self.consistent_matrix.isConsistent(is_decompose=True))
+    self.assertFalse(self.inconsistent_matrix.isConsistent(is_decompose=True))
+    self.assertEqual(len(self.inconsistent_matrix.result),
+        len(self.inconsistent_matrix.getComponents()))
+    self.assertEqual(
+        self.repeated_species_matrix.isConsistent(),
+        self.repeated_species_matrix.isConsistent(is_decompose=True))
+    # Solve components in worker processes
+    min_size = stoichiometry_matrix.PARALLEL_MIN_SIZE
+    stoichiometry_matrix.PARALLEL_MIN_SIZE = 0
+    try:
+      self.assertEqual(
+          self.repeated_species_matrix.isConsistent(),
+          self.repeated_species_matrix.isConsistent(is_decompose=True,
+          num_worker=2))
+    finally:
+      stoichiometry_matrix.PARALLEL_MIN_SIZE = min_size
+
+  def testGetUnconservedSpecies(self):
+    if IGNORE_TEST:
+      return
+    self.assertEqual(self.consistent_matrix.getUnconservedSpecies(), [])
+    self.assertEqual(sorted(self.inconsistent_matrix.getUnconservedSpecies()),
+        sorted(self.inconsistent_matrix.molecules))
+    simple = SimpleSBML()
+    simple.initialize(cn.TEST_FILE12)
+    matrix = StoichiometryMatrix(simple)
+    unconserved = matrix.getUnconservedSpecies()
+    self.assertGreater(len(unconserved), 0)
+    self.assertLess(len(unconserved), len(matrix.molecules))
+    # The masses are conserved and positive for the other species
+    values = matrix.stoichiometry_matrix
+    self.assertTrue(np.allclose(values.T.dot(matrix.masses), 0, atol=1e-6))
+    for molecule in values.index:
+      if not molecule in unconserved:
+        self.assertGreater(matrix.masses[molecule], 0)
+      else:
+        self.assertAlmostEqual(matrix.masses[molecule], 0)
+
+  def testIsConsistentFailFast(self):
+    if IGNORE_TEST:
+      return
+    self.assertTrue(self.consistent_matrix.isConsistent(is_fail_fast=True))
+    self.assertIsNone(self.consistent_matrix.inconsistent_reactions)
+    self.assertFalse(self.inconsistent_matrix.isConsistent(is_fail_fast=True))
+    reactions = self.inconsistent_matrix.inconsistent_reactions
+    self.assertGreater(len(reactions), 0)
+    self.assertTrue(set(reactions).issubset(
+        self.inconsistent_matrix.stoichiometry_matrix.columns))
+    self.assertLessEqual(len(self.inconsistent_matrix.result),
+        len(self.inconsistent_matrix.getComponents()))
+    # Only the reactions with unconserved species are kept
+    simple = SimpleSBML()
+    simple.initialize(cn.TEST_FILE12)
+    matrix = StoichiometryMatrix(simple)
+    self.assertFalse(matrix.isConsistent(is_fail_fast=True))
+    reactions = matrix.inconsistent_reactions
+    component_reactions = [r for _, r in matrix.getComponents()
+        if set(reactions).issubset(r)][0]
+    self.assertLess(len(reactions), len(component_reactions))
+    unconserved = matrix.getUnconservedSpecies()
+    values = matrix.stoichiometry_matrix
+    for reaction in component_reactions:
+      self.assertEqual(reaction in reactions,
+          bool((values.loc[unconserved, reaction] != 0).any()))
+
 if __name__ == '__main__':
   unittest.main()
     
\ No newline at end of file
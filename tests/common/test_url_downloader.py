@@ -0,0 +1,187 @@
+from SBMLLint.common import constants as cn
+from SBMLLint.common import url_downloader
+from SBMLLint.common.url_downloader import URLDownloader
+from SBMLLint.common import simple_sbml
+from SBMLLint.common.simple_sbml import SimpleSBML
+
+import asyncio
+import collections
+import http.server
+import os
+import shutil
+import threading
+import unittest
+
+
+IGNORE_TEST = False
+TEST_SBML_FILE = os.path.join(cn.TEST_DIR,
+    "test_BIOMD0000000010_url.xml")
+TEST_CACHE_DIR = os.path.join(cn.TEST_DIR, "test_url_downloader_cache")
+ETAG = '"v1"'
+MODEL_PATH = "/model.xml"
+NOETAG_PATH = "/noetag.xml"
+FLAKY_PATH = "/flaky.xml"
+MISSING_PATH = "/missing.xml"
+SLOW_PATH = "/slow.xml"
+TIMEOUT = 10  # seconds
+with open(TEST_SBML_FILE, "r") as _fd:
+  MODEL_STG = _fd.read()
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+  """Local stand-in for a model repository."""
+  requests = collections.defaultdict(list)  # key: path, value: statuses
+  slow_event = threading.Event()  # Releases SLOW_PATH
+
+  def _send(self, status, body=None, etag=None):
+    self.requests[self.path].append(status)
+    self.send_response(status)
+    if etag is not None:
+      self.send_header("ETag", etag)
+    data = b""
+    if body is not None:
+      data = body.encode("utf-8")
+    self.send_header("Content-Length", str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+
+  def do_GET(self):
+    if self.path == MODEL_PATH:
+      if self.headers.get("If-None-Match") == ETAG:
+        self.send_response(304)
+        self.requests[self.path].append(304)
+        self.end_headers()
+      else:
+        self._send(200, body=MODEL_STG, etag=ETAG)
+    elif self.path == NOETAG_PATH:
+      self._send(200, body=MODEL_STG)
+    elif self.path == FLAKY_PATH:
+      if len(self.requests[self.path]) == 0:
+        self._send(503)
+      else:
+        self._send(200, body=MODEL_STG)
+    elif self.path == SLOW_PATH:
+      self.slow_event.wait(TIMEOUT)
+      self._send(200, body=MODEL_STG)
+    else:
+      self._send(404)
+
+  def log_message(self, *pargs):
+    pass
+
+
+#############################
+# Tests
+#############################
+class TestURLDownloader(unittest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+        StandInHandler)
+    cls.thread = threading.Thread(target=cls.server.serve_forever)
+    cls.thread.daemon = True
+    cls.thread.start()
+    cls.base_url = "http://127.0.0.1:%d" % cls.server.server_address[1]
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.shutdown()
+    cls.server.server_close()
+
+  def setUp(self):
+    StandInHandler.requests.clear()
+    StandInHandler.slow_event.clear()
+    self.downloader = URLDownloader(cache_dir=TEST_CACHE_DIR,
+        max_concurrency=2, backoff=0)
+
+  def tearDown(self):
+    StandInHandler.slow_event.set()
+    if os.path.isdir(TEST_CACHE_DIR):
+      shutil.rmtree(TEST_CACHE_DIR)
+
+  def makeURL(self, path):
+    return self.base_url + path
+
+  def testFetch(self):
+    if IGNORE_TEST:
+      return
+    url = self.makeURL(MODEL_PATH)
+    self.assertEqual(self.downloader.fetch(url), MODEL_STG)
+    # Revalidated with the ETag
+    self.assertEqual(self.downloader.fetch(url), MODEL_STG)
+    self.assertEqual(StandInHandler.requests[MODEL_PATH], [200, 304])
+    # No ETag means no revalidation
+    url = self.makeURL(NOETAG_PATH)
+    self.downloader.fetch(url)
+    self.downloader.fetch(url)
+    self.assertEqual(StandInHandler.requests[NOETAG_PATH], [200, 200])
+    with self.assertRaises(IOError):
+      self.downloader.fetch(self.makeURL(MISSING_PATH))
+
+  def testFetchRetry(self):
+    if IGNORE_TEST:
+      return
+    self.assertEqual(self.downloader.fetch(self.makeURL(FLAKY_PATH)),
+        MODEL_STG)
+    self.assertEqual(StandInHandler.requests[FLAKY_PATH], [503, 200])
+
+  def testFetchAll(self):
+    if IGNORE_TEST:
+      return
+    paths = [MODEL_PATH, MISSING_PATH, NOETAG_PATH]
+    urls = [self.makeURL(p) for p in paths]
+    results = self.downloader.fetchAll(urls)
+    self.assertEqual([r.url for r in results], urls)
+    self.assertEqual(results[0].content, MODEL_STG)
+    self.assertIsNone(results[1].content)
+    self.assertTrue(isinstance(results[1].error, str))
+    self.assertEqual(results[2].content, MODEL_STG)
+    # Usable when an event loop is running
+    async def fetch():
+      return self.downloader.fetchAll(urls)
+    results = asyncio.run(fetch())
+    self.assertEqual(results[0].content, MODEL_STG)
+
+  def testIterateDownloads(self):
+    if IGNORE_TEST:
+      return
+    paths = [SLOW_PATH, MODEL_PATH, MISSING_PATH, NOETAG_PATH]
+    urls = [self.makeURL(p) for p in paths]
+    iterator = self.downloader.iterateDownloads(urls)
+    # Downloads after the slow one proceed while it is in progress
+    results = [next(iterator) for _ in range(3)]
+    self.assertEqual(sorted([r.url for r in results]), sorted(urls[1:]))
+    self.assertEqual(StandInHandler.requests[SLOW_PATH], [])
+    StandInHandler.slow_event.set()
+    result = next(iterator)
+    self.assertEqual(result.url, urls[0])
+    self.assertEqual(result.content, MODEL_STG)
+    with self.assertRaises(StopIteration):
+      next(iterator)
+
+  def testModelIterator(self):
+    if IGNORE_TEST:
+      return
+    paths = [MODEL_PATH, MISSING_PATH, NOETAG_PATH, FLAKY_PATH]
+    urls = [self.makeURL(p) for p in paths]
+    items = sorted(self.downloader.modelIterator(urls),
+        key=lambda i: i.number)
+    self.assertEqual([i.filename for i in items],
+        [urls[0], urls[2], urls[3]])
+    self.assertEqual([i.number for i in items], [0, 2, 3])
+    simple = SimpleSBML()
+    simple.initialize(items[0].model)
+    self.assertGreater(len(simple.reactions), 0)
+
+  def testReadURL(self):
+    if IGNORE_TEST:
+      return
+    url = self.makeURL(MODEL_PATH)
+    self.assertEqual(simple_sbml.readURL(url), MODEL_STG)
+    self.assertTrue(url_downloader.getPoolManager()
+        is url_downloader.getPoolManager())
+
+
+if __name__ == '__main__':
+  unittest.main()
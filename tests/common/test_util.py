@@ -4,6 +4,9 @@ from SBMLLint.common import util
 import libsbml
 
 
+import contextlib
+import io
+import json
 import numpy as np
 import os
 import unittest
@@ -115,6 +118,21 @@ class TestFunctions(unittest.TestCase):
         util.runFunction(testFunc, [6], {'b': 3}), 2)
     result = util.runFunction(testFunc, [6], {'b': 0})
     self.assertIsNone(result)
+    # Structured formats write one record for the failed model
+    for output_format in [cn.FORMAT_JSON, cn.FORMAT_NDJSON]:
+      file_out = io.StringIO()
+      with contextlib.redirect_stdout(file_out):
+        result = util.runFunction(testFunc, [6], {'b': 0},
+            output_format=output_format, model_name="model.xml")
+      self.assertIsNone(result)
+      record = json.loads(file_out.getvalue())
+      self.assertEqual(record[cn.RESULT_MODEL], "model.xml")
+      self.assertTrue(util.DEFAULT_MSG in record[cn.RESULT_ERROR])
+    file_out = io.StringIO()
+    with contextlib.redirect_stdout(file_out):
+      util.runFunction(testFunc, [6], {'b': 0},
+          output_format=cn.FORMAT_NDJSON)
+    self.assertEqual(file_out.getvalue().count("\n"), 1)
     
     
     
@@ -0,0 +1,101 @@
+"""
+Tests for ErrorCollector
+"""
+from SBMLLint.common import constants as cn
+from SBMLLint.common.simple_sbml import SimpleSBML
+from SBMLLint.games.error_collector import ErrorCollector, getPathKey
+
+import unittest
+
+
+IGNORE_TEST = False
+NODE1 = "A"
+NODE2 = "B"
+NODE3 = "C"
+R1 = "R1"
+R2 = "R2"
+
+
+#############################
+# Tests
+#############################
+class TestErrorCollector(unittest.TestCase):
+
+  def setUp(self):
+    self.simple = SimpleSBML()
+    self.simple.initialize(cn.TEST_FILE3)
+    self.reactions = self.simple.reactions
+
+  def testAdd(self):
+    if IGNORE_TEST:
+      return
+    collector = ErrorCollector()
+    self.assertEqual(collector, [])
+    self.assertFalse(collector)
+    self.assertTrue(collector.add(self.reactions[1]))
+    self.assertTrue(collector.add(self.reactions[0]))
+    self.assertFalse(collector.add(self.reactions[1]))
+    self.assertEqual(collector, [self.reactions[1], self.reactions[0]])
+    self.assertTrue(self.reactions[0] in collector)
+    self.assertFalse(self.reactions[2] in collector)
+    self.assertTrue(collector.get(self.reactions[0].label)
+        is self.reactions[0])
+    self.assertIsNone(collector.get(self.reactions[2].label))
+    other = ErrorCollector(errors=collector)
+    self.assertEqual(other, collector)
+    self.assertTrue(self.reactions[1] in other)
+
+  def testAddPathComponent(self):
+    if IGNORE_TEST:
+      return
+    collector = ErrorCollector(func_key=getPathKey)
+    collector.addPathComponent(NODE1, NODE2, R1)
+    collector.addPathComponent(NODE2, NODE3, R1)
+    collector.addPathComponent(NODE1, NODE2, R2)
+    # Merged errors keep their position
+    self.assertEqual(collector, [
+        cn.PathComponents(node1=NODE1, node2=NODE2, reactions=[R1, R2]),
+        cn.PathComponents(node1=NODE2, node2=NODE3, reactions=[R1]),
+        ])
+    self.assertEqual(collector.get((NODE2, NODE1)), None)
+
+  def testListMutations(self):
+    if IGNORE_TEST:
+      return
+    def check(collector):
+      # The index agrees with a search of the list
+      for reaction in self.reactions:
+        errors = [e for e in collector if e.label == reaction.label]
+        self.assertEqual(reaction in collector, len(errors) > 0)
+        if len(errors) > 0:
+          self.assertTrue(collector.get(reaction.label) is errors[0])
+    #
+    collector = ErrorCollector(errors=self.reactions[:3])
+    collector.insert(0, self.reactions[3])
+    check(collector)
+    collector.remove(self.reactions[0])
+    check(collector)
+    self.assertTrue(collector.pop() is self.reactions[2])
+    check(collector)
+    self.assertTrue(collector.pop(0) is self.reactions[3])
+    check(collector)
+    collector[0] = self.reactions[2]
+    check(collector)
+    collector += [self.reactions[0], self.reactions[3]]
+    self.assertTrue(isinstance(collector, ErrorCollector))
+    check(collector)
+    del collector[:2]
+    check(collector)
+    collector.sort(key=lambda r: r.label, reverse=True)
+    check(collector)
+    collector.reverse()
+    check(collector)
+    collector *= 2
+    check(collector)
+    collector.clear()
+    self.assertFalse(self.reactions[0] in collector)
+    check(collector)
+
+
+if __name__ == '__main__':
+  unittest.main()
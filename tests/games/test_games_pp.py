@@ -282,6 +282,27 @@ class TestGAMES_PP(unittest.TestCase):
     self.assertEqual(sr1_products, sr2_products)
     self.assertEqual(sr1_reactsom, sr2_reactsom)
     self.assertEqual(sr1_prodsom, sr2_prodsom)
+    # Only the requested categories are converted
+    som_reactions3 = self.games_pp.convertMatrixToSOMReactions(som_mat,
+        categories=[cn.REACTION_1_1])
+    self.assertEqual([sr.label for sr in som_reactions3],
+        [sr.label for sr in som_reactions2 if sr.category == cn.REACTION_1_1])
+
+  def testGetMatrixCategories(self):
+    if IGNORE_TEST:
+      return
+    for simple in [self.simple1, self.simple2]:
+      games_pp = GAMES_PP(simple)
+      som_reactions = [games_pp.convertReactionToSOMReaction(r)
+          for r in games_pp.reactions]
+      som_mat = games_pp.getStoichiometryMatrix(
+          som_reactions,
+          games_pp.nodes,
+          som=True)
+      categories = games_pp.getMatrixCategories(som_mat)
+      self.assertEqual(list(categories.index), list(som_mat.columns))
+      for sr in games_pp.convertMatrixToSOMReactions(som_mat):
+        self.assertEqual(categories[sr.label], sr.getCategory())
 
   def testGetNode(self):
     if IGNORE_TEST:
@@ -456,16 +477,18 @@ class TestGAMES_PP(unittest.TestCase):
     som_fh4 = games_pp2.getNode(fh4)
     som_ch2fh4 = games_pp2.getNode(ch2fh4)
     # do we need the next two methods if we're giving a cycle? 
-    games_pp2.addArc(som_fh4, som_ch2fh4, unimulti_reaction)
-    games_pp2.addArc(som_ch2fh4, som_fh4, multiuni_reaction) 
+    games_pp2.addArc(som_fh4, som_ch2fh4, unimulti_reaction, arc=(fh4, ch2fh4))
+    games_pp2.addArc(som_ch2fh4, som_fh4, multiuni_reaction, arc=(ch2fh4, fh4))
     self.assertTrue(len(games_pp2.type_two_errors)==ZERO)
     games_pp2.checkTypeTwoError()
     self.assertTrue(len(games_pp2.type_two_errors)==ONE)
     error = games_pp2.type_two_errors[ZERO]
-    self.assertTrue(games_pp2.has_edge(error[ZERO], error[ONE]))
-    self.assertTrue(games_pp2.has_edge(error[ONE], error[ZERO]))
-    error_reactions = set(games_pp2.get_edge_data(error[ZERO], error[ONE])[REACTION])
-    error_reactions = error_reactions.union(set(games_pp2.get_edge_data(error[ONE], error[ZERO])[REACTION]))
+    # arcs of the cycle with the molecules that created them
+    self.assertEqual(len(error), 2)
+    for arc in error:
+      self.assertTrue(isinstance(arc, cn.PathComponents))
+    self.assertEqual({arc.node1[ZERO] for arc in error}, {FH4, CH2FH4})
+    error_reactions = set(error[ZERO].reactions).union(error[ONE].reactions)
     self.assertTrue(CH2FH4toHCHO in error_reactions)
     self.assertTrue(HCHOtoCH2FH4 in error_reactions)
 
@@ -491,6 +514,102 @@ class TestGAMES_PP(unittest.TestCase):
     self.assertTrue(len(games_pp1.type_two_errors)==ZERO)
     self.assertTrue(len(games_pp2.type_one_errors)>ZERO)
 
+  def testAnalyzeComponents(self):
+    if IGNORE_TEST:
+      return
+    games_pp2 = GAMES_PP(self.simple2)
+    result = games_pp2.analyze(suppress_message=True)
+    is_error, games_pps = GAMES_PP.analyzeComponents(self.simple2,
+        suppress_message=True)
+    self.assertEqual(is_error, result)
+    self.assertEqual(sum([len(m.reactions) for m in games_pps]),
+        len(games_pp2.reactions))
+    # Graph errors are found within components
+    self.assertEqual(sum([len(m.type_one_errors) for m in games_pps]),
+        len(games_pp2.type_one_errors))
+    self.assertEqual(sum([len(m.type_two_errors) for m in games_pps]),
+        len(games_pp2.type_two_errors))
+    is_error, games_pps = GAMES_PP.analyzeComponents(self.simple1,
+        suppress_message=True)
+    self.assertTrue(is_error)
+    self.assertTrue(any([len(m.echelon_errors) > 0 for m in games_pps]))
+
+  def testAnalyzeFailFast(self):
+    if IGNORE_TEST:
+      return
+    for simple in [self.simple1, self.simple2]:
+      games_pp = GAMES_PP(simple)
+      result = games_pp.analyze(suppress_message=True)
+      games_pp_fast = GAMES_PP(simple)
+      self.assertEqual(games_pp_fast.analyze(suppress_message=True,
+          fail_fast=True), result)
+      # Only the first error is kept
+      self.assertEqual(len(games_pp_fast.error_summary), ONE)
+      self.assertEqual(len(games_pp_fast.error_summary[0].errors), ONE)
+      self.assertEqual(games_pp_fast.error_summary[0].type,
+          games_pp.error_summary[0].type)
+    is_error, games_pps = GAMES_PP.analyzeComponents(self.simple2,
+        suppress_message=True, fail_fast=True)
+    self.assertTrue(is_error)
+    self.assertTrue(games_pps[-1].hasErrors())
+    self.assertFalse(any([m.hasErrors() for m in games_pps[:-1]]))
+
+  def testAnalyzeLowMemory(self):
+    if IGNORE_TEST:
+      return
+    games_pp1 = GAMES_PP(self.simple1)
+    self.assertTrue(games_pp1.analyze(memory_limit=0))
+    self.assertTrue(games_pp1.is_low_memory)
+    self.assertTrue(len(games_pp1.echelon_errors)>ZERO)
+    # Only sparse factors are kept
+    for matrix in [games_pp1.som_stoichiometry_matrix, games_pp1.lower,
+        games_pp1.lower_inverse, games_pp1.permuted_matrix,
+        games_pp1.echelon_df, games_pp1.rref_operation, games_pp1.rref_df]:
+      self.assertIsNone(matrix)
+    self.assertIsNotNone(games_pp1.sparse_lower)
+    self.assertIsNone(games_pp1._echelon_rows)
+    # No limit keeps the dense matrices
+    games_pp1 = GAMES_PP(self.simple1)
+    games_pp1.analyze(memory_limit=None)
+    self.assertFalse(games_pp1.is_low_memory)
+    self.assertIsNotNone(games_pp1.lower_inverse)
+    self.assertGreater(GAMES_PP.estimateMemory(10, 20),
+        GAMES_PP.estimateMemory(10, 10))
+
+  def testGetOperationSeries(self):
+    if IGNORE_TEST:
+      return
+    # Without RREF (echelon error) and with RREF
+    simple3 = SimpleSBML()
+    simple3.initialize(cn.TEST_FILE_GAMESREPORT3)
+    for simple in [self.simple1, simple3]:
+      games_pp = GAMES_PP(simple)
+      games_pp.analyze(suppress_message=True)
+      if games_pp.rref_operation is None:
+        dense_operation = games_pp.lower_inverse
+        dense_reduced = games_pp.echelon_df
+      else:
+        dense_operation = games_pp.rref_operation.dot(games_pp.lower_inverse)
+        dense_reduced = games_pp.rref_df
+      sparse_pp = GAMES_PP(simple)
+      sparse_pp.analyze(suppress_message=True, low_memory=True)
+      self.assertEqual(sparse_pp.factor_labels, list(dense_operation.index))
+      self.assertEqual([str(e) for e in sparse_pp.echelon_errors],
+          [str(e) for e in games_pp.echelon_errors])
+      self.assertEqual([str(e) for e in sparse_pp.type_three_errors],
+          [str(e) for e in games_pp.type_three_errors])
+      for label in sparse_pp.factor_labels:
+        self.assertTrue(np.allclose(sparse_pp.getLowerInverseRow(label),
+            games_pp.lower_inverse.loc[label]))
+        self.assertTrue(np.allclose(sparse_pp.getOperationSeries(label),
+            dense_operation.loc[label]))
+        self.assertTrue(np.allclose(sparse_pp.getReducedSeries(label),
+            dense_reduced[label]))
+    # No decomposition
+    games_pp = GAMES_PP(self.simple1)
+    self.assertIsNone(games_pp.getOperationSeries(PGA_CONS))
+
+
 if __name__ == '__main__':
   unittest.main()
 
@@ -5,11 +5,12 @@ from SBMLLint.common import constants as cn
 from SBMLLint.common.molecule import Molecule, MoleculeStoichiometry
 from SBMLLint.common.reaction import Reaction
 from SBMLLint.common.simple_sbml import SimpleSBML
-from SBMLLint.games.games_pp import SOMStoichiometry, SOMReaction, GAMES_PP
-from SBMLLint.games.games_report import GAMESReport, SimplifiedReaction, NULL_STR, NUM_STAR, PARAGRAPH_DIVIDER, REPORT_DIVIDER
+from SBMLLint.games.games_pp import SOMStoichiometry, SOMReaction, GAMES_PP, CANCELING, TYPE_I, ErrorSummary
+from SBMLLint.games.games_report import GAMESReport, writeComponentReport, writeReports, SimplifiedReaction, NULL_STR, NUM_STAR, PARAGRAPH_DIVIDER, REPORT_DIVIDER
 from SBMLLint.games.som import SOM
 from SBMLLint.common import simple_sbml
 
+import io
 import numpy as np
 import pandas as pd
 import os
@@ -119,6 +120,89 @@ class TestGAMESReport(unittest.TestCase):
     self.assertEqual(extended_report, report)
     self.assertEqual(error_num, [2])
 
+  def testWriteReport(self):
+    if IGNORE_TEST:
+      return
+    m = GAMES_PP(self.simple1)
+    m.analyze(error_details=False)
+    gr = GAMESReport(m)
+    report, _ = gr.reportCancelingError(m.canceling_errors, explain_details=True)
+    fd = io.StringIO()
+    unreported = gr.writeReport(m.error_summary, file_out=fd)
+    self.assertEqual(fd.getvalue(), report)
+    self.assertEqual(unreported, {})
+    # Errors beyond the budget are summarized
+    fd = io.StringIO()
+    unreported = gr.writeReport(m.error_summary, file_out=fd, max_errors=0)
+    self.assertEqual(unreported, {CANCELING: 1})
+    self.assertTrue("%s: 1" % CANCELING in fd.getvalue())
+    self.assertFalse("OxidativePhosphorylation" in fd.getvalue())
+    # Errors beyond max_explained_errors have no details
+    fd = io.StringIO()
+    gr.writeReport(m.error_summary, file_out=fd, max_explained_errors=0)
+    report, _ = gr.reportCancelingError(m.canceling_errors, explain_details=False)
+    self.assertEqual(fd.getvalue(), report)
+    self.assertFalse("same mass" in fd.getvalue())
+
+  def testWriteReportsSkippedErrors(self):
+    if IGNORE_TEST:
+      return
+    m = GAMES_PP(self.simple1)
+    m.analyze(error_details=False)
+    gr = GAMESReport(m)
+    report_function = gr._reportCancelingError
+    calls = []
+    def reportCancelingError(error, explain_details):
+      # The first error has no report
+      calls.append(error)
+      if len(calls) == 1:
+        return False, 0
+      return report_function(error, explain_details)
+    gr._reportCancelingError = reportCancelingError
+    errors = m.canceling_errors*3
+    fd = io.StringIO()
+    unreported = writeReports([(gr, ErrorSummary(type=CANCELING,
+        errors=errors))], file_out=fd, max_errors=1)
+    # One error is skipped, one written and one unreported
+    self.assertEqual(unreported, {CANCELING: 1})
+
+  def testWriteComponentReport(self):
+    if IGNORE_TEST:
+      return
+    m = GAMES_PP(self.simple1)
+    m.analyze(error_details=False)
+    fd1 = io.StringIO()
+    GAMESReport(m).writeReport(m.error_summary, file_out=fd1)
+    fd2 = io.StringIO()
+    writeComponentReport([m], file_out=fd2)
+    self.assertEqual(fd1.getvalue(), fd2.getvalue())
+    # One budget across components
+    fd = io.StringIO()
+    unreported = writeComponentReport([m, m], file_out=fd, max_errors=1)
+    self.assertEqual(unreported, {CANCELING: 1})
+    self.assertEqual(fd.getvalue().count(REPORT_DIVIDER), 1)
+
+  def testMakeErrorRecord(self):
+    if IGNORE_TEST:
+      return
+    m = GAMES_PP(self.simple1)
+    m.analyze(error_details=False)
+    gr = GAMESReport(m)
+    record = gr.makeErrorRecord(CANCELING, m.canceling_errors[0])
+    self.assertEqual(record[cn.RESULT_TYPE], CANCELING)
+    self.assertEqual(record[cn.RESULT_LABEL], "OxidativePhosphorylation")
+    self.assertEqual(record[cn.RESULT_REACTIONS],
+        ["OxidativePhosphorylation", "ATPase"])
+    self.assertEqual(record[cn.RESULT_SOMS], ["{ADP=ATP}"])
+    m = GAMES_PP(self.simple2)
+    m.analyze(error_details=False)
+    gr = GAMESReport(m)
+    error = cn.PathComponents(node1=G2K, node2=G2R, reactions=[G2R_CREATION])
+    record = gr.makeErrorRecord(TYPE_I, error)
+    self.assertIsNone(record[cn.RESULT_LABEL])
+    self.assertEqual(record[cn.RESULT_REACTIONS],
+        ["Rum1DegInG2R", G2R_CREATION])
+
   def testGetMoleculeEqualityPath(self):
     if IGNORE_TEST:
       return
@@ -188,7 +272,7 @@ class TestGAMESReport(unittest.TestCase):
   	gr = GAMESReport(m)
   	som1 = m.getNode(self.simple3.getMolecule(CH3FH4))
   	som2 = m.getNode(self.simple3.getMolecule(FH4))
-  	error = [[som1, som2]]
+  	error = [[m.getArcExplanation(som1, som2), m.getArcExplanation(som2, som1)]]
   	report, error_num = gr.reportTypeTwoError(error, explain_details=True)
   	self.assertEqual(error_num, [5])
   	LOC_START = 241
@@ -228,6 +312,57 @@ class TestGAMESReport(unittest.TestCase):
     self.assertEqual(op_mat.loc[PSTATDIMERISATIONNUC, PSTATDIMERISATIONNUC], 1.0)
     self.assertEqual(op_mat.loc[PSTATDIMERISATIONNUC, STATPHOSPHORYLATION], 0.0)
     self.assertEqual(op_mat.loc[STATPHOSPHORYLATION, PSTATDIMERISATIONNUC], -0.5)
+    self.assertTrue(gr4.getOperationMatrix() is op_mat)
+
+  def testGetOperationSeries(self):
+    if IGNORE_TEST:
+      return
+    m = GAMES_PP(self.simple4)
+    m.analyze(error_details=False)
+    gr1 = GAMESReport(m)
+    gr2 = GAMESReport(m)
+    op_mat = gr2.getOperationMatrix()
+    for label in [STATPHOSPHORYLATION, PSTATDIMERISATIONNUC]:
+      # computed from a single row and from the full matrix
+      series1 = gr1.getOperationSeries(label)
+      series2 = gr2.getOperationSeries(label)
+      self.assertTrue(np.allclose(series1[op_mat.columns], op_mat.loc[label]))
+      self.assertTrue(np.allclose(series2[op_mat.columns], op_mat.loc[label]))
+      self.assertTrue(gr1.getOperationSeries(label) is series1)
+
+  def testLowMemory(self):
+    if IGNORE_TEST:
+      return
+    m1 = GAMES_PP(self.simple4)
+    m1.analyze(error_details=False)
+    m2 = GAMES_PP(self.simple4)
+    m2.analyze(error_details=False, low_memory=True)
+    self.assertTrue(m2.is_low_memory)
+    self.assertEqual([(e.type, len(e.errors)) for e in m1.error_summary],
+        [(e.type, len(e.errors)) for e in m2.error_summary])
+    gr = GAMESReport(m2)
+    op_mat = gr.getOperationMatrix()
+    self.assertEqual(op_mat.loc[STATPHOSPHORYLATION, STATPHOSPHORYLATION], 1.0)
+    for label in [STATPHOSPHORYLATION, PSTATDIMERISATIONNUC]:
+      self.assertTrue(np.allclose(gr.getOperationSeries(label)[op_mat.columns],
+          op_mat.loc[label]))
+    resulting_series = gr.getResultingSeries(STATPHOSPHORYLATION)
+    self.assertEqual(resulting_series["{" + SPECIES_TEST + "}"], 1.0)
+    fd = io.StringIO()
+    gr.writeReport(m2.error_summary, file_out=fd)
+    self.assertTrue(STATPHOSPHORYLATION in fd.getvalue())
+
+  def testGetOperationSeriesWithoutDecomposition(self):
+    if IGNORE_TEST:
+      return
+    for is_low_memory in [False, True]:
+      m = GAMES_PP(self.simple4)
+      m.is_low_memory = is_low_memory
+      gr = GAMESReport(m)
+      operation = gr.getOperationSeries(STATPHOSPHORYLATION)
+      self.assertIsNone(operation)
+      self.assertEqual(
+          gr.convertOperationSeriesToReactionOperations(operation), [])
 
   def testGetResultingSeries(self):
     if IGNORE_TEST:
@@ -272,6 +407,9 @@ class TestGAMESReport(unittest.TestCase):
     self.assertTrue(inferred_reaction.products[1].molecule.name in {PSTATDIMER_SOL, SPECIES_TEST})
     self.assertEqual(inferred_reaction.reactants[0].stoichiometry, 1.0)
     self.assertEqual({p.stoichiometry for p in inferred_reaction.products}, {0.5, 1.0})
+    # the same operations reuse the inferred reaction
+    ro2 = gr.convertOperationSeriesToReactionOperations(op)
+    self.assertTrue(gr.getInferredReaction(ro2) is inferred_reaction)
 
   def testReportReactionsInSOM(self):
     if IGNORE_TEST:
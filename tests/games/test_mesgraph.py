@@ -335,6 +335,30 @@ class TestMESGraph(unittest.TestCase):
     self.assertFalse(len(mesgraph2.type_one_errors)>0)
     self.assertTrue(len(mesgraph2.type_two_errors)>0)
 
+  def testGetArcExplanation(self):
+    if IGNORE_TEST:
+      return
+    mesgraph2 = MESGraph(self.simple2)
+    mesgraph2.analyze(error_details=False)
+    for cycle in mesgraph2.type_two_errors:
+      for component in cycle:
+        self.assertEqual(len(component.node1), len(component.reactions))
+        self.assertEqual(len(component.node2), len(component.reactions))
+        for node1, node2, label in zip(component.node1,
+            component.node2, component.reactions):
+          reaction = self.simple2.getReaction(label)
+          names = [m_s.molecule.name
+              for m_s in reaction.reactants + reaction.products]
+          self.assertTrue(node1 in names)
+          self.assertTrue(node2 in names)
+    for som1, som2 in mesgraph2.edges:
+      edge_data = mesgraph2.get_edge_data(som1, som2)
+      explanation = mesgraph2.getArcExplanation(som1, som2)
+      self.assertEqual(set(explanation.reactions),
+          set(edge_data[cn.REACTION]))
+      for record in edge_data[cn.PROVENANCE]:
+        self.assertTrue(record.reaction in edge_data[cn.REACTION])
+
   def testAnalyze(self):
     if IGNORE_TEST:
       return
@@ -17,6 +17,12 @@ import unittest
 IGNORE_TEST = False
 NUM_MERGED_SOMS = 2
 NAMEFILTER = "[0-9a-zA-Z]+"
+ACLAC = "AcLac"
+ACETOININ = "AcetoinIn"
+ACETOINOUT = "AcetoinOut"
+R9 = "R9"
+R10 = "R10"
+R14 = "R14"
 
 
 #############################
@@ -58,5 +64,26 @@ class TestSOM(unittest.TestCase):
     self.assertTrue(molecule1 in new_som.molecules)
     self.assertTrue(molecule2 in new_som.molecules)
 
+  def testGetEqualityPath(self):
+    if IGNORE_TEST:
+      return
+    reactions = {self.simple.getReaction(r) for r in [R9, R10, R14]}
+    molecules = {self.simple.getMolecule(m)
+        for m in [ACLAC, ACETOININ, ACETOINOUT]}
+    som = SOM(molecules, reactions)
+    graph = som.getEqualityGraph()
+    self.assertEqual(len(graph.edges), 2)
+    self.assertTrue(som.getEqualityGraph() is graph)
+    som_path = som.getEqualityPath(ACLAC, ACETOINOUT)
+    self.assertEqual(len(som_path), 2)
+    self.assertEqual(som_path[0].node1, ACLAC)
+    self.assertEqual(set(som_path[0].reactions), {R9, R14})
+    self.assertEqual(som_path[1].node2, ACETOINOUT)
+    self.assertEqual(som_path[1].reactions, [R10])
+    # paths from the same molecule come from one search
+    self.assertEqual(len(som._equality_paths), 1)
+    self.assertEqual(len(som.getEqualityPath(ACLAC, ACETOININ)), 1)
+    self.assertEqual(len(som._equality_paths), 1)
+
 if __name__ == '__main__':
   unittest.main()
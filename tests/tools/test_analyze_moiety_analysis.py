@@ -5,12 +5,25 @@ from SBMLLint.tools import analyze_moiety_analysis
 
 import numpy as np
 import os
+import pandas as pd
+import shutil
 import unittest
+import zipfile
 
 
 IGNORE_TEST = False
 TEST_FILE = "test_analyze_moiety_analysis.csv"
 TEST_OUT_PATH = os.path.join(cn.TEST_DIR, TEST_FILE)
+TEST_DATA_DIR = os.path.join(cn.TEST_DIR, "test_analyze_moiety_analysis")
+TEST_SHARD_DIR = os.path.join(cn.TEST_DIR,
+    "test_analyze_moiety_analysis_shards")
+MODEL_FILES = [
+    "test_BIOMD0000000010_url.xml",
+    "test_BIOMD0000000145_url.xml",
+    "test_BIOMD0000000147_url.xml",
+    "test_file2.xml",
+    "test_file4.xml",
+    ]
 
 
 #############################
@@ -21,6 +34,16 @@ class TestFunctions(unittest.TestCase):
   def tearDown(self):
     if os.path.isfile(TEST_OUT_PATH):
       os.remove(TEST_OUT_PATH)
+    for path in [TEST_DATA_DIR, TEST_SHARD_DIR]:
+      if os.path.isdir(path):
+        shutil.rmtree(path)
+
+  def makeDataDir(self):
+    os.makedirs(TEST_DATA_DIR, exist_ok=True)
+    path = os.path.join(TEST_DATA_DIR, cn.BIOMODELS_ZIP_FILENAME)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zipper:
+      for filename in MODEL_FILES:
+        zipper.write(os.path.join(cn.TEST_DIR, filename), filename)
 
   def testIsStructuredName(self):
     self.assertTrue(analyze_moiety_analysis.isStructuredName("a_b"))
@@ -33,6 +56,76 @@ class TestFunctions(unittest.TestCase):
          out_path=TEST_OUT_PATH, report_progress=False)
     self.assertTrue(os.path.isfile(TEST_OUT_PATH))
 
+  def testCalcStatsSharded(self):
+    if IGNORE_TEST:
+      return
+    self.makeDataDir()
+    def calc(**kwargs):
+      df = analyze_moiety_analysis.calcStats(initial=0, final=10,
+          out_path=TEST_OUT_PATH, report_progress=False,
+          data_dir=TEST_DATA_DIR, shard_dir=TEST_SHARD_DIR, **kwargs)
+      return df.sort_values(cn.FILENAME).reset_index(drop=True)
+    #
+    df1 = calc()
+    self.assertEqual(sorted(df1[cn.FILENAME]), MODEL_FILES)
+    self.assertFalse(os.path.isdir(TEST_SHARD_DIR))
+    self.assertTrue(os.path.isfile(TEST_OUT_PATH))
+    df2 = calc(num_worker=2)
+    self.assertTrue(df1.equals(df2))
+
+  def testCalcStatsResume(self):
+    if IGNORE_TEST:
+      return
+    self.makeDataDir()
+    kwargs = dict(initial=0, final=10, out_path=TEST_OUT_PATH,
+        report_progress=False, data_dir=TEST_DATA_DIR,
+        shard_dir=TEST_SHARD_DIR)
+    # Simulate a run that stopped after the first two models
+    analyze_moiety_analysis.calcStats(is_keep_shards=True, **kwargs)
+    shard_path = os.path.join(TEST_SHARD_DIR, "shard_0.csv")
+    df = pd.read_csv(shard_path)
+    df = df[df[analyze_moiety_analysis.MODEL_NUMBER] < 2].copy()
+    df[cn.NUM_BOUNDARY_REACTIONS] = 99
+    df.to_csv(shard_path, index=False)
+    # Completed models are not processed again
+    df = analyze_moiety_analysis.calcStats(**kwargs)
+    self.assertEqual(len(df), len(MODEL_FILES))
+    self.assertEqual(sum(df[cn.NUM_BOUNDARY_REACTIONS] == 99), 2)
+    # Resuming requires the same parameters
+    os.makedirs(TEST_SHARD_DIR)
+    analyze_moiety_analysis._writeManifest(TEST_SHARD_DIR, {}, False)
+    with self.assertRaises(ValueError):
+      analyze_moiety_analysis.calcStats(**kwargs)
+    df = analyze_moiety_analysis.calcStats(is_resume=False, **kwargs)
+    self.assertEqual(sum(df[cn.NUM_BOUNDARY_REACTIONS] == 99), 0)
+
+  def testGetCompletedNumbers(self):
+    if IGNORE_TEST:
+      return
+    os.makedirs(TEST_SHARD_DIR)
+    shard_path = os.path.join(TEST_SHARD_DIR, "shard_0.csv")
+    columns = analyze_moiety_analysis.SHARD_COLUMNS
+    with open(shard_path, "w") as fd:
+      fd.write(",".join(columns) + "\n")
+      fd.write("0,a.xml,False,0,1,0,False\n")
+      fd.write("1,b.xml,Fal")
+    # The partially written line is dropped
+    self.assertEqual(
+        analyze_moiety_analysis._getCompletedNumbers(shard_path), {0})
+    df = pd.read_csv(shard_path)
+    self.assertEqual(list(df.columns), columns)
+    self.assertEqual(len(df), 1)
+
+  def testMergeShardsEmpty(self):
+    if IGNORE_TEST:
+      return
+    df = analyze_moiety_analysis.mergeShards(
+        [os.path.join(TEST_SHARD_DIR, "shard_0.csv")],
+        out_path=TEST_OUT_PATH)
+    self.assertEqual(len(df), 0)
+    self.assertTrue(cn.FRAC_BALANCED_REACTIONS in df.columns)
+    self.assertTrue(os.path.isfile(TEST_OUT_PATH))
+
 
 
 if __name__ == '__main__':
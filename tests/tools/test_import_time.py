@@ -0,0 +1,87 @@
+"""
+Import-time benchmark for the command line tools.
+Each module is imported in a fresh interpreter so that
+modules loaded by other tests do not hide regressions.
+"""
+from SBMLLint.common import constants as cn
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+
+IGNORE_TEST = False
+IS_PRINT = False
+# Modules that are only needed by specific analyses
+HEAVY_MODULES = ["yaml", "urllib3", "pandas", "numpy",
+    "scipy.optimize", "scipy.linalg", "networkx"]
+CLI_MODULES = [
+    "SBMLLint.tools.print_reactions",
+    "SBMLLint.tools.games",
+    "SBMLLint.tools.moiety_analysis",
+    "SBMLLint.tools.lp_analysis",
+    ]
+PROFILE_CODE = """
+import json, sys, time
+start = time.time()
+import %s
+elapsed = time.time() - start
+from SBMLLint.common import config
+print(json.dumps({
+    "elapsed": elapsed,
+    "loaded": [m for m in %s if m in sys.modules],
+    "is_config_loaded": config._config_dict is not None,
+    }))
+"""
+
+
+def getImportProfile(module_name):
+  """
+  Imports the module in a fresh interpreter.
+  :param str module_name:
+  :return dict: elapsed (seconds), loaded (heavy modules),
+      is_config_loaded
+  """
+  env = dict(os.environ)
+  env["PYTHONPATH"] = os.pathsep.join(
+      [cn.PROJECT_DIR, env.get("PYTHONPATH", "")])
+  code = PROFILE_CODE % (module_name, str(HEAVY_MODULES))
+  output = subprocess.check_output([sys.executable, "-c", code],
+      env=env, cwd=cn.PROJECT_DIR)
+  return json.loads(output.decode("utf-8").strip().split("\n")[-1])
+
+
+#############################
+# Tests
+#############################
+class TestImportTime(unittest.TestCase):
+
+  def testCLIImports(self):
+    if IGNORE_TEST:
+      return
+    for module_name in CLI_MODULES:
+      profile = getImportProfile(module_name)
+      if IS_PRINT:
+        print("%s: %2.3f s" % (module_name, profile["elapsed"]))
+      self.assertEqual(profile["loaded"], [])
+      self.assertFalse(profile["is_config_loaded"])
+
+  def testLazyConfiguration(self):
+    if IGNORE_TEST:
+      return
+    from SBMLLint.common import config
+    config_dict = config._config_dict
+    try:
+      config._config_dict = None
+      result = config.getConfiguration()
+      self.assertTrue(isinstance(result, dict))
+      self.assertEqual(result[cn.CFG_GAMES_THRESHOLD],
+          cn.CFG_DEFAULTS[cn.CFG_GAMES_THRESHOLD])
+    finally:
+      config._config_dict = config_dict
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -3,6 +3,8 @@ from SBMLLint.tools import lp_analysis
 from SBMLLint.common import simple_sbml
 
 
+import io
+import json
 import numpy as np
 import os
 import sys
@@ -33,6 +35,27 @@ class TestFunctions(unittest.TestCase):
     #
     test(TEST_SBML_INCONSISTENT_PTH, False)
     test(TEST_SBML_CONSISTENT_PTH, True)
+
+  def testLPAnalysisStructured(self):
+    if IGNORE_TEST:
+      return
+    file_out = io.StringIO()
+    with open(TEST_SBML_INCONSISTENT_PTH, "r") as fd:
+      lp_analysis.LPAnalysis(fd, file_out=file_out,
+          output_format=cn.FORMAT_NDJSON)
+    lines = file_out.getvalue().split("\n")
+    self.assertEqual(lines[-1], "")
+    dct = json.loads(lines[0])
+    self.assertEqual(dct[cn.RESULT_TOOL], cn.LP_ANALYSIS)
+    self.assertFalse(dct["is_consistent"])
+    self.assertEqual(dct[cn.RESULT_MODEL], TEST_SBML_INCONSISTENT_PTH)
+    self.assertGreater(len(dct[cn.RESULT_UNCONSERVED_SPECIES]), 0)
+    file_out = io.StringIO()
+    lp_analysis.LPAnalysis(TEST_SBML_CONSISTENT_PTH, file_out=file_out,
+        output_format=cn.FORMAT_NDJSON)
+    dct = json.loads(file_out.getvalue())
+    self.assertTrue(dct["is_consistent"])
+    self.assertIsNone(dct[cn.RESULT_UNCONSERVED_SPECIES])
     
 
 if __name__ == '__main__':
@@ -70,6 +70,37 @@ class TestFunctions(unittest.TestCase):
         molecule_name, moiety_names)
     self.assertEqual(len(result), 3)
 
+  def testMoietyMatcher(self):
+    if IGNORE_TEST:
+      return
+    def findSequentially(molecule_name, moiety_names):
+      # Counts and removes moieties from the longest to the shortest
+      result = []
+      for moiety_name in sorted(moiety_names,
+          key=lambda n: len(str(n)), reverse=True):
+        moiety_name = str(moiety_name)
+        count = molecule_name.count(moiety_name)
+        if count > 0:
+          molecule_name = molecule_name.replace(moiety_name, "")
+          result.append((moiety_name, count))
+      return result
+    #
+    cases = [
+        ("AAB", ["A", "AA", "B"]),
+        ("xABCy", ["xA", "ABC", "y", "x"]),
+        ("AABB", ["AB", "AB"]),  # Removal creates an occurrence
+        ("ACB", ["AB", "C"]),
+        ("A1_A2", ["A", 1, 2]),
+        ("", ["A"]),
+        ]
+    for molecule_name, moiety_names in cases:
+      matcher = make_moiety_structure.MoietyMatcher(moiety_names)
+      result = make_moiety_structure.findMoietyStoichiometries(
+          molecule_name, matcher, is_check_error=False)
+      self.assertEqual(
+          [(m_s.moiety.name, m_s.stoichiometry) for m_s in result],
+          findSequentially(molecule_name, moiety_names))
+
   def testMain(self):
     if IGNORE_TEST:
       return
@@ -147,6 +147,21 @@ class TestModelMaker(unittest.TestCase):
     for sym in [SYM1, SYM3]:
       self.assertEqual(self.maker.model_str.count(sym), 0)
 
+  def testReplaceSymbolsWholeSymbols(self):
+    if IGNORE_TEST:
+      return
+    sym10 = "%s0" % SYM1
+    maker = model_maker.ModelMaker(
+        ["J%s: %s -> %s; k*%s" % (SYM1, SYM1, sym10, SYM1)])
+    maker.makeModelStr()
+    # Symbols are swapped without cascading replacements
+    model_str = maker.replaceSymbols({SYM1: sym10, sym10: SYM1})
+    lines = model_str.split("\n")
+    self.assertEqual(lines[0],
+        "J%s: %s -> %s; k*%s" % (SYM1, sym10, SYM1, sym10))
+    self.assertTrue("%s = 0" % SYM1 in lines)
+    self.assertTrue("%s = 0" % sym10 in lines)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -5,6 +5,7 @@ from SBMLLint.common.simple_sbml import SimpleSBML
 from SBMLLint.tools import sbmllint
 
 
+import json
 import numpy as np
 import os
 import sys
@@ -171,6 +172,66 @@ class TestFunctions(unittest.TestCase):
                              )    
     self.assertFalse(result)
 
+  def testLintStructuredOutput(self):
+    if IGNORE_TEST:
+      return
+    def get(mass_balance_check):
+      with open(TEST_OUT_PATH, 'w') as fd:
+        result = sbmllint.lint(model_reference=TEST_147_SBML_FILE,
+            file_out=fd,
+            mass_balance_check=mass_balance_check,
+            output_format=cn.FORMAT_NDJSON)
+      with open(TEST_OUT_PATH, 'r') as fd:
+        lines = fd.readlines()
+      self.assertEqual(len(lines), 1)
+      return result, json.loads(lines[0])
+    #
+    result, dct = get(cn.MOIETY_ANALYSIS)
+    self.assertEqual(dct[cn.RESULT_TOOL], cn.MOIETY_ANALYSIS)
+    self.assertEqual(dct[cn.RESULT_MODEL], TEST_147_SBML_FILE)
+    self.assertEqual(dct["num_imbalances"], result.num_imbalances)
+    self.assertEqual(dct["imbalanced_reactions"],
+        result.imbalanced_reactions)
+    self.assertTrue("analysis" in dct[cn.RESULT_TIMINGS])
+    result, dct = get(cn.GAMES)
+    self.assertEqual(dct[cn.RESULT_TOOL], cn.GAMES)
+    self.assertEqual(dct["is_consistent"], not result)
+    self.assertGreater(len(dct["errors"]), 0)
+    for error in dct["errors"]:
+      self.assertGreater(len(error[cn.RESULT_REACTIONS]), 0)
+
+  def testLintCheck(self):
+    if IGNORE_TEST:
+      return
+    def get(model_reference, output_format=cn.FORMAT_TEXT):
+      with open(TEST_OUT_PATH, 'w') as fd:
+        result = sbmllint.lint(model_reference=model_reference,
+            file_out=fd, mode=cn.MODE_CHECK, output_format=output_format)
+      with open(TEST_OUT_PATH, 'r') as fd:
+        lines = fd.readlines()
+      self.assertEqual(len(lines), 1)
+      return result, lines[0]
+    #
+    result, line = get(cn.TEST_FILE3)
+    self.assertTrue(result.is_consistent)
+    self.assertIsNone(result.certificate)
+    self.assertEqual(line.strip(), "Model is consistent.")
+    for path in [cn.TEST_FILE6, cn.TEST_FILE_GAMES_PP1]:
+      self.assertTrue(sbmllint.lint(model_reference=path, is_report=False))
+      result, line = get(path)
+      self.assertFalse(result.is_consistent)
+      self.assertGreater(len(result.certificate[cn.RESULT_REACTIONS]), 0)
+      self.assertTrue("NOT consistent" in line)
+    result, line = get(cn.TEST_FILE6, output_format=cn.FORMAT_NDJSON)
+    dct = json.loads(line)
+    self.assertFalse(dct["is_consistent"])
+    self.assertEqual(dct["errors"], [result.certificate])
+    with self.assertRaises(ValueError):
+      sbmllint.lint(model_reference=cn.TEST_FILE3, mode="none")
+    with self.assertRaises(ValueError):
+      sbmllint.lint(model_reference=cn.TEST_FILE3, mode=cn.MODE_CHECK,
+          mass_balance_check=cn.MOIETY_ANALYSIS)
+
   def testRemoveIgnored(self):
     if IGNORE_TEST:
       return
@@ -187,6 +248,37 @@ class TestFunctions(unittest.TestCase):
         implicit_reactions.append(r.label)
     self.assertTrue(len(implicit_reactions) == 0)
 
+  def testRemoveIgnoredView(self):
+    if IGNORE_TEST:
+      return
+    simple = SimpleSBML()
+    simple.initialize(cn.TEST_FILE13)
+    identifiers = [r.identifier for r in simple.reactions]
+    names = set([m_s.molecule.name for r in simple.reactions
+        for m_s in r.reactants + r.products])
+    ignoreds = sorted(names)[:2] + ["not_a_molecule"]
+    view = sbmllint.removeIgnored(simple, ignoreds)
+    # The model is not changed
+    self.assertEqual([r.identifier for r in simple.reactions], identifiers)
+    self.assertEqual(len(view.reactions), len(simple.reactions))
+    for reaction, new_reaction in zip(simple.reactions, view.reactions):
+      new_names = [m_s.molecule.name
+          for m_s in new_reaction.reactants + new_reaction.products]
+      self.assertFalse(any([n in ignoreds for n in new_names]))
+      self.assertEqual(new_reaction.category, new_reaction.getCategory())
+      self.assertEqual(new_reaction.identifier,
+          new_reaction.makeIdentifier())
+      old_names = [m_s.molecule.name
+          for m_s in reaction.reactants + reaction.products]
+      if not any([n in ignoreds for n in old_names]):
+        self.assertTrue(new_reaction is reaction)
+    # Same result as removing one molecule at a time
+    other_view = simple
+    for ignored in ignoreds:
+      other_view = sbmllint.removeIgnored(other_view, ignored)
+    self.assertEqual([r.identifier for r in view.reactions],
+        [r.identifier for r in other_view.reactions])
+
   def testMain(self):
     if IGNORE_TEST:
       return
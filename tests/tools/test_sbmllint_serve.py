@@ -0,0 +1,141 @@
+from SBMLLint.common import constants as cn
+from SBMLLint.tools import sbmllint_serve
+from SBMLLint.tools.sbmllint_serve import LintServer
+
+import io
+import json
+import os
+import shutil
+import unittest
+
+
+IGNORE_TEST = False
+TEST_SBML_FILE = os.path.join(cn.TEST_DIR,
+    "test_BIOMD0000000010_url.xml")
+TEST_147_CFG_FILE = os.path.join(cn.TEST_DIR,
+    "test_BIOMOD147_cfg.yml")
+TEST_COPY_FILE = os.path.join(cn.TEST_DIR,
+    "test_sbmllint_serve_copy.xml")
+
+
+def makeRequest(request_id, method, **params):
+  return {"jsonrpc": "2.0", "id": request_id, "method": method,
+      "params": params}
+
+
+#############################
+# Tests
+#############################
+class TestLintServer(unittest.TestCase):
+
+  def setUp(self):
+    self.server = LintServer()
+
+  def tearDown(self):
+    if os.path.isfile(TEST_COPY_FILE):
+      os.remove(TEST_COPY_FILE)
+
+  def testLint(self):
+    if IGNORE_TEST:
+      return
+    result = self.server.lint(TEST_SBML_FILE,
+        mass_balance_check=cn.MOIETY_ANALYSIS)
+    self.assertEqual(result[cn.RESULT_TOOL], cn.MOIETY_ANALYSIS)
+    self.assertEqual(result[cn.RESULT_MODEL], TEST_SBML_FILE)
+    # Identical requests are answered from the cache
+    self.assertEqual(result, self.server.lint(TEST_SBML_FILE,
+        mass_balance_check=cn.MOIETY_ANALYSIS))
+    self.assertEqual(len(self.server._results), 1)
+    self.server.lint(TEST_SBML_FILE,
+        mass_balance_check=cn.MOIETY_ANALYSIS, config=TEST_147_CFG_FILE)
+    self.assertEqual(len(self.server._results), 2)
+    # A cached result is reported for the requested path
+    shutil.copyfile(TEST_SBML_FILE, TEST_COPY_FILE)
+    result2 = self.server.lint(TEST_COPY_FILE,
+        mass_balance_check=cn.MOIETY_ANALYSIS)
+    self.assertEqual(len(self.server._results), 2)
+    self.assertEqual(result2[cn.RESULT_MODEL], TEST_COPY_FILE)
+    self.assertEqual(self.server.lint(TEST_SBML_FILE,
+        mass_balance_check=cn.MOIETY_ANALYSIS)[cn.RESULT_MODEL],
+        TEST_SBML_FILE)
+    result = self.server.lint(TEST_SBML_FILE, format=cn.FORMAT_TEXT)
+    self.assertTrue(isinstance(result["report"], str))
+    with self.assertRaises(ValueError):
+      self.server.lint(TEST_SBML_FILE, mass_balance_check="dummy")
+
+  def testCacheSize(self):
+    if IGNORE_TEST:
+      return
+    server = LintServer(max_cached_results=1)
+    server.lint(TEST_SBML_FILE)
+    server.lint(TEST_SBML_FILE, mass_balance_check=cn.MOIETY_ANALYSIS)
+    self.assertEqual(len(server._results), 1)
+
+  def testHandle(self):
+    if IGNORE_TEST:
+      return
+    response = self.server.handle(makeRequest(1, sbmllint_serve.METHOD_LINT,
+        model=TEST_SBML_FILE))
+    self.assertEqual(response["id"], 1)
+    self.assertEqual(response["result"][cn.RESULT_TOOL], cn.GAMES)
+    response = self.server.handle(makeRequest(2, "dummy"))
+    self.assertEqual(response["error"]["code"],
+        sbmllint_serve.METHOD_NOT_FOUND)
+    response = self.server.handle(makeRequest(3, sbmllint_serve.METHOD_LINT,
+        dummy=TEST_SBML_FILE))
+    self.assertEqual(response["error"]["code"],
+        sbmllint_serve.INVALID_PARAMS)
+    response = self.server.handle(makeRequest(4, sbmllint_serve.METHOD_LINT,
+        model="<sbml>"))
+    self.assertEqual(response["error"]["code"], sbmllint_serve.LINT_ERROR)
+
+  def testHandleUnexpectedError(self):
+    if IGNORE_TEST:
+      return
+    # Not parsed natively, and Tellurium may be missing
+    response = self.server.handle(makeRequest(1, sbmllint_serve.METHOD_LINT,
+        model="A + -> ; x"))
+    self.assertEqual(response["error"]["code"], sbmllint_serve.LINT_ERROR)
+    def lint(**_):
+      raise KeyError("dummy")
+    self.server.lint = lint
+    response = self.server.handle(makeRequest(2, sbmllint_serve.METHOD_LINT,
+        model=TEST_SBML_FILE))
+    self.assertEqual(response["error"]["code"], sbmllint_serve.LINT_ERROR)
+    self.assertTrue("KeyError" in response["error"]["message"])
+    # Only the parameters of the request are invalid parameters
+    def lint(**_):
+      raise TypeError("dummy")
+    self.server.lint = lint
+    response = self.server.handle(makeRequest(3, sbmllint_serve.METHOD_LINT,
+        model=TEST_SBML_FILE))
+    self.assertEqual(response["error"]["code"], sbmllint_serve.LINT_ERROR)
+    self.assertFalse(self.server.is_shutdown)
+
+  def testServe(self):
+    if IGNORE_TEST:
+      return
+    requests = [
+        json.dumps(makeRequest(1, sbmllint_serve.METHOD_LINT,
+            model=TEST_SBML_FILE)),
+        "",
+        "not json",
+        json.dumps(makeRequest(2, sbmllint_serve.METHOD_SHUTDOWN)),
+        json.dumps(makeRequest(3, sbmllint_serve.METHOD_LINT,
+            model=TEST_SBML_FILE)),
+        ]
+    file_in = io.StringIO("\n".join(requests))
+    file_out = io.StringIO()
+    self.server.serve(file_in=file_in, file_out=file_out)
+    responses = [json.loads(l) for l in file_out.getvalue().split("\n")
+        if len(l) > 0]
+    self.assertEqual(len(responses), 3)
+    self.assertTrue("result" in responses[0])
+    self.assertEqual(responses[1]["error"]["code"],
+        sbmllint_serve.PARSE_ERROR)
+    self.assertTrue(responses[2]["result"])
+    self.assertTrue(self.server.is_shutdown)
+
+
+if __name__ == '__main__':
+  unittest.main()